@@ -0,0 +1,210 @@
+import math
+from collections import namedtuple
+from functools import lru_cache
+
+from ciphers import CipherImplementations
+
+Candidate = namedtuple("Candidate", "cipher key score preview")
+
+# Relative letter frequencies of English text, a-z.
+ENGLISH_FREQUENCIES = (
+    0.0804, 0.0148, 0.0334, 0.0382, 0.1249, 0.0240, 0.0187, 0.0505, 0.0757,
+    0.0016, 0.0054, 0.0407, 0.0251, 0.0723, 0.0764, 0.0214, 0.0012, 0.0628,
+    0.0651, 0.0928, 0.0273, 0.0105, 0.0168, 0.0023, 0.0166, 0.0009,
+)
+
+# The most common English bigrams (percent of all letter pairs); anything
+# else scores as BIGRAM_FLOOR.
+ENGLISH_BIGRAMS = {
+    "th": 3.56, "he": 3.07, "in": 2.43, "er": 2.05, "an": 1.99, "re": 1.85,
+    "on": 1.76, "at": 1.49, "en": 1.45, "nd": 1.35, "ti": 1.34, "es": 1.34,
+    "or": 1.28, "te": 1.20, "of": 1.17, "ed": 1.17, "is": 1.13, "it": 1.12,
+    "al": 1.09, "ar": 1.07, "st": 1.05, "to": 1.04, "nt": 1.04, "ng": 0.95,
+    "se": 0.93, "ha": 0.93, "as": 0.87, "ou": 0.87, "io": 0.83, "le": 0.83,
+    "ve": 0.83, "co": 0.79, "me": 0.79, "de": 0.76, "hi": 0.76, "ri": 0.73,
+    "ro": 0.73, "ic": 0.70, "ne": 0.69, "ea": 0.69, "ra": 0.69, "ce": 0.65,
+}
+BIGRAM_FLOOR = 0.02
+
+# Letters are folded to a-z and every other character to "{", so that
+# byte - 97 gives 0-25 for letters and 26 otherwise.
+_FOLD = bytes(
+    c + 32 if 65 <= c <= 90 else c if 97 <= c <= 122 else 123
+    for c in range(256)
+)
+
+
+@lru_cache(maxsize=None)
+def _load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@lru_cache(maxsize=None)
+def _bigram_table():
+    # log10 probability of every letter pair, indexed by a * 26 + b.
+    table = [math.log10(BIGRAM_FLOOR / 100)] * (26 * 26)
+    for pair, percent in ENGLISH_BIGRAMS.items():
+        table[(ord(pair[0]) - 97) * 26 + ord(pair[1]) - 97] = math.log10(percent / 100)
+    return table
+
+
+def fold(data):
+    """Return data (str or bytes-like) as bytes of a-z, with "{" for anything else.
+
+    Text keeps one byte per character, so positions line up with the
+    position-keyed ciphers.
+    """
+    if isinstance(data, str):
+        data = data.encode('ascii', 'replace')
+    return bytes(data).translate(_FOLD)
+
+
+def english_score(folded):
+    """Average log10 bigram probability of the letter pairs in folded text.
+
+    Higher is more English-like. Letter frequencies alone cannot tell
+    transpositions apart, bigrams can.
+    """
+    table = _bigram_table()
+    total = count = 0
+    for a, b in zip(folded, folded[1:]):
+        if a < 123 and b < 123:
+            total += table[(a - 97) * 26 + b - 97]
+            count += 1
+    return total / count if count else float("-inf")
+
+
+def letter_counts(folded):
+    np = _load_numpy()
+    if np is not None:
+        codes = np.frombuffer(folded, dtype=np.uint8) - 97
+        return np.bincount(codes, minlength=27)[:26].tolist()
+    return [folded.count(c) for c in range(97, 123)]
+
+
+def column_counts(folded, period):
+    """Letter counts of each column folded[j::period], as period lists of 26."""
+    np = _load_numpy()
+    if np is None:
+        return [letter_counts(folded[j::period]) for j in range(period)]
+    codes = np.frombuffer(folded, dtype=np.uint8).astype(np.intp) - 97
+    body = len(codes) - len(codes) % period
+    index = codes[:body].reshape(-1, period) + np.arange(period) * 27
+    counts = np.bincount(index.ravel(), minlength=27 * period)
+    counts[np.arange(len(codes) - body) * 27 + codes[body:]] += 1
+    return counts.reshape(period, 27)[:, :26].tolist()
+
+
+def chi_squared(counts, shift):
+    """Chi-squared of counts against English after undoing a shift."""
+    total = sum(counts)
+    if not total:
+        return float("inf")
+    score = 0.0
+    for i, frequency in enumerate(ENGLISH_FREQUENCIES):
+        expected = frequency * total
+        observed = counts[(i + shift) % 26]
+        score += (observed - expected) ** 2 / expected
+    return score
+
+
+def best_shifts(counts, top=1):
+    return sorted(range(26), key=lambda shift: chi_squared(counts, shift))[:top]
+
+
+def index_of_coincidence(counts):
+    total = sum(counts)
+    if total < 2:
+        return 0.0
+    return sum(n * (n - 1) for n in counts) / (total * (total - 1))
+
+
+def _shortest_period(key):
+    # "abcabc" -> "abc"; key lengths that are multiples of the real one
+    # recover the same key repeated.
+    for size in range(1, len(key)):
+        if len(key) % size == 0 and key[:size] * (len(key) // size) == key:
+            return key[:size]
+    return key
+
+
+class Analyzer:
+    """Recovers Caesar, Vigenère and Rail Fence keys from ciphertext alone.
+
+    Statistics come from at most stats_size characters and candidates
+    are ranked by english_score over their first sample_size decrypted
+    characters, so the cost is bounded however long the ciphertext is.
+    Full decryption of a chosen candidate is left to the caller.
+    """
+
+    def __init__(self, ciphers=None, sample_size=2048, stats_size=1 << 20,
+                 period_sample_size=1 << 18, max_period=32, max_rails=100):
+        self.ciphers = ciphers if ciphers is not None else CipherImplementations()
+        self.sample_size = sample_size
+        self.stats_size = stats_size
+        self.period_sample_size = period_sample_size
+        self.max_period = max_period
+        self.max_rails = max_rails
+
+    def analyze(self, text, ciphers=("Caesar", "Vigenère", "Rail Fence"), top=10):
+        """Return the best candidates over all the given ciphers, best first."""
+        methods = {"Caesar": self.caesar, "Vigenère": self.vigenere, "Rail Fence": self.rail_fence}
+        candidates = []
+        for name in ciphers:
+            candidates.extend(methods[name](text, top))
+        candidates.sort(key=lambda c: c.score, reverse=True)
+        return candidates[:top]
+
+    def caesar(self, text, top=5):
+        # Every shift is scored from the same histogram.
+        counts = letter_counts(fold(text[:self.stats_size]))
+        shifts = [shift for shift in best_shifts(counts, 26) if shift][:top]
+        return self._rank("Caesar", text, [str(shift) for shift in shifts])
+
+    def vigenere(self, text, top=5):
+        folded = fold(text[:self.stats_size])
+        keys = []
+        for period in self.key_lengths(folded[:self.period_sample_size]):
+            shifts = [best_shifts(counts)[0] for counts in column_counts(folded, period)]
+            key = _shortest_period(''.join(chr(97 + shift) for shift in shifts))
+            if key not in keys:
+                keys.append(key)
+        return self._rank("Vigenère", text, keys)[:top]
+
+    def key_lengths(self, folded, count=3):
+        """Likely Vigenère key lengths, by average column index of coincidence."""
+        scores = {}
+        for period in range(2, min(self.max_period, max(2, len(folded) // 2)) + 1):
+            columns = column_counts(folded, period)
+            scores[period] = sum(index_of_coincidence(c) for c in columns) / period
+        if not scores:
+            return []
+        # Multiples of the key length score as well as the length itself,
+        # so prefer the shortest periods that come close to the best one.
+        best = max(scores.values())
+        likely = [period for period, score in scores.items() if score >= best * 0.9]
+        return sorted(likely)[:count]
+
+    def rail_fence(self, text, top=5):
+        sample = self.sample_size
+        candidates = []
+        for rails in range(2, min(self.max_rails, len(text) - 1) + 1):
+            context = self.ciphers.prepare("Rail Fence", str(rails))
+            preview = context.decrypt_prefix(text, sample)
+            candidates.append(self._candidate("Rail Fence", str(rails), preview))
+        candidates.sort(key=lambda c: c.score, reverse=True)
+        return candidates[:top]
+
+    def _rank(self, cipher, text, keys):
+        sample = text[:self.sample_size]
+        candidates = [self._candidate(cipher, key, self.ciphers.decrypt(cipher, sample, key))
+                      for key in keys]
+        candidates.sort(key=lambda c: c.score, reverse=True)
+        return candidates
+
+    def _candidate(self, cipher, key, preview):
+        return Candidate(cipher, key, english_score(fold(preview)), preview)
@@ -0,0 +1,85 @@
+"""Compare the table-driven classical ciphers against the old per-character loops.
+
+Usage: python benchmarks/classical_translate.py [--sizes 10,100] [--repeat 1]
+Sizes are in megabytes of mixed-case ASCII text.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers import CipherImplementations
+
+
+def legacy_caesar(text, key):
+    return ''.join(
+        chr((ord(char) - 97 + key) % 26 + 97) if char.islower() else
+        chr((ord(char) - 65 + key) % 26 + 65) if char.isupper() else char
+        for char in text
+    )
+
+
+def legacy_vigenere(text, key):
+    def shift(char, k):
+        offset = 65 if char.isupper() else 97
+        return chr((ord(char) - offset + k) % 26 + offset)
+
+    expanded_key = (key * ((len(text) // len(key)) + 1))[:len(text)]
+    return ''.join(shift(char, ord(k) - 97) if char.isalpha() else char
+                   for char, k in zip(text, expanded_key))
+
+
+def legacy_atbash(text):
+    return ''.join(
+        chr(155 - ord(char)) if char.isupper() else
+        chr(219 - ord(char)) if char.islower() else char
+        for char in text
+    )
+
+
+def make_text(size):
+    rng = random.Random(size)
+    sample = ''.join(rng.choice("The quick brown fox JUMPS over 12 lazy dogs.\n") for _ in range(1 << 16))
+    return (sample * (size // len(sample) + 1))[:size]
+
+
+def best_of(repeat, func, *args):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100", help="comma separated sizes in MB")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    ciphers = CipherImplementations()
+    cases = [
+        ("Caesar", lambda t: legacy_caesar(t, 7), lambda t: ciphers.caesar_encrypt(t, "7")),
+        ("Vigenère", lambda t: legacy_vigenere(t, "lemonade"), lambda t: ciphers.vigenere_encrypt(t, "lemonade")),
+        ("Atbash", legacy_atbash, ciphers.atbash_encrypt),
+    ]
+
+    print(f"{'cipher':<10} {'MB':>5} {'legacy s':>10} {'table s':>10} {'MB/s':>10} {'speedup':>8}")
+    for size_mb in (int(s) for s in args.sizes.split(",")):
+        text = make_text(size_mb * 1024 * 1024)
+        for name, legacy, fast in cases:
+            old_time, expected = best_of(args.repeat, legacy, text)
+            new_time, actual = best_of(args.repeat, fast, text)
+            if actual != expected:
+                raise SystemExit(f"{name}: output differs from legacy implementation")
+            print(f"{name:<10} {size_mb:>5} {old_time:>10.3f} {new_time:>10.3f} "
+                  f"{size_mb / new_time:>10.1f} {old_time / new_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare pooled key generation (keygen.py) with the old per-character randint loops.
+
+Usage: python benchmarks/keygen_bench.py [--count 10000] [--pad-size 16M] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+from random import randint
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers import CipherImplementations
+from keygen import KeyGenerator, EntropyPool
+from utils import parse_size
+
+
+def legacy_letters(length):
+    return ''.join(chr(randint(97, 122)) for _ in range(length))
+
+
+def legacy_shift():
+    return str(randint(1, 25))
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000, help="keys per bulk case")
+    parser.add_argument("--pad-size", default="16M", help="length of the OTP letter pad case")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    count, pad_size = args.count, parse_size(args.pad_size)
+
+    ciphers = CipherImplementations()
+    unpooled = KeyGenerator(EntropyPool(size=1))
+    cases = [
+        (f"{count} Vigenère keys (16)", count,
+         lambda: [legacy_letters(16) for _ in range(count)],
+         lambda: ciphers.generate_keys("Vigenère", count)),
+        (f"{count} Caesar shifts", count,
+         lambda: [legacy_shift() for _ in range(count)],
+         lambda: ciphers.generate_keys("Caesar", count)),
+        (f"{count} Vigenère keys, no pool", count,
+         lambda: [legacy_letters(16) for _ in range(count)],
+         lambda: [unpooled.string(16) for _ in range(count)]),
+        (f"OTP letters ({args.pad_size})", pad_size,
+         lambda: legacy_letters(pad_size),
+         lambda: ciphers.generate_keys("OTP", 1, pad_size)),
+        (f"{count} AES keys", count,
+         None,
+         lambda: ciphers.generate_keys("AES", count)),
+    ]
+
+    print(f"{'case':<32} {'legacy':>12} {'pooled':>12} {'speedup':>8}  rate")
+    for label, units, legacy, pooled in cases:
+        new = best_of(pooled, args.repeat)
+        rate = f"{units / new / 1e6:.2f} M chars/s" if "letters" in label else f"{units / new:,.0f} keys/s"
+        if legacy is None:
+            print(f"{label:<32} {'-':>12} {new * 1000:>10.2f}ms {'-':>8}  {rate}")
+            continue
+        old = best_of(legacy, args.repeat)
+        print(f"{label:<32} {old * 1000:>10.2f}ms {new * 1000:>10.2f}ms {old / new:>7.1f}x  {rate}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Load generator for the local encryption service (python main.py serve).
+
+Usage:
+    python benchmarks/service_load.py --spawn                 # start a server, then load it
+    python benchmarks/service_load.py --port 8750 -c 64 -n 20000 --cipher AES --size 256
+    python benchmarks/service_load.py --unix /tmp/qrypto.sock --keys 4
+
+Each of --concurrency clients keeps one connection alive and sends
+requests back to back. Reports requests/s, p50/p99 latency and the
+server's mean batch size.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection to the service."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, args):
+        if args.unix:
+            return cls(*await asyncio.open_unix_connection(args.unix))
+        return cls(*await asyncio.open_connection(args.host, args.port))
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                          f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                          + body)
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        self.writer.close()
+
+
+async def worker(args, texts, keys, counter, latencies, errors):
+    client = await Client.connect(args)
+    rng = random.Random(id(client))
+    try:
+        while counter[0] < args.requests:
+            counter[0] += 1
+            payload = {"cipher": args.cipher, "key": rng.choice(keys), "text": rng.choice(texts)}
+            start = time.perf_counter()
+            status, response = await client.request("POST", f"/{args.direction}", payload)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(response.get("error"))
+    finally:
+        client.close()
+
+
+async def run(args):
+    rng = random.Random(1)
+    alphabet = "The quick brown fox JUMPS over 12 lazy dogs. "
+    texts = [''.join(rng.choice(alphabet) for _ in range(args.size)) for _ in range(16)]
+    keys = [args.key + (str(i) if i else "") for i in range(args.keys)]
+    if args.direction == "decrypt":
+        # Decrypt requests need ciphertext made with the same key.
+        keys = keys[:1]
+        client = await Client.connect(args)
+        ciphertexts = []
+        for text in texts:
+            _, response = await client.request("POST", "/encrypt",
+                                               {"cipher": args.cipher, "key": keys[0], "text": text})
+            ciphertexts.append(response["result"])
+        client.close()
+        texts = ciphertexts
+
+    latencies, errors, counter = [], [], [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(args, texts, keys, counter, latencies, errors)
+                           for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    client = await Client.connect(args)
+    _, stats = await client.request("GET", "/stats")
+    client.close()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "seconds": elapsed,
+        "requests_per_s": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_batch_size": stats.get("mean_batch_size"),
+    }
+
+
+def spawn_server(args):
+    command = [sys.executable, os.path.join(ROOT, "main.py"), "serve", "--batch-delay", str(args.batch_delay)]
+    if args.unix:
+        command += ["--unix", args.unix]
+    else:
+        with socket.socket() as s:
+            s.bind((args.host, 0))
+            args.port = s.getsockname()[1]
+        command += ["--host", args.host, "--port", str(args.port)]
+    if args.processes:
+        command.append("--processes")
+    process = subprocess.Popen(command, stderr=subprocess.PIPE, text=True)
+    # The server announces itself once it is listening.
+    process.stderr.readline()
+    return process
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Measure requests/s and latency of the local service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8750)
+    parser.add_argument("--unix", help="connect to this Unix socket instead of TCP")
+    parser.add_argument("--spawn", action="store_true", help="start a server on a free port for the run")
+    parser.add_argument("--processes", action="store_true", help="with --spawn: use worker processes")
+    parser.add_argument("--batch-delay", type=float, default=0.0, help="with --spawn: server batch delay")
+    parser.add_argument("-c", "--concurrency", type=int, default=32, help="concurrent connections")
+    parser.add_argument("-n", "--requests", type=int, default=10000, help="total requests")
+    parser.add_argument("--cipher", default="AES")
+    parser.add_argument("--key", default="load test key")
+    parser.add_argument("--keys", type=int, default=1, help="distinct keys to spread requests over")
+    parser.add_argument("--size", type=int, default=256, help="characters of text per request")
+    parser.add_argument("--direction", choices=["encrypt", "decrypt"], default="encrypt")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    process = spawn_server(args) if args.spawn else None
+    try:
+        result = asyncio.run(run(args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{result['requests']} {args.direction} requests ({args.cipher}, {args.size} chars, "
+              f"{args.keys} key(s), {args.concurrency} connections) in {result['seconds']:.2f}s: "
+              f"{result['requests_per_s']:.0f} req/s, p50 {result['p50_ms']:.2f} ms, "
+              f"p99 {result['p99_ms']:.2f} ms, mean batch {result['mean_batch_size']:.1f}, "
+              f"{result['errors']} error(s)")
+        if result["first_error"]:
+            print(f"first error: {result['first_error']}")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
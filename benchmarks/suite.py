@@ -0,0 +1,224 @@
+"""Benchmark every cipher in CipherImplementations across input and key sizes.
+
+Usage:
+    python benchmarks/suite.py                       # default sizes, table output
+    python benchmarks/suite.py --sizes 1K,1M,100M --json results.json
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json --tolerance 0.15
+
+Runs headless; only ciphers.py (and pycryptodome) are imported. With
+--baseline the run exits non-zero if any case's throughput dropped by more
+than --tolerance compared to the saved results.
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ciphers
+from ciphers import CipherImplementations, cipher_names, get_cipher
+from utils import SIZE_UNITS, parse_size
+
+DEFAULT_SIZES = "1K,64K,1M,16M"
+
+# cipher -> [(key parameter label, key factory)]. A factory takes the input
+# size and the number of encryptions the key must cover. Registered ciphers
+# missing here are measured with a generated key, so none are left out.
+KEYS = {
+    "AES": [("passphrase", lambda size, runs: "benchmark passphrase")],
+    "DES3": [("passphrase", lambda size, runs: "benchmark passphrase")],
+    "AES-GCM": [("passphrase", lambda size, runs: "benchmark passphrase")],
+    "Caesar": [("shift=7", lambda size, runs: "7")],
+    "Vigenère": [(f"len={n}", lambda size, runs, n=n: _letters(n)) for n in (4, 32, 256)],
+    "OTP": [("len=input", lambda size, runs: _letters(size))],
+    "OTP Pad": [("pad file", lambda size, runs: _pad_file(size * runs))],
+    "Atbash": [("-", lambda size, runs: "")],
+    "Rail Fence": [(f"rails={n}", lambda size, runs, n=n: str(n)) for n in (3, 10, 100)],
+}
+# Each OTP Pad encryption uses up fresh pad, so it gets fewer iterations.
+MAX_ITERATIONS = {"OTP Pad": 10}
+
+
+def cases():
+    """(cipher, key parameter label, key factory) for every registered cipher."""
+    for name in cipher_names():
+        if get_cipher(name).requires_key:
+            generated = [("generated", lambda size, runs, name=name: get_cipher(name).generate_key())]
+        else:
+            generated = [("-", lambda size, runs: "")]
+        for label, factory in KEYS.get(name, generated):
+            yield name, label, factory
+
+
+def _pad_file(size):
+    from otppad import generate_pad
+    directory = tempfile.mkdtemp(prefix="qrypto-bench-")
+    atexit.register(shutil.rmtree, directory, True)
+    return generate_pad(os.path.join(directory, "bench.pad"), size)
+
+
+def _letters(count, seed=1):
+    rng = random.Random(seed)
+    block = ''.join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(min(count, 4096)))
+    return (block * (count // len(block) + 1))[:count]
+
+
+def format_size(size):
+    for unit in ("G", "M", "K"):
+        if size >= SIZE_UNITS[unit] and size % SIZE_UNITS[unit] == 0:
+            return f"{size // SIZE_UNITS[unit]}{unit}"
+    return str(size)
+
+
+def make_text(size):
+    rng = random.Random(size)
+    sample = ''.join(rng.choice("The quick brown fox JUMPS over 12 lazy dogs.\n") for _ in range(1 << 16))
+    return (sample * (size // len(sample) + 1))[:size]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(func, size, min_time, max_iterations):
+    # Always at least three timed runs; small inputs repeat until min_time.
+    func()
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_iterations:
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+        if len(samples) >= 3 and time.perf_counter() - started >= min_time:
+            break
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(samples)
+    return {
+        "iterations": len(samples),
+        "mb_per_s": size / (1024 * 1024) / best if best > 0 else float("inf"),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "peak_mem_bytes": peak,
+    }
+
+
+def run(sizes, ciphers_filter, min_time, max_iterations, verbose):
+    ciphers = CipherImplementations()
+    results = []
+    for size in sizes:
+        text = make_text(size)
+        for cipher, key_param, key_for in cases():
+            if ciphers_filter and cipher not in ciphers_filter:
+                continue
+            iterations = min(max_iterations, MAX_ITERATIONS.get(cipher, max_iterations))
+            # Warm-up, timed runs, the traced run and the round-trip check.
+            key = key_for(size, iterations + 3)
+            ciphertext = ciphers.encrypt(cipher, text, key)
+            if ciphers.decrypt(cipher, ciphertext, key) != text:
+                raise SystemExit(f"{cipher} ({key_param}) failed to round-trip {format_size(size)}")
+            for direction, func in (("encrypt", lambda: ciphers.encrypt(cipher, text, key)),
+                                    ("decrypt", lambda: ciphers.decrypt(cipher, ciphertext, key))):
+                stats = measure(func, size, min_time, iterations)
+                stats.update(cipher=cipher, key=key_param, direction=direction, size=size)
+                results.append(stats)
+                if verbose:
+                    print(format_row(stats), flush=True)
+    return results
+
+
+def case_id(result):
+    return f"{result['cipher']}|{result['key']}|{result['direction']}|{result['size']}"
+
+
+def format_row(result, baseline=None):
+    row = (f"{result['cipher']:<11} {result['key']:<11} {result['direction']:<8} "
+           f"{format_size(result['size']):>6} {result['mb_per_s']:>10.2f} "
+           f"{result['p50_ms']:>10.3f} {result['p99_ms']:>10.3f} "
+           f"{result['peak_mem_bytes'] / (1024 * 1024):>9.1f}")
+    if baseline is not None:
+        row += f" {result['mb_per_s'] / baseline['mb_per_s'] - 1:>+8.1%}"
+    return row
+
+
+def header(with_baseline=False):
+    line = (f"{'cipher':<11} {'key':<11} {'dir':<8} {'size':>6} {'MB/s':>10} "
+            f"{'p50 ms':>10} {'p99 ms':>10} {'peak MB':>9}")
+    return line + (f" {'vs base':>8}" if with_baseline else "")
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, 'r') as f:
+        baseline = {case_id(r): r for r in json.load(f)["results"]}
+    print(header(with_baseline=True))
+    regressions = []
+    for result in results:
+        base = baseline.get(case_id(result))
+        print(format_row(result, base) if base else format_row(result) + "      new")
+        if base and result["mb_per_s"] < base["mb_per_s"] * (1 - tolerance):
+            regressions.append(result)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {tolerance:.0%}:")
+        for result in regressions:
+            print(f"  {case_id(result)}")
+    return not regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QryptoCore cipher benchmark suite")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma separated input sizes, e.g. 1K,1M,100M (default {DEFAULT_SIZES})")
+    parser.add_argument("--cipher", action="append", help="only run this cipher (repeatable)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="minimum seconds spent per case")
+    parser.add_argument("--max-iterations", type=int, default=200)
+    parser.add_argument("--no-numpy", action="store_true", help="use the pure-Python kernels only")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--save-baseline", help="write results as a baseline JSON file")
+    parser.add_argument("--baseline", help="compare against this baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed throughput drop versus the baseline (default 0.15)")
+    args = parser.parse_args()
+
+    if args.no_numpy:
+        ciphers.NUMPY_THRESHOLD = None
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    if not args.baseline:
+        print(header())
+    results = run(sizes, args.cipher, args.min_time, args.max_iterations, verbose=not args.baseline)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": ciphers.NUMPY_THRESHOLD is not None and ciphers._load_numpy() is not None,
+        },
+        "results": results,
+    }
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+    if args.baseline and not compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
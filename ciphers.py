@@ -1,189 +1,1250 @@
-import os
-import base64
-import hashlib
-from Crypto.Cipher import AES, DES3
-from Crypto.Util.Padding import pad, unpad
-from random import randint
-
-class CipherImplementations:
-    def encrypt(self, cipher, plaintext, key):
-        if cipher == "AES":
-            return self.aes_encrypt(plaintext, key)
-        elif cipher == "Caesar":
-            return self.caesar_encrypt(plaintext, key)
-        elif cipher == "Vigenère":
-            return self.vigenere_encrypt(plaintext, key)
-        elif cipher == "OTP":
-            return self.otp_encrypt(plaintext, key)
-        elif cipher == "Atbash":
-            return self.atbash_encrypt(plaintext)
-        elif cipher == "Rail Fence":
-            return self.rail_fence_encrypt(plaintext, key)
-        elif cipher == "DES3":
-            return self.des3_encrypt(plaintext, key)
-        else:
-            raise ValueError("Unsupported cipher selected.")
-    
-    def decrypt(self, cipher, ciphertext, key):
-        if cipher == "AES":
-            return self.aes_decrypt(ciphertext, key)
-        elif cipher == "Caesar":
-            return self.caesar_decrypt(ciphertext, key)
-        elif cipher == "Vigenère":
-            return self.vigenere_decrypt(ciphertext, key)
-        elif cipher == "OTP":
-            return self.otp_decrypt(ciphertext, key)
-        elif cipher == "Atbash":
-            return self.atbash_decrypt(ciphertext)
-        elif cipher == "Rail Fence":
-            return self.rail_fence_decrypt(ciphertext, key)
-        elif cipher == "DES3":
-            return self.des3_decrypt(ciphertext, key)
-        else:
-            raise ValueError("Unsupported cipher selected.")
-    
-    def aes_encrypt(self, plaintext, key):
-        if not key:
-            raise ValueError("Key is required for AES encryption")
-        key_hash = hashlib.sha256(key.encode()).digest()[:16]
-        cipher = AES.new(key_hash, AES.MODE_CBC)
-        padded_text = pad(plaintext.encode(), AES.block_size)
-        ciphertext = cipher.encrypt(padded_text)
-        return base64.b64encode(cipher.iv + ciphertext).decode()
-    
-    def aes_decrypt(self, ciphertext, key):
-        if not key:
-            raise ValueError("Key is required for AES decryption")
-        key_hash = hashlib.sha256(key.encode()).digest()[:16]
-        data = base64.b64decode(ciphertext.encode())
-        iv = data[:AES.block_size]
-        ciphertext = data[AES.block_size:]
-        cipher = AES.new(key_hash, AES.MODE_CBC, iv=iv)
-        decrypted = cipher.decrypt(ciphertext)
-        return unpad(decrypted, AES.block_size).decode()
-    
-    def caesar_encrypt(self, text, key):
-        if not key:
-            raise ValueError("Key is required for Caesar cipher")
-        key = int(key)
-        return ''.join(
-            chr((ord(char) - 97 + key) % 26 + 97) if char.islower() else
-            chr((ord(char) - 65 + key) % 26 + 65) if char.isupper() else char
-            for char in text
-        )
-    
-    def caesar_decrypt(self, text, key):
-        return self.caesar_encrypt(text, -int(key))
-    
-    def vigenere_encrypt(self, text, key):
-        if not key:
-            raise ValueError("Key is required for Vigenère cipher")
-        def shift(char, k):
-            if not char.isalpha():
-                return char
-            offset = 65 if char.isupper() else 97
-            return chr((ord(char) - offset + k) % 26 + offset)
-
-        expanded_key = (key * ((len(text) // len(key)) + 1))[:len(text)]
-        return ''.join(shift(char, ord(k) - 97) if char.isalpha() else char
-                   for char, k in zip(text, expanded_key))
-    
-    def vigenere_decrypt(self, text, key):
-        if not key:
-            raise ValueError("Key is required for Vigenère cipher")
-        def shift(char, k):
-            if not char.isalpha():
-                return char
-            offset = 65 if char.isupper() else 97
-            return chr((ord(char) - offset - k) % 26 + offset)
-
-        expanded_key = (key * ((len(text) // len(key)) + 1))[:len(text)]
-        return ''.join(shift(char, ord(k) - 97) if char.isalpha() else char
-                   for char, k in zip(text, expanded_key))
-    
-    def otp_encrypt(self, text, key):
-        if not key:
-            raise ValueError("Key is required for OTP encryption")
-        if len(key) < len(text):
-            raise ValueError("OTP key must be at least as long as the plaintext")
-        return ''.join(chr(ord(t) ^ ord(k)) for t, k in zip(text, key))
-    
-    def otp_decrypt(self, text, key):
-        return self.otp_encrypt(text, key)
-    
-    def atbash_encrypt(self, text):
-        return ''.join(
-            chr(155 - ord(char)) if char.isupper() else
-            chr(219 - ord(char)) if char.islower() else char
-            for char in text
-        )
-    
-    def atbash_decrypt(self, text):
-        return self.atbash_encrypt(text)
-    
-    def rail_fence_encrypt(self, text, key):
-        if not key:
-            raise ValueError("Key is required for Rail Fence cipher")
-        key = int(key)
-        rail = [''] * key
-        direction_down = False
-        row = 0
-        for char in text:
-            rail[row] += char
-            if row == 0 or row == key - 1:
-                direction_down = not direction_down
-            row += 1 if direction_down else -1
-        return ''.join(rail)
-    
-    def rail_fence_decrypt(self, text, key):
-        if not key:
-            raise ValueError("Key is required for Rail Fence cipher")
-        key = int(key)
-        rail = [''] * key
-        direction_down = False
-        row = 0
-        mark = [''] * len(text)
-        for i in range(len(text)):
-            mark[i] = row
-            if row == 0 or row == key - 1:
-                direction_down = not direction_down
-            row += 1 if direction_down else -1
-
-        index = 0
-        for i in range(key):
-            for j in range(len(text)):
-                if mark[j] == i:
-                    rail[i] += text[index]
-                    index += 1
-
-        result = ''
-        row = 0
-        direction_down = False
-        for i in range(len(text)):
-            result += rail[row][0] 
-            rail[row] = rail[row][1:]
-            if row == 0 or row == key - 1:
-                direction_down = not direction_down
-            row += 1 if direction_down else -1
-
-        return result
-    
-    def des3_encrypt(self, plaintext, key):
-        if not key:
-            raise ValueError("Key is required for DES3 encryption")
-        key_hash = hashlib.sha256(key.encode()).digest()[:24]
-        cipher = DES3.new(key_hash, DES3.MODE_CBC)
-        padded_text = pad(plaintext.encode(), DES3.block_size)
-        ciphertext = cipher.encrypt(padded_text)
-        return base64.b64encode(cipher.iv + ciphertext).decode()
-    
-    def des3_decrypt(self, ciphertext, key):
-        if not key:
-            raise ValueError("Key is required for DES3 decryption")
-        key_hash = hashlib.sha256(key.encode()).digest()[:24]
-        data = base64.b64decode(ciphertext.encode())
-        iv = data[:DES3.block_size]
-        ciphertext = data[DES3.block_size:]
-        cipher = DES3.new(key_hash, DES3.MODE_CBC, iv=iv)
-        decrypted = cipher.decrypt(ciphertext)
-        return unpad(decrypted, DES3.block_size).decode()
\ No newline at end of file
+import os
+import base64
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from keycache import KeyCache
+from functools import lru_cache
+from itertools import chain
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# pycryptodome is imported on first use (see _crypto) so that importing this
+# module, and starting the GUI, doesn't pay for it up front.
+
+# AES-GCM container: magic, version, segment size, nonce prefix, plaintext
+# length. The header is authenticated with every segment.
+GCM_MAGIC = b"QGCM"
+GCM_VERSION = 1
+GCM_HEADER = struct.Struct(">4sBI8sQ")
+GCM_TAG_SIZE = 16
+GCM_SEGMENT_SIZE = 1024 * 1024
+
+# NumPy is optional. When it is installed, OTP and Vigenère inputs of at
+# least this many bytes go through the vectorized kernels below; None
+# disables them.
+NUMPY_THRESHOLD = 16 * 1024
+# Vigenère kernel: short keys are tiled into rows of about this many bytes,
+# and rows are processed in blocks small enough to stay in cache.
+_NUMPY_ROW = 4096
+_NUMPY_BLOCK = 64 * 1024
+
+
+@lru_cache(maxsize=None)
+def _crypto(name):
+    if name in ("AES", "DES3"):
+        from Crypto.Cipher import AES, DES3
+        return AES if name == "AES" else DES3
+    from Crypto.Util import Padding
+    return getattr(Padding, name)
+
+
+@lru_cache(maxsize=None)
+def _load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _numpy_for(size):
+    if NUMPY_THRESHOLD is None or size < NUMPY_THRESHOLD:
+        return None
+    return _load_numpy()
+
+
+def _keygen():
+    from keygen import default_generator
+    return default_generator()
+
+
+def pad(data, block_size):
+    return _crypto("pad")(data, block_size)
+
+
+def unpad(data, block_size):
+    return _crypto("unpad")(data, block_size)
+
+
+class _ShiftTable(dict):
+    # str.translate table that fills in entries on first lookup, so every
+    # code point (not just ASCII) maps exactly as the per-character loop did.
+    def __init__(self, mapper):
+        super().__init__()
+        self.mapper = mapper
+        self._ascii = None
+
+    def __missing__(self, code):
+        value = self.mapper(code)
+        self[code] = value
+        return value
+
+    def ascii_bytes(self):
+        # ASCII letters only ever map to ASCII letters, so pure-ASCII input
+        # can go through bytes.translate with a 256-entry table.
+        if self._ascii is None:
+            self._ascii = bytes(self[c] for c in range(128)) + bytes(range(128, 256))
+        return self._ascii
+
+
+@lru_cache(maxsize=None)
+def _caesar_table(shift):
+    def mapper(code):
+        char = chr(code)
+        if char.islower():
+            return (code - 97 + shift) % 26 + 97
+        if char.isupper():
+            return (code - 65 + shift) % 26 + 65
+        return code
+    return _ShiftTable(mapper)
+
+
+@lru_cache(maxsize=None)
+def _vigenere_table(shift):
+    def mapper(code):
+        char = chr(code)
+        if not char.isalpha():
+            return code
+        offset = 65 if char.isupper() else 97
+        return (code - offset + shift) % 26 + offset
+    return _ShiftTable(mapper)
+
+
+@lru_cache(maxsize=None)
+def _atbash_table():
+    def mapper(code):
+        char = chr(code)
+        if char.isupper():
+            return 155 - code
+        if char.islower():
+            return 219 - code
+        return code
+    return _ShiftTable(mapper)
+
+
+def _byte_view(data):
+    # bytes and bytearray are used as they are; anything else exposing the
+    # buffer protocol is wrapped in a flat memoryview rather than copied.
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    view = memoryview(data)
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return view
+
+
+def _translate_bytes(data, table):
+    if isinstance(data, memoryview):
+        # bytes.translate needs a real bytes object; this is the one copy.
+        data = data.tobytes()
+    return data.translate(table)
+
+
+def _translate_strided_bytes(data, shifts, table_for):
+    period = len(shifts)
+    if period == 1:
+        return bytes(_translate_bytes(data, table_for(shifts[0]).ascii_bytes()))
+    out = bytearray(len(data))
+    for i, shift in enumerate(shifts[:len(data)]):
+        out[i::period] = _translate_bytes(data[i::period], table_for(shift).ascii_bytes())
+    return bytes(out)
+
+
+def _translate_strided(text, shifts, table_for):
+    # Position i uses shift shifts[i % len(shifts)], so each stride slice
+    # text[i::period] goes through a single translate with one table.
+    period = len(shifts)
+    if period == 1:
+        return text.translate(table_for(shifts[0]))
+    if text.isascii():
+        return _translate_strided_bytes(text.encode('ascii'), shifts, table_for).decode('ascii')
+    out = [''] * len(text)
+    for i, shift in enumerate(shifts[:len(text)]):
+        out[i::period] = text[i::period].translate(table_for(shift))
+    return ''.join(out)
+
+
+def _vigenere_shifts(key):
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        key = bytes(key).decode('latin-1')
+    return [(ord(k) - 97) % 26 for k in key]
+
+
+def _np_shift_letters(np, data, shifts):
+    # Vectorized _vigenere_table for ASCII bytes: letters move forward by
+    # the matching (broadcast) shift modulo 26, everything else is kept.
+    offset = data | 32
+    offset -= 97
+    letter = offset < 26
+    offset += shifts
+    wrap = offset >= 26
+    wrap &= letter
+    out = np.multiply(letter, shifts, dtype=np.uint8)
+    out += data
+    out -= wrap.view(np.uint8) * np.uint8(26)
+    return out
+
+
+def _np_vigenere_bytes(np, data, shifts):
+    data = np.frombuffer(data, dtype=np.uint8)
+    row = np.tile(np.array(shifts, dtype=np.uint8), max(1, _NUMPY_ROW // len(shifts)))
+    width = len(row)
+    block = max(width, _NUMPY_BLOCK // width * width)
+    body = len(data) - len(data) % width
+    out = np.empty_like(data)
+    for start in range(0, body, block):
+        stop = min(start + block, body)
+        out[start:stop] = _np_shift_letters(np, data[start:stop].reshape(-1, width), row).reshape(-1)
+    out[body:] = _np_shift_letters(np, data[body:], row[:len(data) - body])
+    return out.tobytes()
+
+
+def _vigenere_bytes(data, shifts):
+    np = _numpy_for(len(data)) if len(shifts) > 1 else None
+    if np is not None:
+        return _np_vigenere_bytes(np, data, shifts)
+    return _translate_strided_bytes(data, shifts, _vigenere_table)
+
+
+def _vigenere(text, shifts):
+    # Only ASCII text is vectorized; the table also shifts non-ASCII letters.
+    if text.isascii():
+        return _vigenere_bytes(text.encode('ascii'), shifts).decode('ascii')
+    return _translate_strided(text, shifts, _vigenere_table)
+
+
+def _xor_bytes(data, key):
+    # key is at least as long as data; the result has len(data) bytes.
+    size = len(data)
+    np = _numpy_for(size)
+    if np is not None:
+        mixed = np.frombuffer(data, dtype=np.uint8) ^ np.frombuffer(key, dtype=np.uint8, count=size)
+        return mixed.tobytes()
+    # XOR of whole buffers as big integers keeps the work in C.
+    mixed = int.from_bytes(data, 'little') ^ int.from_bytes(key[:size], 'little')
+    return mixed.to_bytes(size, 'little')
+
+
+def _xor_text(text, key):
+    # XOR of code points, as chr(ord(t) ^ ord(k)) for each pair.
+    key = key[:len(text)]
+    if text.isascii() and key.isascii():
+        return _xor_bytes(text.encode('ascii'), key.encode('ascii')).decode('ascii')
+    np = _numpy_for(len(text))
+    if np is not None:
+        points = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+        points = points ^ np.frombuffer(key.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+        return points.tobytes().decode('utf-32-le', 'surrogatepass')
+    return ''.join(chr(ord(t) ^ ord(k)) for t, k in zip(text, key))
+
+@lru_cache(maxsize=128)
+def _rail_fence_permutation(key, length):
+    # The zig-zag permutation as (plaintext slice, ciphertext slice) pairs:
+    # every rail is one or two arithmetic progressions with step
+    # 2 * (key - 1), so text[plain] == ciphertext[cipher] for each pair and
+    # the whole permutation costs O(key) to store regardless of length.
+    if key == 1:
+        return ((slice(0, length), slice(0, length)),)
+    cycle = 2 * (key - 1)
+    pairs = []
+    start = 0
+    for row in range(min(key, length)):
+        down = range(row, length, cycle)
+        if row == 0 or row == key - 1:
+            pairs.append((slice(row, length, cycle), slice(start, start + len(down))))
+            start += len(down)
+            continue
+        up = range(cycle - row, length, cycle)
+        stop = start + len(down) + len(up)
+        pairs.append((slice(row, length, cycle), slice(start, stop, 2)))
+        pairs.append((slice(cycle - row, length, cycle), slice(start + 1, stop, 2)))
+        start = stop
+    return tuple(pairs)
+
+
+def _permute(text, pairs, decrypt, length=None):
+    # Gather text (str or bytes-like) into a preallocated buffer using slice
+    # copies only. length shortens the output when pairs only cover a prefix.
+    if not isinstance(text, str):
+        data = _byte_view(text)
+        out = bytearray(len(data) if length is None else length)
+    elif text.isascii():
+        data = text.encode('ascii')
+        out = bytearray(len(data) if length is None else length)
+    else:
+        data = text
+        out = [''] * (len(text) if length is None else length)
+    for plain, cipher in pairs:
+        if decrypt:
+            out[plain] = data[cipher]
+        else:
+            out[cipher] = data[plain]
+    if isinstance(out, list):
+        return ''.join(out)
+    return bytes(out) if not isinstance(text, str) else out.decode('ascii')
+
+
+@contextmanager
+def _open_binary(target, mode):
+    # Accept either a filesystem path or an already open binary file object.
+    if isinstance(target, (str, bytes, os.PathLike)):
+        with open(target, mode) as f:
+            yield f
+    else:
+        yield target
+
+
+def _read_chunks(src, chunk_size):
+    while True:
+        data = src.read(chunk_size)
+        if not data:
+            return
+        yield data
+
+
+def _remaining_size(f):
+    # Bytes left to read in a binary file object with a known size.
+    try:
+        return os.fstat(f.fileno()).st_size - f.tell()
+    except (AttributeError, OSError, ValueError):
+        raise ValueError("This cipher needs an input of known size, such as a regular file") from None
+
+
+CIPHERS = {}
+
+
+def register_cipher(cls):
+    """Class decorator adding a Cipher subclass to the registry under cls.name."""
+    CIPHERS[cls.name] = cls
+    return cls
+
+
+def get_cipher(name):
+    try:
+        return CIPHERS[name]
+    except KeyError:
+        raise ValueError("Unsupported cipher selected.") from None
+
+
+def cipher_names():
+    return list(CIPHERS)
+
+
+class Cipher:
+    """Base class for registered ciphers.
+    
+    The class is the algorithm and an instance is a prepared key: prepare()
+    parses or derives the key once, and the instance can then encrypt and
+    decrypt any number of messages. owner is the CipherImplementations that
+    supplies the key cache, instrumentation and worker pool.
+    """
+    
+    name = None
+    requires_key = True
+    streamable = False
+    # True when the cipher works on bytes; its text mode is UTF-8 in,
+    # base64 out.
+    byte_oriented = False
+    # Set when output character i depends only on input character i and
+    # i % char_period (0: on i itself, with no period). Such ciphers can
+    # encrypt any slice on its own through encrypt_at and decrypt_at.
+    char_period = None
+    # True when the key is the path of a local file, which must not be
+    # chosen by remote or per-record callers.
+    key_is_path = False
+    # False when encrypting has side effects, such as using up pad, so the
+    # live preview must not encrypt speculatively.
+    previewable = True
+    # Secret bytes tied to the key, for keyed digests such as the folder
+    # manifest's; None for ciphers without one.
+    mac_key = None
+    
+    def __init__(self, key, owner):
+        self.owner = owner
+    
+    @classmethod
+    def prepare(cls, key, owner=None):
+        return cls(key, owner if owner is not None else _default_owner())
+    
+    @classmethod
+    def generate_key(cls, length=None):
+        return cls.generate_keys(1, length)[0]
+    
+    @classmethod
+    def generate_keys(cls, count, length=None):
+        """count random keys; length is in the cipher's own unit, if it has one."""
+        if not cls.requires_key:
+            raise ValueError(f"{cls.name} takes no key")
+        raise NotImplementedError
+    
+    def encrypt(self, text):
+        raise NotImplementedError
+    
+    def decrypt(self, text):
+        raise NotImplementedError
+    
+    def encrypt_bytes(self, data):
+        raise NotImplementedError
+    
+    def decrypt_bytes(self, data):
+        raise NotImplementedError
+    
+    def encrypt_at(self, text, offset):
+        """Encrypt text as if it started at position offset of a longer message."""
+        raise NotImplementedError
+    
+    def decrypt_at(self, text, offset):
+        raise NotImplementedError
+
+
+class _BlockCipher(Cipher):
+    # IV + CBC ciphertext; text mode is UTF-8 in, base64 out.
+    module_name = None
+    key_size = None
+    streamable = True
+    byte_oriented = True
+    
+    def __init__(self, key, owner):
+        super().__init__(key, owner)
+        if not key:
+            raise ValueError(f"Key is required for {self.name} encryption")
+        self.module = _crypto(self.module_name)
+        self.block_size = self.module.block_size
+        self.key_bytes = owner._derive_key(self.name, key, self.key_size)
+        self.mac_key = self.key_bytes
+    
+    @classmethod
+    def generate_keys(cls, count, length=None):
+        return _keygen().tokens(count, length or cls.generated_key_size)
+    
+    def new_engine(self, iv=None):
+        return self.module.new(self.key_bytes, self.module.MODE_CBC, iv=iv if iv is not None else self.new_iv())
+    
+    def new_iv(self):
+        # An IV starting with the compression header is drawn again, so an
+        # uncompressed ciphertext never begins like a compressed one.
+        from compression import MAGIC
+        while True:
+            iv = os.urandom(self.block_size)
+            if not iv.startswith(MAGIC):
+                return iv
+    
+    def encrypt(self, text):
+        return base64.b64encode(self.encrypt_bytes(text.encode())).decode()
+    
+    def decrypt(self, text):
+        return self.decrypt_bytes(base64.b64decode(text.encode())).decode()
+    
+    def encrypt_bytes(self, data):
+        if self.owner.compression:
+            return self._encrypt_compressed(data, self.owner.compression)
+        return self._encrypt_blocks(data)
+    
+    def decrypt_bytes(self, data):
+        from compression import HEADER_SIZE, decompress, read_header
+        data = _byte_view(data)
+        codec = read_header(data) if len(data) % self.block_size == HEADER_SIZE else None
+        if codec is None:
+            return self._decrypt_blocks(data)
+        return decompress(self._decrypt_blocks(memoryview(data)[HEADER_SIZE:]), codec)
+    
+    def _encrypt_compressed(self, data, algorithm):
+        from compression import CompressionStats, compress, header
+        payload, compressor = compress(_byte_view(data), algorithm)
+        start = time.perf_counter()
+        out = header(compressor.codec) + self._encrypt_blocks(payload)
+        self.owner.last_compression = CompressionStats(algorithm, compressor.original_size, len(payload),
+                                                       compressor.elapsed, time.perf_counter() - start)
+        return out
+    
+    def _encrypt_blocks(self, data):
+        # Whole blocks are encrypted straight from the caller's buffer; only
+        # the short tail is copied for padding.
+        engine = self.new_engine()
+        data = _byte_view(data)
+        block = self.block_size
+        cut = len(data) - len(data) % block
+        tail = pad(bytes(data[cut:]), block)
+        return b''.join((engine.iv, engine.encrypt(data[:cut]) if cut else b'', engine.encrypt(tail)))
+    
+    def _decrypt_blocks(self, data):
+        data = _byte_view(data)
+        block = self.block_size
+        if len(data) < 2 * block or len(data) % block:
+            raise ValueError("Ciphertext is truncated or not a multiple of the block size")
+        engine = self.new_engine(iv=bytes(data[:block]))
+        return unpad(engine.decrypt(data[block:]), block)
+
+
+@register_cipher
+class AESCipher(_BlockCipher):
+    name = "AES"
+    module_name = "AES"
+    key_size = 16
+    generated_key_size = 32
+
+
+@register_cipher
+class CaesarCipher(Cipher):
+    name = "Caesar"
+    char_period = 1
+    
+    def __init__(self, key, owner):
+        super().__init__(key, owner)
+        if not key and key != 0:
+            raise ValueError("Key is required for Caesar cipher")
+        self.shift = int(key) % 26
+    
+    @classmethod
+    def generate_keys(cls, count, length=None):
+        if length is not None:
+            raise ValueError("Caesar keys are a shift and have no length")
+        return [str(shift) for shift in _keygen().integers(count, 1, 25)]
+    
+    def encrypt(self, text):
+        return text.translate(_caesar_table(self.shift))
+    
+    def encrypt_at(self, text, offset):
+        return self.encrypt(text)
+    
+    def decrypt(self, text):
+        return text.translate(_caesar_table(-self.shift % 26))
+    
+    def decrypt_at(self, text, offset):
+        return self.decrypt(text)
+    
+    def encrypt_bytes(self, data):
+        # Only ASCII letters are shifted; every other byte passes through.
+        return bytes(_translate_bytes(_byte_view(data), _caesar_table(self.shift).ascii_bytes()))
+    
+    def decrypt_bytes(self, data):
+        return bytes(_translate_bytes(_byte_view(data), _caesar_table(-self.shift % 26).ascii_bytes()))
+
+
+@register_cipher
+class VigenereCipher(Cipher):
+    name = "Vigenère"
+    
+    def __init__(self, key, owner):
+        super().__init__(key, owner)
+        if not key:
+            raise ValueError("Key is required for Vigenère cipher")
+        self.shifts = _vigenere_shifts(key)
+        self.inverse_shifts = [-shift % 26 for shift in self.shifts]
+        self.char_period = len(self.shifts)
+    
+    @classmethod
+    def generate_keys(cls, count, length=None):
+        return _keygen().strings(count, length or 16)
+    
+    def encrypt(self, text):
+        return _vigenere(text, self.shifts)
+    
+    def encrypt_at(self, text, offset):
+        start = offset % len(self.shifts)
+        return _vigenere(text, self.shifts[start:] + self.shifts[:start])
+    
+    def decrypt(self, text):
+        return _vigenere(text, self.inverse_shifts)
+    
+    def decrypt_at(self, text, offset):
+        start = offset % len(self.shifts)
+        return _vigenere(text, self.inverse_shifts[start:] + self.inverse_shifts[:start])
+    
+    def encrypt_bytes(self, data):
+        return _vigenere_bytes(_byte_view(data), self.shifts)
+    
+    def decrypt_bytes(self, data):
+        return _vigenere_bytes(_byte_view(data), self.inverse_shifts)
+
+
+@register_cipher
+class OTPCipher(Cipher):
+    name = "OTP"
+    char_period = 0
+    
+    def __init__(self, key, owner):
+        super().__init__(key, owner)
+        if not key:
+            raise ValueError("Key is required for OTP encryption")
+        self.key = key
+    
+    @classmethod
+    def generate_keys(cls, count, length=None):
+        return _keygen().strings(count, length or 16)
+    
+    def encrypt(self, text):
+        key = self.key
+        if len(key) < len(text):
+            raise ValueError("OTP key must be at least as long as the plaintext")
+        return _xor_text(text, key)
+    
+    def decrypt(self, text):
+        return self.encrypt(text)
+    
+    def encrypt_at(self, text, offset):
+        if len(self.key) < offset + len(text):
+            raise ValueError("OTP key must be at least as long as the plaintext")
+        return _xor_text(text, self.key[offset:])
+    
+    def decrypt_at(self, text, offset):
+        return self.encrypt_at(text, offset)
+    
+    def encrypt_bytes(self, data):
+        key = self.key.encode() if isinstance(self.key, str) else self.key
+        data = _byte_view(data)
+        key = memoryview(_byte_view(key))
+        if len(key) < len(data):
+            raise ValueError("OTP key must be at least as long as the plaintext")
+        return _xor_bytes(data, key)
+    
+    def decrypt_bytes(self, data):
+        return self.encrypt_bytes(data)
+
+
+@register_cipher
+class OTPPadCipher(Cipher):
+    """One-time pad whose key is a pad file (see otppad).
+    
+    Each message reserves the next unused stretch of the pad; the
+    ciphertext starts with a header naming the pad and the offset, and
+    the XOR runs directly over the memory-mapped pad. Decrypting moves
+    the local cursor past the message, so replies never reuse its bytes.
+    """
+    
+    name = "OTP Pad"
+    streamable = True
+    byte_oriented = True
+    key_is_path = True
+    previewable = False
+    
+    def __init__(self, key, owner):
+        super().__init__(key, owner)
+        if not key:
+            raise ValueError("Key is required: the path of a one-time pad file")
+        from otppad import PadFile
+        self.path = key
+        with PadFile(key) as pad:
+            self.pad_id = pad.pad_id
+            self.mac_key = pad.secret
+        # Identifies the pad; it is public, as every ciphertext carries it.
+        self.key_bytes = self.pad_id
+    
+    @classmethod
+    def generate_keys(cls, count, length=None):
+        raise ValueError("OTP Pad keys are pad files. Create one with: python main.py pad create PATH SIZE")
+    
+    def encrypt(self, text):
+        return base64.b64encode(self.encrypt_bytes(text.encode('utf-8', 'surrogatepass'))).decode()
+    
+    def decrypt(self, text):
+        return self.decrypt_bytes(base64.b64decode(text.encode())).decode('utf-8', 'surrogatepass')
+    
+    def encrypt_bytes(self, data):
+        data = _byte_view(data)
+        with self._open() as pad:
+            offset = pad.reserve(len(data))
+            with pad.view(offset, len(data)) as key:
+                return pad.header(offset, len(data)) + _xor_bytes(data, key)
+    
+    def decrypt_bytes(self, data):
+        data = memoryview(_byte_view(data))
+        with self._open() as pad:
+            offset, length = pad.parse_header(data)
+            body = data[pad.header_size:]
+            if len(body) != length:
+                raise ValueError("One-time pad ciphertext is truncated or has trailing data")
+            pad.consume(offset, length)
+            with pad.view(offset, length) as key:
+                return _xor_bytes(body, key)
+    
+    def encrypt_stream(self, src, dst, chunk_size=STREAM_CHUNK_SIZE, encoding="base64", progress=None):
+        """Encrypt src into dst in chunk_size pieces; src must have a known size."""
+        if encoding not in ("base64", "raw"):
+            raise ValueError("encoding must be 'base64' or 'raw'")
+        written = 0
+        with _open_binary(src, 'rb') as fin, _open_binary(dst, 'wb') as fout, self._open() as pad:
+            size = _remaining_size(fin)
+            offset = pad.reserve(size)
+            carry = pad.header(offset, size)
+            done = 0
+            while done < size:
+                data = fin.read(min(chunk_size, size - done))
+                if not data:
+                    raise ValueError("Input shrank while it was being encrypted")
+                with pad.view(offset + done, len(data)) as key:
+                    out = carry + _xor_bytes(data, key)
+                done += len(data)
+                carry = b''
+                if encoding == "base64":
+                    cut = len(out) - len(out) % 3
+                    out, carry = base64.b64encode(out[:cut]), out[cut:]
+                fout.write(out)
+                written += len(out)
+                if progress:
+                    progress(done)
+            if carry:
+                out = base64.b64encode(carry) if encoding == "base64" else carry
+                fout.write(out)
+                written += len(out)
+        return written
+    
+    def decrypt_stream(self, src, dst, chunk_size=STREAM_CHUNK_SIZE, progress=None):
+        """Decrypt the output of encrypt_stream, raw or base64 (told apart by the header)."""
+        written = 0
+        consumed = 0
+        with _open_binary(src, 'rb') as fin, _open_binary(dst, 'wb') as fout, self._open() as pad:
+            chunks = _read_chunks(fin, max(4, chunk_size - chunk_size % 4))
+            first = next(chunks, b'')
+            armored = not first.startswith(pad.magic)
+            carry = b''
+            head = b''
+            offset = length = None
+            for data in chain([first], chunks):
+                consumed += len(data)
+                if armored:
+                    data = carry + data.translate(None, b' \t\r\n')
+                    cut = len(data) - len(data) % 4
+                    data, carry = base64.b64decode(data[:cut], validate=True), data[cut:]
+                if offset is None:
+                    head += data
+                    if len(head) < pad.header_size:
+                        continue
+                    offset, length = pad.parse_header(head)
+                    pad.consume(offset, length)
+                    data, head = head[pad.header_size:], b''
+                if written + len(data) > length:
+                    raise ValueError("One-time pad ciphertext is truncated or has trailing data")
+                with pad.view(offset + written, len(data)) as key:
+                    fout.write(_xor_bytes(data, key))
+                written += len(data)
+                if progress:
+                    progress(consumed)
+            if carry or offset is None or written != length:
+                raise ValueError("One-time pad ciphertext is truncated or has trailing data")
+        return written
+    
+    def _open(self):
+        from otppad import PadFile
+        pad = PadFile(self.path)
+        if pad.pad_id != self.pad_id:
+            pad.close()
+            raise ValueError(f"{self.path} was replaced by a different pad")
+        return pad
+
+
+@register_cipher
+class AtbashCipher(Cipher):
+    name = "Atbash"
+    requires_key = False
+    char_period = 1
+    
+    def encrypt(self, text):
+        return text.translate(_atbash_table())
+    
+    def encrypt_at(self, text, offset):
+        return self.encrypt(text)
+    
+    def decrypt(self, text):
+        return self.encrypt(text)
+    
+    def decrypt_at(self, text, offset):
+        return self.encrypt(text)
+    
+    def encrypt_bytes(self, data):
+        return bytes(_translate_bytes(_byte_view(data), _atbash_table().ascii_bytes()))
+    
+    def decrypt_bytes(self, data):
+        return self.encrypt_bytes(data)
+
+
+@register_cipher
+class RailFenceCipher(Cipher):
+    name = "Rail Fence"
+    
+    def __init__(self, key, owner):
+        super().__init__(key, owner)
+        if not key:
+            raise ValueError("Key is required for Rail Fence cipher")
+        self.rails = int(key)
+        if self.rails < 1:
+            raise ValueError("Rail Fence key must be a positive number of rails")
+    
+    @classmethod
+    def generate_keys(cls, count, length=None):
+        if length is not None:
+            raise ValueError("Rail Fence keys are a number of rails and have no length")
+        return [str(rails) for rails in _keygen().integers(count, 2, 10)]
+    
+    def encrypt(self, text):
+        return _permute(text, _rail_fence_permutation(self.rails, len(text)), decrypt=False)
+    
+    def decrypt(self, text):
+        return _permute(text, _rail_fence_permutation(self.rails, len(text)), decrypt=True)
+    
+    def decrypt_prefix(self, text, count):
+        """Decrypt only the first count characters, at O(count) cost."""
+        count = min(count, len(text))
+        pairs = []
+        for plain, cipher in _rail_fence_permutation(self.rails, len(text)):
+            step = cipher.step or 1
+            taken = len(range(plain.start, count, plain.step or 1))
+            pairs.append((slice(plain.start, count, plain.step),
+                          slice(cipher.start, cipher.start + taken * step, step)))
+        return _permute(text, pairs, decrypt=True, length=count)
+    
+    def encrypt_bytes(self, data):
+        return self.encrypt(_byte_view(data))
+    
+    def decrypt_bytes(self, data):
+        return self.decrypt(_byte_view(data))
+
+
+@register_cipher
+class DES3Cipher(_BlockCipher):
+    name = "DES3"
+    module_name = "DES3"
+    key_size = 24
+    generated_key_size = 24
+
+
+@register_cipher
+class AESGCMCipher(Cipher):
+    """AES-256-GCM over independent segments, encrypted in parallel.
+    
+    Segment i uses nonce prefix + i and carries its own tag. Each tag also
+    covers the container header and a last-segment flag, so segments
+    cannot be reordered, truncated or moved between containers.
+    """
+    
+    name = "AES-GCM"
+    byte_oriented = True
+    
+    def __init__(self, key, owner, segment_size=GCM_SEGMENT_SIZE):
+        super().__init__(key, owner)
+        if not key:
+            raise ValueError("Key is required for AES-GCM encryption")
+        if not 0 < segment_size < 2 ** 32:
+            raise ValueError("segment_size must be between 1 and 2**32 - 1")
+        self.segment_size = segment_size
+        self.key_bytes = owner._derive_key(self.name, key, 32)
+    
+    @classmethod
+    def prepare(cls, key, owner=None, segment_size=GCM_SEGMENT_SIZE):
+        return cls(key, owner if owner is not None else _default_owner(), segment_size)
+    
+    @classmethod
+    def generate_keys(cls, count, length=None):
+        return _keygen().tokens(count, length or 32)
+    
+    def encrypt(self, text):
+        return base64.b64encode(self.encrypt_bytes(text.encode())).decode()
+    
+    def decrypt(self, text):
+        return self.decrypt_bytes(base64.b64decode(text.encode())).decode()
+    
+    def encrypt_bytes(self, data):
+        data = memoryview(_byte_view(data))
+        segment_size = self.segment_size
+        header = GCM_HEADER.pack(GCM_MAGIC, GCM_VERSION, segment_size, os.urandom(8), len(data))
+        count = max(1, -(-len(data) // segment_size))
+        
+        def seal(index):
+            engine = self._segment_engine(header, index, count)
+            ciphertext, tag = engine.encrypt_and_digest(data[index * segment_size:(index + 1) * segment_size])
+            return ciphertext + tag
+        
+        return header + b''.join(self.owner._map_segments(seal, count))
+    
+    def decrypt_bytes(self, data):
+        data = memoryview(_byte_view(data))
+        if len(data) < GCM_HEADER.size:
+            raise ValueError("Not an AES-GCM container: data too short")
+        header = bytes(data[:GCM_HEADER.size])
+        magic, version, segment_size, _, length = GCM_HEADER.unpack(header)
+        if magic != GCM_MAGIC or version != GCM_VERSION or not segment_size:
+            raise ValueError("Not an AES-GCM container or unsupported version")
+        count = max(1, -(-length // segment_size))
+        stride = segment_size + GCM_TAG_SIZE
+        if len(data) != GCM_HEADER.size + length + count * GCM_TAG_SIZE:
+            raise ValueError("AES-GCM container is truncated or has trailing data")
+        body = data[GCM_HEADER.size:]
+        
+        def open_segment(index):
+            segment = body[index * stride:(index + 1) * stride]
+            engine = self._segment_engine(header, index, count)
+            try:
+                return engine.decrypt_and_verify(segment[:-GCM_TAG_SIZE], segment[-GCM_TAG_SIZE:])
+            except ValueError:
+                raise ValueError(f"AES-GCM authentication failed for segment {index}") from None
+        
+        return b''.join(self.owner._map_segments(open_segment, count))
+    
+    def _segment_engine(self, header, index, count):
+        nonce = header[9:17] + struct.pack(">I", index)
+        aes = _crypto("AES")
+        engine = aes.new(self.key_bytes, aes.MODE_GCM, nonce=nonce, mac_len=GCM_TAG_SIZE)
+        engine.update(header + (b"\x01" if index == count - 1 else b"\x00"))
+        return engine
+
+
+_default = None
+
+
+def _default_owner():
+    global _default
+    if _default is None:
+        _default = CipherImplementations()
+    return _default
+
+
+_worker = None
+
+
+def worker_ciphers():
+    """The CipherImplementations shared by batch workers in this process.
+
+    Every batch a worker process (or thread pool) handles goes through the
+    same object, so its key cache is reused. It uses one GCM thread, as the
+    workers already use every core.
+    """
+    global _worker
+    if _worker is None:
+        _worker = CipherImplementations(workers=1)
+    return _worker
+
+
+class CipherImplementations:
+    def __init__(self, key_cache=None, workers=None):
+        # Derives AES/DES3 keys; with a slow kdf, the results are shared by
+        # every call made through this object.
+        self.key_cache = key_cache if key_cache is not None else KeyCache()
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+        # Optional metrics.Instrumentation; None keeps dispatch untimed.
+        self.instrumentation = None
+        # "zlib", "lzma" or "bz2" compresses AES/DES3 plaintext before it is
+        # encrypted; decryption detects it either way. last_compression holds
+        # the compression.CompressionStats of the latest compressed call.
+        self.compression = None
+        self.last_compression = None
+    
+    def prepare(self, cipher, key):
+        """Parse or derive key once; the returned context is reusable."""
+        return get_cipher(cipher).prepare(key, owner=self)
+    
+    def generate_keys(self, cipher, count=1, length=None):
+        """count random keys for cipher, from a pooled os.urandom buffer."""
+        return get_cipher(cipher).generate_keys(count, length)
+    
+    def encrypt(self, cipher, plaintext, key):
+        if self.instrumentation is not None:
+            return self.instrumentation.measure("encrypt", cipher, self._encrypt, plaintext, key)
+        return self._encrypt(cipher, plaintext, key)
+    
+    def decrypt(self, cipher, ciphertext, key):
+        if self.instrumentation is not None:
+            return self.instrumentation.measure("decrypt", cipher, self._decrypt, ciphertext, key)
+        return self._decrypt(cipher, ciphertext, key)
+    
+    def encrypt_bytes(self, cipher, data, key):
+        """Binary counterpart of encrypt: bytes-like in, bytes out."""
+        if self.instrumentation is not None:
+            return self.instrumentation.measure("encrypt", cipher, self._encrypt_bytes, data, key)
+        return self._encrypt_bytes(cipher, data, key)
+    
+    def decrypt_bytes(self, cipher, data, key):
+        """Binary counterpart of decrypt: bytes-like in, bytes out."""
+        if self.instrumentation is not None:
+            return self.instrumentation.measure("decrypt", cipher, self._decrypt_bytes, data, key)
+        return self._decrypt_bytes(cipher, data, key)
+    
+    def _encrypt(self, cipher, plaintext, key):
+        return self.prepare(cipher, key).encrypt(plaintext)
+    
+    def _decrypt(self, cipher, ciphertext, key):
+        return self.prepare(cipher, key).decrypt(ciphertext)
+    
+    def _encrypt_bytes(self, cipher, data, key):
+        return self.prepare(cipher, key).encrypt_bytes(data)
+    
+    def _decrypt_bytes(self, cipher, data, key):
+        return self.prepare(cipher, key).decrypt_bytes(data)
+    
+    # Per-cipher shortcuts, kept for callers that predate the registry.
+    
+    def aes_encrypt(self, plaintext, key):
+        return self.prepare("AES", key).encrypt(plaintext)
+    
+    def aes_decrypt(self, ciphertext, key):
+        return self.prepare("AES", key).decrypt(ciphertext)
+    
+    def aes_encrypt_bytes(self, data, key):
+        return self.prepare("AES", key).encrypt_bytes(data)
+    
+    def aes_decrypt_bytes(self, data, key):
+        return self.prepare("AES", key).decrypt_bytes(data)
+    
+    def aes_gcm_encrypt(self, plaintext, key):
+        return self.prepare("AES-GCM", key).encrypt(plaintext)
+    
+    def aes_gcm_decrypt(self, ciphertext, key):
+        return self.prepare("AES-GCM", key).decrypt(ciphertext)
+    
+    def aes_gcm_encrypt_bytes(self, data, key, segment_size=GCM_SEGMENT_SIZE):
+        return AESGCMCipher.prepare(key, self, segment_size).encrypt_bytes(data)
+    
+    def aes_gcm_decrypt_bytes(self, data, key):
+        return self.prepare("AES-GCM", key).decrypt_bytes(data)
+    
+    def caesar_encrypt(self, text, key):
+        return self.prepare("Caesar", key).encrypt(text)
+    
+    def caesar_decrypt(self, text, key):
+        return self.prepare("Caesar", key).decrypt(text)
+    
+    def caesar_encrypt_bytes(self, data, key):
+        return self.prepare("Caesar", key).encrypt_bytes(data)
+    
+    def caesar_decrypt_bytes(self, data, key):
+        return self.prepare("Caesar", key).decrypt_bytes(data)
+    
+    def vigenere_encrypt(self, text, key):
+        return self.prepare("Vigenère", key).encrypt(text)
+    
+    def vigenere_decrypt(self, text, key):
+        return self.prepare("Vigenère", key).decrypt(text)
+    
+    def vigenere_encrypt_bytes(self, data, key):
+        return self.prepare("Vigenère", key).encrypt_bytes(data)
+    
+    def vigenere_decrypt_bytes(self, data, key):
+        return self.prepare("Vigenère", key).decrypt_bytes(data)
+    
+    def otp_encrypt(self, text, key):
+        return self.prepare("OTP", key).encrypt(text)
+    
+    def otp_decrypt(self, text, key):
+        return self.prepare("OTP", key).decrypt(text)
+    
+    def otp_encrypt_bytes(self, data, key):
+        return self.prepare("OTP", key).encrypt_bytes(data)
+    
+    def otp_decrypt_bytes(self, data, key):
+        return self.prepare("OTP", key).decrypt_bytes(data)
+    
+    def atbash_encrypt(self, text):
+        return self.prepare("Atbash", None).encrypt(text)
+    
+    def atbash_decrypt(self, text):
+        return self.prepare("Atbash", None).decrypt(text)
+    
+    def atbash_encrypt_bytes(self, data):
+        return self.prepare("Atbash", None).encrypt_bytes(data)
+    
+    def atbash_decrypt_bytes(self, data):
+        return self.prepare("Atbash", None).decrypt_bytes(data)
+    
+    def rail_fence_encrypt(self, text, key):
+        return self.prepare("Rail Fence", key).encrypt(text)
+    
+    def rail_fence_decrypt(self, text, key):
+        return self.prepare("Rail Fence", key).decrypt(text)
+    
+    def rail_fence_encrypt_bytes(self, data, key):
+        return self.prepare("Rail Fence", key).encrypt_bytes(data)
+    
+    def rail_fence_decrypt_bytes(self, data, key):
+        return self.prepare("Rail Fence", key).decrypt_bytes(data)
+    
+    def des3_encrypt(self, plaintext, key):
+        return self.prepare("DES3", key).encrypt(plaintext)
+    
+    def des3_decrypt(self, ciphertext, key):
+        return self.prepare("DES3", key).decrypt(ciphertext)
+    
+    def des3_encrypt_bytes(self, data, key):
+        return self.prepare("DES3", key).encrypt_bytes(data)
+    
+    def des3_decrypt_bytes(self, data, key):
+        return self.prepare("DES3", key).decrypt_bytes(data)
+    
+    def _derive_key(self, cipher, key, size):
+        if self.instrumentation is None:
+            return self.key_cache.derive(cipher, key, size)
+        start = time.perf_counter()
+        material = self.key_cache.derive(cipher, key, size)
+        self.instrumentation.add_kdf_time(time.perf_counter() - start)
+        return material
+    
+    def _map_segments(self, func, count):
+        # pycryptodome releases the GIL inside the cipher, so threads scale
+        # across cores without pickling segments to other processes.
+        if count == 1 or self.workers == 1:
+            return [func(i) for i in range(count)]
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="qrypto-gcm")
+        return list(self._pool.map(func, range(count)))
+    
+    def _new_block_cipher(self, cipher, key, iv=None):
+        context = self.prepare(cipher, key)
+        if not hasattr(context, "new_engine"):
+            raise ValueError(f"{cipher} is not a block cipher; only AES and DES3 are supported here")
+        return context.new_engine(iv)
+    
+    def encrypt_stream(self, cipher, src, dst, key, chunk_size=STREAM_CHUNK_SIZE,
+                       encoding="base64", progress=None, compression=None):
+        """Encrypt src into dst with AES or DES3 in CBC mode (or OTP Pad), chunk by chunk.
+        
+        src and dst are paths or binary file objects. The output is the IV
+        followed by the ciphertext, exactly as aes_encrypt/des3_encrypt
+        produce it; with encoding="base64" it is base64 encoded incrementally
+        so the result can also be pasted into the Decrypt tab. progress, if
+        given, is called with the number of plaintext bytes read so far.
+        compression defaults to self.compression when None; pass False or
+        "" to write an uncompressed stream regardless. Returns the number
+        of bytes written.
+        """
+        if encoding not in ("base64", "raw"):
+            raise ValueError("encoding must be 'base64' or 'raw'")
+        context = self.prepare(cipher, key)
+        if hasattr(context, "encrypt_stream"):
+            # OTP Pad has its own container format and is not compressed.
+            return context.encrypt_stream(src, dst, chunk_size, encoding, progress)
+        compressor = None
+        if compression is None:
+            compression = self.compression
+        if compression:
+            from compression import Compressor
+            compressor = Compressor(compression)
+        engine = self._new_block_cipher(cipher, key)
+        block = engine.block_size
+        chunk_size = max(block, chunk_size - chunk_size % block)
+        written = 0
+        consumed = 0
+        with _open_binary(src, 'rb') as fin, _open_binary(dst, 'wb') as fout:
+            carry = b''
+            
+            def emit(data, final=False):
+                nonlocal carry, written
+                if encoding == "raw":
+                    fout.write(data)
+                    written += len(data)
+                    return
+                data = carry + data
+                cut = len(data) if final else len(data) - len(data) % 3
+                carry = data[cut:]
+                encoded = base64.b64encode(data[:cut])
+                fout.write(encoded)
+                written += len(encoded)
+            
+            if compressor:
+                from compression import header
+                emit(header(compressor.codec))
+            emit(engine.iv)
+            pending = b''
+            started = time.perf_counter()
+            for data in _read_chunks(fin, chunk_size):
+                consumed += len(data)
+                pending += compressor.compress(data) if compressor else data
+                cut = len(pending) - len(pending) % block
+                if cut:
+                    emit(engine.encrypt(pending[:cut]))
+                    pending = pending[cut:]
+                if progress:
+                    progress(consumed)
+            if compressor:
+                pending += compressor.flush()
+            emit(engine.encrypt(pad(pending, block)), final=True)
+        if compressor:
+            from compression import CompressionStats
+            self.last_compression = CompressionStats(
+                compression, compressor.original_size, compressor.compressed_size, compressor.elapsed,
+                time.perf_counter() - started - compressor.elapsed)
+        return written
+    
+    def decrypt_stream(self, cipher, src, dst, key, chunk_size=STREAM_CHUNK_SIZE,
+                       encoding=None, progress=None):
+        """Decrypt the output of encrypt_stream (or aes_encrypt/des3_encrypt).
+        
+        encoding is "base64", "raw" or None to detect it from the first
+        chunk. The last cipher block is held back until the end of the input
+        so only it is unpadded. Compressed ciphertext is recognized by its
+        header ahead of the IV and decompressed on the fly. Returns the
+        number of plaintext bytes written.
+        """
+        if encoding not in (None, "base64", "raw"):
+            raise ValueError("encoding must be 'base64', 'raw' or None")
+        context = self.prepare(cipher, key)
+        if hasattr(context, "decrypt_stream"):
+            return context.decrypt_stream(src, dst, chunk_size, progress)
+        from compression import HEADER_SIZE, Decompressor, read_header
+        decompressor = None
+        probe = self._new_block_cipher(cipher, key)
+        block = probe.block_size
+        chunk_size = max(4 * block, chunk_size - chunk_size % (4 * block))
+        written = 0
+        consumed = 0
+        with _open_binary(src, 'rb') as fin, _open_binary(dst, 'wb') as fout:
+            chunks = _read_chunks(fin, chunk_size)
+            first = next(chunks, b'')
+            if encoding is None:
+                encoding = "base64" if self._looks_like_base64(first) else "raw"
+            
+            def decoded():
+                nonlocal consumed
+                carry = b''
+                for data in chain([first], chunks):
+                    consumed += len(data)
+                    if encoding == "raw":
+                        yield data
+                        continue
+                    data = carry + data.translate(None, b' \t\r\n')
+                    cut = len(data) - len(data) % 4
+                    carry = data[cut:]
+                    yield base64.b64decode(data[:cut], validate=True)
+                if carry:
+                    raise ValueError("Truncated base64 input")
+            
+            engine = None
+            pending = b''
+            for data in decoded():
+                pending += data
+                if engine is None:
+                    # Any ciphertext has at least two blocks, enough to see a header.
+                    if len(pending) < HEADER_SIZE + block:
+                        continue
+                    codec = read_header(pending)
+                    if codec is not None:
+                        decompressor = Decompressor(codec)
+                        pending = pending[HEADER_SIZE:]
+                    engine = self._new_block_cipher(cipher, key, iv=pending[:block])
+                    pending = pending[block:]
+                # Keep at least one whole block back for unpadding.
+                cut = len(pending) - len(pending) % block
+                if cut == len(pending):
+                    cut -= block
+                if cut > 0:
+                    plain = engine.decrypt(pending[:cut])
+                    if decompressor:
+                        plain = decompressor.feed(plain)
+                    fout.write(plain)
+                    written += len(plain)
+                    pending = pending[cut:]
+                if progress:
+                    progress(consumed)
+            if engine is None or len(pending) != block:
+                raise ValueError("Ciphertext is truncated or not a multiple of the block size")
+            plain = unpad(engine.decrypt(pending), block)
+            if decompressor:
+                plain = decompressor.feed(plain) + decompressor.finish()
+            fout.write(plain)
+            written += len(plain)
+        return written
+    
+    def _looks_like_base64(self, data):
+        sample = data[:4096].translate(None, b' \t\r\n')
+        return bool(sample) and not sample.translate(
+            None, b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=')
@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from ciphers import CipherImplementations, cipher_names, get_cipher, worker_ciphers
+
+
+def _apply(direction, cipher, data, key, binary, compression=None):
+    ciphers = worker_ciphers()
+    ciphers.compression = compression
+    if binary:
+        func = ciphers.encrypt_bytes if direction == "encrypt" else ciphers.decrypt_bytes
+    else:
+        func = ciphers.encrypt if direction == "encrypt" else ciphers.decrypt
+    return func(cipher, data, key)
+
+
+def process_file_batch(batch):
+    """Run one batch of (src, dst, direction, cipher, key, binary, compression) jobs."""
+    results = []
+    for src, dst, direction, cipher, key, binary, compression in batch:
+        try:
+            if binary:
+                with open(src, 'rb') as f:
+                    data = f.read()
+                output = _apply(direction, cipher, data, key, True, compression)
+                with open(dst, 'wb') as f:
+                    f.write(output)
+                results.append({"source": src, "output": dst,
+                                "bytes_in": len(data), "bytes_out": len(output)})
+            else:
+                with open(src, 'r', encoding='utf-8') as f:
+                    data = f.read()
+                output = _apply(direction, cipher, data, key, False, compression)
+                with open(dst, 'w', encoding='utf-8') as f:
+                    f.write(output)
+                results.append({"source": src, "output": dst,
+                                "bytes_in": len(data.encode()), "bytes_out": len(output.encode())})
+        except Exception as e:
+            results.append({"source": src, "error": str(e), "bytes_in": 0, "bytes_out": 0})
+    return results
+
+
+def process_record_batch(batch):
+    """Run one batch of (record, direction, cipher, key, field, compression) JSON-lines jobs."""
+    results = []
+    for record, direction, cipher, key, field, compression in batch:
+        out = dict(record)
+        text = record.get(field)
+        try:
+            if not isinstance(text, str):
+                raise ValueError(f"record has no string field '{field}'")
+            record_cipher = record.get("cipher", cipher)
+            if ("cipher" in record or "key" in record) and get_cipher(record_cipher).key_is_path:
+                # The key would be a file path taken from the input data.
+                raise ValueError(f"records cannot choose the {record_cipher} cipher or its key")
+            result = _apply(direction, record_cipher, text, record.get("key", key), False, compression)
+            out["result"] = result
+            out["_bytes_in"] = len(text.encode())
+            out["_bytes_out"] = len(result.encode())
+        except Exception as e:
+            out["error"] = str(e)
+            out["_bytes_in"] = out["_bytes_out"] = 0
+        results.append(out)
+    return results
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_batches(func, items, workers, chunk_size, ordered=True):
+    """Yield func(batch) for each batch of items, in order unless ordered=False.
+
+    At most a few batches per worker are in flight at once, so arbitrarily
+    long inputs are processed in bounded memory.
+    """
+    batches = _batches(items, chunk_size)
+    if workers <= 1:
+        for batch in batches:
+            yield func(batch)
+        return
+
+    limit = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(func, batch))
+            if len(pending) < limit:
+                continue
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield future.result()
+        if ordered:
+            while pending:
+                yield pending.popleft().result()
+        else:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield future.result()
+
+
+def _output_path(src, output_dir, direction):
+    name = os.path.basename(src)
+    if direction == "encrypt":
+        name += ".enc"
+    elif name.endswith(".enc"):
+        name = name[:-4]
+    else:
+        name += ".dec"
+    return os.path.join(output_dir, name)
+
+
+def _read_records(paths):
+    for path in paths or ["-"]:
+        f = sys.stdin if path == "-" else open(path, 'r', encoding='utf-8')
+        try:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Encrypt or decrypt many files or JSON-lines records without the GUI.")
+    parser.add_argument("direction", choices=["encrypt", "decrypt"])
+    parser.add_argument("inputs", nargs="*", help="input files ('-' reads JSON lines from stdin)")
+    parser.add_argument("-c", "--cipher", required=True, choices=cipher_names())
+    key_group = parser.add_mutually_exclusive_group()
+    key_group.add_argument("-k", "--key", default="", help="cipher key")
+    key_group.add_argument("--key-file", help="read the key from this file")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="inputs are JSON lines; each record's text field is processed")
+    parser.add_argument("--field", default="text", help="record field holding the text (default: text)")
+    parser.add_argument("-o", "--output", help="output directory for files, or output file for --jsonl")
+    parser.add_argument("--binary", action="store_true", help="treat files as raw bytes")
+    parser.add_argument("--tree", action="store_true",
+                        help="the input is a folder, mirrored into --output through AES/DES3; "
+                             "reruns only process new or changed files")
+    parser.add_argument("--compress", choices=["zlib", "lzma", "bz2"],
+                        help="compress AES/DES3 plaintext before encrypting (decryption detects it)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (1 runs in-process)")
+    parser.add_argument("--chunk-size", type=int, default=16,
+                        help="files or records handed to a worker at a time")
+    parser.add_argument("--unordered", action="store_true",
+                        help="emit results as they complete instead of in input order")
+    parser.add_argument("-q", "--quiet", action="store_true", help="suppress the throughput summary")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_intermixed_args(argv)
+    if args.key_file:
+        with open(args.key_file, 'r', encoding='utf-8') as f:
+            args.key = f.read().strip()
+    if args.chunk_size < 1:
+        raise SystemExit("--chunk-size must be at least 1")
+
+    items = errors = bytes_in = bytes_out = 0
+    start = time.perf_counter()
+
+    if args.tree:
+        if len(args.inputs) != 1 or not args.output:
+            raise SystemExit("--tree needs one input folder and --output DIR")
+        from folders import TreeProcessor
+        ciphers = CipherImplementations(workers=args.workers)
+        ciphers.compression = args.compress
+        processor = TreeProcessor(ciphers, args.direction, args.cipher, args.key,
+                                  encoding="raw" if args.binary else "base64")
+        summary = processor.run(args.inputs[0], args.output)
+        items = summary["processed"]
+        bytes_in, bytes_out = summary["bytes_in"], summary["bytes_out"]
+        errors = len(summary["failed"])
+        for path, error in summary["failed"]:
+            print(f"{path}: {error}", file=sys.stderr)
+        if not args.quiet:
+            print(f"{summary['skipped']} unchanged file(s) skipped, "
+                  f"{summary['removed']} removed from the manifest", file=sys.stderr)
+    elif args.jsonl:
+        jobs = ((record, args.direction, args.cipher, args.key, args.field, args.compress)
+                for record in _read_records(args.inputs))
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        try:
+            for results in run_batches(process_record_batch, jobs, args.workers,
+                                       args.chunk_size, ordered=not args.unordered):
+                for record in results:
+                    items += 1
+                    errors += "error" in record
+                    bytes_in += record.pop("_bytes_in")
+                    bytes_out += record.pop("_bytes_out")
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    else:
+        if not args.inputs or not args.output:
+            raise SystemExit("file mode needs input files and --output DIR")
+        os.makedirs(args.output, exist_ok=True)
+        jobs = ((src, _output_path(src, args.output, args.direction), args.direction,
+                 args.cipher, args.key, args.binary, args.compress) for src in args.inputs)
+        for results in run_batches(process_file_batch, jobs, args.workers,
+                                   args.chunk_size, ordered=not args.unordered):
+            for result in results:
+                items += 1
+                bytes_in += result["bytes_in"]
+                bytes_out += result["bytes_out"]
+                if "error" in result:
+                    errors += 1
+                    print(f"{result['source']}: {result['error']}", file=sys.stderr)
+                elif not args.quiet:
+                    print(f"{result['source']} -> {result['output']}", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        rate = bytes_in / (1024 * 1024) / elapsed if elapsed > 0 else 0.0
+        print(f"{args.direction}ed {items} item(s) with {args.cipher}, {errors} error(s): "
+              f"{bytes_in} bytes in, {bytes_out} bytes out in {elapsed:.3f}s "
+              f"({rate:.2f} MB/s, {items / elapsed if elapsed > 0 else 0:.1f} items/s, "
+              f"{args.workers} worker(s))", file=sys.stderr)
+    return 1 if errors else 0
@@ -0,0 +1,127 @@
+import bz2
+import lzma
+import time
+import zlib
+from collections import namedtuple
+
+# Compressed ciphertext starts with MAGIC + one algorithm byte, in the
+# clear, ahead of the IV. The flag is never looked for in plaintext. Five
+# bytes is not a multiple of any block size, so a ciphertext's length
+# alone tells whether it carries the header.
+MAGIC = b"QCZ\x02"
+HEADER_SIZE = len(MAGIC) + 1
+
+Codec = namedtuple("Codec", "name code compressor decompressor")
+
+CODECS = {}
+_BY_CODE = {}
+
+
+def register_codec(name, code, compressor, decompressor):
+    """Add an algorithm; compressor() and decompressor() return zlib-style stream objects."""
+    codec = Codec(name, code, compressor, decompressor)
+    CODECS[name] = codec
+    _BY_CODE[code] = codec
+    return codec
+
+
+register_codec("zlib", 1, lambda: zlib.compressobj(6), zlib.decompressobj)
+register_codec("lzma", 2, lzma.LZMACompressor, lzma.LZMADecompressor)
+register_codec("bz2", 3, bz2.BZ2Compressor, bz2.BZ2Decompressor)
+
+
+def get_codec(name):
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unsupported compression: {name}") from None
+
+
+class CompressionStats(namedtuple("CompressionStats",
+                                  "algorithm original_size compressed_size compress_time cipher_time")):
+    """Outcome of one compress-then-encrypt operation."""
+
+    @property
+    def ratio(self):
+        return self.compressed_size / self.original_size if self.original_size else 1.0
+
+    @property
+    def time_saved(self):
+        # Estimated cipher time for the uncompressed input, at the rate the
+        # compressed one ran, minus what compressing and encrypting cost.
+        if not self.compressed_size:
+            return 0.0
+        uncompressed = self.cipher_time * self.original_size / self.compressed_size
+        return uncompressed - self.cipher_time - self.compress_time
+
+
+def header(codec):
+    return MAGIC + bytes([codec.code])
+
+
+def read_header(data):
+    """Return the Codec named by a header at the start of data, or None."""
+    if len(data) < HEADER_SIZE or bytes(data[:len(MAGIC)]) != MAGIC:
+        return None
+    return _BY_CODE.get(data[len(MAGIC)])
+
+
+class Compressor:
+    """Streaming compressor; the caller writes header(compressor.codec) where it belongs."""
+
+    def __init__(self, algorithm):
+        self.codec = get_codec(algorithm)
+        self._engine = self.codec.compressor()
+        self.original_size = 0
+        self.compressed_size = 0
+        self.elapsed = 0.0
+
+    def compress(self, data):
+        start = time.perf_counter()
+        out = self._engine.compress(data)
+        self.elapsed += time.perf_counter() - start
+        self.original_size += len(data)
+        self.compressed_size += len(out)
+        return out
+
+    def flush(self):
+        start = time.perf_counter()
+        out = self._engine.flush()
+        self.elapsed += time.perf_counter() - start
+        self.compressed_size += len(out)
+        return out
+
+
+class Decompressor:
+    """Streaming counterpart of Compressor for a codec read from a header."""
+
+    def __init__(self, codec):
+        self.codec = codec
+        self._engine = codec.decompressor()
+
+    def feed(self, data):
+        if self._engine.eof:
+            if data:
+                raise ValueError("Unexpected data after the compressed stream")
+            return b''
+        return self._engine.decompress(data)
+
+    def finish(self):
+        if not self._engine.eof:
+            raise ValueError("Compressed data is truncated")
+        if self._engine.unused_data:
+            raise ValueError("Unexpected data after the compressed stream")
+        return b''
+
+
+def compress(data, algorithm):
+    """Return (compressed data, Compressor) for a whole buffer."""
+    compressor = Compressor(algorithm)
+    out = compressor.compress(data) + compressor.flush()
+    return out, compressor
+
+
+def decompress(data, codec):
+    """Undo compress() for the codec named in the ciphertext header."""
+    decompressor = Decompressor(codec)
+    return decompressor.feed(bytes(data)) + decompressor.finish()
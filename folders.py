@@ -0,0 +1,244 @@
+import hashlib
+import hmac
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ciphers import cipher_names, get_cipher
+from utils import atomic_write
+
+MANIFEST_NAME = ".qrypto-manifest.json"
+MANIFEST_VERSION = 2
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path, key):
+    """HMAC-SHA256 of a file's contents under key."""
+    digest = hmac.new(key, digestmod=hashlib.sha256)
+    with open(path, 'rb') as f:
+        for data in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+class HashingReader:
+    """Binary file wrapper that computes an HMAC-SHA256 of everything read through it."""
+
+    def __init__(self, f, key):
+        self.f = f
+        self.size = 0
+        self._hash = hmac.new(key, digestmod=hashlib.sha256)
+
+    def read(self, size=-1):
+        data = self.f.read(size)
+        self._hash.update(data)
+        self.size += len(data)
+        return data
+
+    def fileno(self):
+        return self.f.fileno()
+
+    def tell(self):
+        return self.f.tell()
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+
+class Manifest:
+    """Record of the source files already processed into an output tree.
+
+    Stored as JSON in the output root. Each entry maps a source path
+    relative to the source root to its size, mtime and keyed content digest
+    and the output written for it. Entries only count for the settings
+    (cipher, direction, encoding and a keyed fingerprint) they were made with.
+    """
+
+    def __init__(self, path, settings):
+        self.path = path
+        self.settings = settings
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        if data.get("version") == MANIFEST_VERSION and data.get("settings") == settings:
+            self.entries = data.get("files", {})
+
+    def get(self, name):
+        return self.entries.get(name)
+
+    def update(self, name, entry):
+        self.entries[name] = entry
+        self.dirty = True
+
+    def remove(self, name):
+        if self.entries.pop(name, None) is not None:
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {"version": MANIFEST_VERSION, "settings": self.settings, "files": self.entries}
+        atomic_write(self.path, json.dumps(data, indent=1, sort_keys=True))
+        self.dirty = False
+
+
+def _is_manifest(filename):
+    # The manifest itself or a temporary copy left by utils.atomic_write.
+    return filename == MANIFEST_NAME or (filename.startswith(MANIFEST_NAME + ".") and filename.endswith(".tmp"))
+
+
+def output_name(name, direction):
+    if direction == "encrypt":
+        return name + ".enc"
+    return name[:-4] if name.endswith(".enc") else name + ".dec"
+
+
+def walk_files(root, exclude=None):
+    """Yield paths of regular files under root, relative to it, in sorted order."""
+    exclude = os.path.abspath(exclude) if exclude else None
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames
+                             if os.path.abspath(os.path.join(dirpath, d)) != exclude)
+        for filename in sorted(filenames):
+            if _is_manifest(filename):
+                continue
+            path = os.path.join(dirpath, filename)
+            if os.path.isfile(path):
+                yield os.path.relpath(path, root)
+
+
+class TreeProcessor:
+    """Encrypts or decrypts every file of a directory tree into a mirrored tree.
+
+    Files go through CipherImplementations.encrypt_stream/decrypt_stream
+    (AES, DES3 or OTP Pad) on a thread pool; pycryptodome and file I/O release the
+    GIL. A Manifest in the output root makes reruns incremental: a file is
+    skipped when its size and mtime are unchanged, or when they changed
+    but its content hash did not. Outputs are written to a .part file and
+    renamed into place, and the manifest is saved every few seconds and
+    when the run ends, so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, ciphers, direction, cipher, key, encoding="raw", workers=None,
+                 save_interval=2.0):
+        if direction not in ("encrypt", "decrypt"):
+            raise ValueError("direction must be 'encrypt' or 'decrypt'")
+        context = ciphers.prepare(cipher, key)
+        if not context.streamable:
+            supported = ", ".join(name for name in cipher_names() if get_cipher(name).streamable)
+            raise ValueError(f"{cipher} cannot stream files; use one of: {supported}")
+        self.ciphers = ciphers
+        self.direction = direction
+        self.cipher = cipher
+        self.key = key
+        self.encoding = encoding if direction == "encrypt" else None
+        self.workers = workers or ciphers.workers
+        self.save_interval = save_interval
+        # The manifest sits in the output tree, so its digests are keyed:
+        # without the key they confirm neither plaintexts nor passphrases.
+        self.digest_key = hmac.new(context.mac_key, b"qrypto-manifest", hashlib.sha256).digest()
+        fingerprint = hmac.new(self.digest_key, b"key", hashlib.sha256).hexdigest()[:16]
+        self.settings = {"cipher": cipher, "direction": direction, "encoding": self.encoding,
+                         "compression": ciphers.compression if direction == "encrypt" else None,
+                         "key": fingerprint}
+
+    def run(self, src_root, dst_root, progress=None):
+        """Process src_root into dst_root and return a summary dict.
+
+        progress, if given, is called as progress(done, total) after each
+        file; an exception it raises (e.g. TaskCancelled) stops the run
+        after saving the manifest.
+        """
+        if os.path.abspath(src_root) == os.path.abspath(dst_root):
+            raise ValueError("The output folder must differ from the source folder")
+        os.makedirs(dst_root, exist_ok=True)
+        manifest = Manifest(os.path.join(dst_root, MANIFEST_NAME), self.settings)
+        names = list(walk_files(src_root, exclude=dst_root))
+        summary = {"processed": 0, "skipped": 0, "failed": [], "removed": 0,
+                   "bytes_in": 0, "bytes_out": 0, "total": len(names)}
+        present = set(names)
+        for name in list(manifest.entries):
+            if name not in present:
+                manifest.remove(name)
+                summary["removed"] += 1
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="qrypto-tree")
+        pending = set()
+        done = 0
+        last_save = time.monotonic()
+        try:
+            queue = iter(names)
+            while True:
+                for name in queue:
+                    pending.add(pool.submit(self._process, src_root, dst_root, name, manifest.get(name)))
+                    if len(pending) >= self.workers * 4:
+                        break
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, status, entry, error = future.result()
+                    if status == "failed":
+                        summary["failed"].append((name, error))
+                    else:
+                        manifest.update(name, entry)
+                        summary[status] += 1
+                        if status == "processed":
+                            summary["bytes_in"] += entry["size"]
+                            summary["bytes_out"] += entry["output_size"]
+                    done += 1
+                if time.monotonic() - last_save >= self.save_interval:
+                    manifest.save()
+                    last_save = time.monotonic()
+                if progress:
+                    progress(done, len(names))
+        finally:
+            # Queued files are dropped; the ones already running finish so
+            # nothing is left writing into the tree after we return.
+            pool.shutdown(wait=True, cancel_futures=True)
+            manifest.save()
+        return summary
+
+    def _process(self, src_root, dst_root, name, entry):
+        src = os.path.join(src_root, name)
+        output = output_name(name, self.direction)
+        dst = os.path.join(dst_root, output)
+        try:
+            stat = os.stat(src)
+            if entry is not None and os.path.exists(dst):
+                if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                    return name, "skipped", entry, None
+                if entry["size"] == stat.st_size and file_digest(src, self.digest_key) == entry["hmac"]:
+                    return name, "skipped", dict(entry, mtime_ns=stat.st_mtime_ns), None
+
+            os.makedirs(os.path.dirname(dst) or dst_root, exist_ok=True)
+            part = dst + ".part"
+            try:
+                with open(src, 'rb') as f:
+                    reader = HashingReader(f, self.digest_key)
+                    if self.direction == "encrypt":
+                        written = self.ciphers.encrypt_stream(self.cipher, reader, part, self.key,
+                                                              encoding=self.encoding)
+                    else:
+                        written = self.ciphers.decrypt_stream(self.cipher, reader, part, self.key)
+                os.replace(part, dst)
+            except BaseException:
+                if os.path.exists(part):
+                    os.remove(part)
+                raise
+            return name, "processed", {
+                "size": reader.size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hmac": reader.hexdigest(),
+                "output": output,
+                "output_size": written,
+            }, None
+        except Exception as e:
+            return name, "failed", None, str(e)
@@ -1,709 +1,1088 @@
-from random import randint
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import os
-import json
-from datetime import datetime
-from PIL import Image, ImageTk, ImageDraw
-import webbrowser
-import base64
-from ciphers import CipherImplementations
-
-class QryptoCore:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("QryptoCore")
-        self.root.geometry("1100x800")
-        self.root.minsize(1000, 700)
-        
-        # Initialize text widgets as None first
-        self.input_text = None
-        self.decrypt_text = None
-        self.history_listbox = None
-        
-        # Create assets directory if it doesn't exist
-        self.assets_path = os.path.join(os.path.dirname(__file__), "assets")
-        os.makedirs(self.assets_path, exist_ok=True)
-        
-        # App variables
-        self.theme = tk.StringVar(value="dark")
-        self.font_size = tk.IntVar(value=11)
-        self.cipher_history = []
-        self.settings_file = os.path.join(self.assets_path, "settings.json")
-        
-        # Cipher implementations
-        self.ciphers = CipherImplementations()
-        
-        # Initialize UI
-        self.create_fallback_icons()
-        self.setup_fonts()
-        self.load_settings()
-        self.setup_menu()
-        self.setup_main_ui()
-        
-        # Show splash screen
-        self.show_splash()
-    
-    def create_fallback_icons(self):
-        """Create simple fallback icons if real images aren't found"""
-        # App icon
-        img = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        draw.ellipse((0, 0, 31, 31), fill='#00b4ff', outline='white')
-        draw.text((8, 6), "Q", fill='white')
-        self.app_icon = ImageTk.PhotoImage(img)
-        
-        # Tab icons
-        def create_icon(text, color):
-            img = Image.new('RGBA', (16, 16), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            draw.rectangle((0, 0, 15, 15), fill=color)
-            draw.text((4, 2), text, fill='white')
-            return ImageTk.PhotoImage(img)
-        
-        self.encrypt_icon = create_icon("E", "#4CAF50")
-        self.decrypt_icon = create_icon("D", "#F44336")
-        self.settings_icon = create_icon("S", "#2196F3")
-        self.history_icon = create_icon("H", "#9C27B0")
-    
-    def setup_fonts(self):
-        self.title_font = ("Segoe UI", 18, "bold")
-        self.subtitle_font = ("Segoe UI", 10)
-        self.mono_font = ("Consolas", self.font_size.get())
-        self.button_font = ("Segoe UI", 10, "bold")
-    
-    def load_settings(self):
-        if os.path.exists(self.settings_file):
-            try:
-                with open(self.settings_file, 'r') as f:
-                    settings = json.load(f)
-                self.theme.set(settings.get("theme", "dark"))
-                self.font_size.set(settings.get("font_size", 11))
-            except:
-                pass
-    
-    def save_settings(self):
-        settings = {
-            "theme": self.theme.get(),
-            "font_size": self.font_size.get()
-        }
-        with open(self.settings_file, 'w') as f:
-            json.dump(settings, f)
-    
-    def setup_menu(self):
-        menubar = tk.Menu(self.root)
-        
-        # File menu
-        file_menu = tk.Menu(menubar, tearoff=0)
-        file_menu.add_command(label="New", accelerator="Ctrl+N", command=self.new_file)
-        file_menu.add_command(label="Open...", accelerator="Ctrl+O", command=self.browse_file)
-        file_menu.add_separator()
-        file_menu.add_command(label="Save As...", accelerator="Ctrl+S", command=self.save_file)
-        file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.on_exit)
-        menubar.add_cascade(label="File", menu=file_menu)
-        
-        # Edit menu
-        edit_menu = tk.Menu(menubar, tearoff=0)
-        edit_menu.add_command(label="Cut", accelerator="Ctrl+X")
-        edit_menu.add_command(label="Copy", accelerator="Ctrl+C")
-        edit_menu.add_command(label="Paste", accelerator="Ctrl+V")
-        menubar.add_cascade(label="Edit", menu=edit_menu)
-        
-        # View menu
-        view_menu = tk.Menu(menubar, tearoff=0)
-        view_menu.add_radiobutton(label="Dark Theme", variable=self.theme, value="dark", command=self.change_theme)
-        view_menu.add_radiobutton(label="Light Theme", variable=self.theme, value="light", command=self.change_theme)
-        view_menu.add_radiobutton(label="Tech Theme", variable=self.theme, value="tech", command=self.change_theme)
-        view_menu.add_separator()
-        view_menu.add_command(label="Increase Font Size", command=self.increase_font)
-        view_menu.add_command(label="Decrease Font Size", command=self.decrease_font)
-        menubar.add_cascade(label="View", menu=view_menu)
-        
-        # Help menu
-        help_menu = tk.Menu(menubar, tearoff=0)
-        help_menu.add_command(label="Documentation", command=self.open_docs)
-        help_menu.add_command(label="User Manual", command=self.open_user_manual)
-        help_menu.add_command(label="About", command=self.show_about)
-        menubar.add_cascade(label="Help", menu=help_menu)
-        
-        self.root.config(menu=menubar)
-    
-    def configure_styles(self):
-        style = ttk.Style()
-        
-        if self.theme.get() == "dark":
-            # Tech Dark Theme (Electric Blue + Deep Gray)
-            self.colors = {
-                "bg": "#121212",
-                "fg": "#e0e0e0",
-                "accent": "#00b4ff",
-                "secondary": "#1e1e1e",
-                "text_bg": "#1e1e1e",
-                "text_fg": "#ffffff",
-                "entry_bg": "#2d2d2d",
-                "entry_fg": "#ffffff",
-                "button_bg": "#00b4ff",
-                "button_fg": "#ffffff",
-                "tab_bg": "#1e1e1e",
-                "tab_fg": "#e0e0e0",
-                "select_bg": "#00b4ff",
-                "select_fg": "#ffffff",
-                "success": "#4CAF50",
-                "error": "#F44336",
-                "warning": "#FFC107"
-            }
-        elif self.theme.get() == "tech":
-            # High-Tech Theme (Neon Green + Dark Gray)
-            self.colors = {
-                "bg": "#0a0a0a",
-                "fg": "#00ff9d",
-                "accent": "#00ff9d",
-                "secondary": "#1a1a1a",
-                "text_bg": "#1a1a1a",
-                "text_fg": "#00ff9d",
-                "entry_bg": "#252525",
-                "entry_fg": "#00ff9d",
-                "button_bg": "#006644",
-                "button_fg": "#00ff9d",
-                "tab_bg": "#1a1a1a",
-                "tab_fg": "#00ff9d",
-                "select_bg": "#006644",
-                "select_fg": "#00ff9d",
-                "success": "#00ff9d",
-                "error": "#ff0033",
-                "warning": "#ffcc00"
-            }
-        else:  # light
-            # Light Tech Theme (Electric Blue + Light Gray)
-            self.colors = {
-                "bg": "#f5f5f5",
-                "fg": "#333333",
-                "accent": "#0078d7",
-                "secondary": "#ffffff",
-                "text_bg": "#ffffff",
-                "text_fg": "#333333",
-                "entry_bg": "#ffffff",
-                "entry_fg": "#333333",
-                "button_bg": "#0078d7",
-                "button_fg": "#ffffff",
-                "tab_bg": "#ffffff",
-                "tab_fg": "#333333",
-                "select_bg": "#0078d7",
-                "select_fg": "#ffffff",
-                "success": "#4CAF50",
-                "error": "#F44336",
-                "warning": "#FFC107"
-            }
-        
-        # Configure styles
-        style.theme_create("qrypto", settings={
-            ".": {
-                "configure": {
-                    "background": self.colors["bg"],
-                    "foreground": self.colors["fg"],
-                    "font": self.mono_font
-                }
-            },
-            "TFrame": {
-                "configure": {"background": self.colors["bg"]}
-            },
-            "TLabel": {
-                "configure": {
-                    "background": self.colors["bg"],
-                    "foreground": self.colors["fg"]
-                }
-            },
-            "TNotebook": {
-                "configure": {
-                    "background": self.colors["tab_bg"],
-                    "tabmargins": [2, 5, 2, 0]
-                }
-            },
-            "TNotebook.Tab": {
-                "configure": {
-                    "background": self.colors["tab_bg"],
-                    "foreground": self.colors["tab_fg"],
-                    "padding": [10, 5],
-                    "font": self.button_font
-                },
-                "map": {
-                    "background": [("selected", self.colors["secondary"])],
-                    "expand": [("selected", [1, 1, 1, 0])]
-                }
-            },
-            "TEntry": {
-                "configure": {
-                    "fieldbackground": self.colors["entry_bg"],
-                    "foreground": self.colors["entry_fg"],
-                    "insertcolor": self.colors["accent"],
-                    "padding": 5,
-                    "relief": "flat"
-                }
-            },
-            "TCombobox": {
-                "configure": {
-                    "fieldbackground": self.colors["entry_bg"],
-                    "foreground": self.colors["entry_fg"],
-                    "selectbackground": self.colors["select_bg"],
-                    "selectforeground": self.colors["select_fg"]
-                }
-            },
-            "TButton": {
-                "configure": {
-                    "background": self.colors["button_bg"],
-                    "foreground": self.colors["button_fg"],
-                    "font": self.button_font,
-                    "padding": 8,
-                    "relief": "flat"
-                },
-                "map": {
-                    "background": [("active", self.colors["accent"])],
-                    "foreground": [("active", self.colors["button_fg"])]
-                }
-            },
-            "Accent.TButton": {
-                "configure": {
-                    "background": self.colors["accent"],
-                    "foreground": self.colors["button_fg"],
-                    "font": self.button_font,
-                    "padding": 10
-                }
-            },
-            "Success.TButton": {
-                "configure": {
-                    "background": self.colors["success"],
-                    "foreground": "#ffffff",
-                    "font": self.button_font
-                }
-            },
-            "Warning.TButton": {
-                "configure": {
-                    "background": self.colors["warning"],
-                    "foreground": "#000000",
-                    "font": self.button_font
-                }
-            },
-            "Error.TButton": {
-                "configure": {
-                    "background": self.colors["error"],
-                    "foreground": "#ffffff",
-                    "font": self.button_font
-                }
-            },
-            "TLabelframe": {
-                "configure": {
-                    "background": self.colors["bg"],
-                    "foreground": self.colors["accent"],
-                    "relief": "groove",
-                    "borderwidth": 1
-                }
-            },
-            "TLabelframe.Label": {
-                "configure": {
-                    "background": self.colors["bg"],
-                    "foreground": self.colors["accent"],
-                    "font": self.button_font
-                }
-            },
-            "Horizontal.TProgressbar": {
-                "configure": {
-                    "background": self.colors["accent"],
-                    "troughcolor": self.colors["secondary"],
-                    "thickness": 20
-                }
-            }
-        })
-        style.theme_use("qrypto")
-        
-        # Configure root window
-        self.root.config(bg=self.colors["bg"])
-    
-    def setup_main_ui(self):
-        self.configure_styles()
-        
-        # Main container
-        self.main_frame = ttk.Frame(self.root)
-        self.main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Header with logo and title
-        header_frame = ttk.Frame(self.main_frame)
-        header_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        # Logo and title
-        logo_frame = ttk.Frame(header_frame)
-        logo_frame.pack(side=tk.LEFT, padx=10)
-        
-        ttk.Label(logo_frame, image=self.app_icon).pack(side=tk.LEFT)
-        ttk.Label(logo_frame, text="QryptoCore", font=self.title_font, 
-                 foreground=self.colors["accent"]).pack(side=tk.LEFT, padx=5)
-        
-        # Tagline
-        ttk.Label(header_frame, text="Classical to Quantum—One Tool to Lock Them All", 
-                 font=self.subtitle_font).pack(side=tk.LEFT, padx=10, expand=True)
-        
-        # Theme switcher
-        theme_frame = ttk.Frame(header_frame)
-        theme_frame.pack(side=tk.RIGHT, padx=10)
-        
-        ttk.Label(theme_frame, text="Theme:").pack(side=tk.LEFT)
-        self.theme_selector = ttk.Combobox(
-            theme_frame, 
-            textvariable=self.theme, 
-            values=["dark", "light", "tech"],
-            state="readonly",
-            width=8
-        )
-        self.theme_selector.pack(side=tk.LEFT, padx=5)
-        self.theme_selector.bind("<<ComboboxSelected>>", lambda e: self.change_theme())
-        
-        # Notebook for tabs
-        self.notebook = ttk.Notebook(self.main_frame)
-        self.notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Setup tabs
-        self.setup_encryption_tab()
-        self.setup_decryption_tab()
-        self.setup_settings_tab()
-        self.setup_history_tab()
-        
-        # Status bar
-        self.status_bar = ttk.Label(
-            self.root, 
-            text="Ready", 
-            relief=tk.SUNKEN, 
-            anchor=tk.W,
-            font=("Segoe UI", 9),
-            foreground=self.colors["fg"],
-            background=self.colors["secondary"]
-        )
-        self.status_bar.pack(fill=tk.X)
-        
-        # Initialize text widget colors after all widgets are created
-        self.update_text_widget_colors()
-    
-    def setup_encryption_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Encrypt", image=self.encrypt_icon, compound=tk.LEFT)
-        
-        # Input section
-        input_frame = ttk.LabelFrame(tab, text="Input Text", padding=10)
-        input_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        self.input_text = tk.Text(input_frame, wrap=tk.WORD, font=self.mono_font)
-        self.input_text.pack(fill=tk.BOTH, expand=True)
-        
-        # Cipher selection
-        cipher_frame = ttk.Frame(tab)
-        cipher_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(cipher_frame, text="Cipher:").pack(side=tk.LEFT)
-        
-        self.cipher_var = tk.StringVar()
-        cipher_combo = ttk.Combobox(cipher_frame, textvariable=self.cipher_var,
-                                   values=["AES", "Caesar", "Vigenère", "OTP", "Atbash", "Rail Fence", "DES3"])
-        cipher_combo.pack(side=tk.LEFT, padx=5)
-        cipher_combo.current(0)
-        
-        ttk.Label(cipher_frame, text="Key:").pack(side=tk.LEFT, padx=(10, 0))
-        self.key_entry = ttk.Entry(cipher_frame)
-        self.key_entry.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
-        
-        # Action buttons
-        button_frame = ttk.Frame(tab)
-        button_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Button(button_frame, text="Generate Key", command=self.generate_key).pack(side=tk.LEFT, padx=2)
-        ttk.Button(button_frame, text="Encrypt", command=self.encrypt, style="Accent.TButton").pack(side=tk.RIGHT, padx=2)
-        ttk.Button(button_frame, text="Clear", command=self.clear_input).pack(side=tk.RIGHT, padx=2)
-    
-    def setup_decryption_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Decrypt", image=self.decrypt_icon, compound=tk.LEFT)
-        
-        # File selection
-        file_frame = ttk.LabelFrame(tab, text="Input", padding=10)
-        file_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        self.decrypt_text = tk.Text(file_frame, wrap=tk.WORD, font=self.mono_font)
-        self.decrypt_text.pack(fill=tk.BOTH, expand=True)
-        
-        # Cipher selection
-        cipher_frame = ttk.Frame(tab)
-        cipher_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(cipher_frame, text="Cipher:").pack(side=tk.LEFT)
-        
-        self.decrypt_cipher_var = tk.StringVar()
-        cipher_combo = ttk.Combobox(cipher_frame, textvariable=self.decrypt_cipher_var,
-                                   values=["AES", "Caesar", "Vigenère", "OTP", "Atbash", "Rail Fence", "DES3"])
-        cipher_combo.pack(side=tk.LEFT, padx=5)
-        
-        ttk.Label(cipher_frame, text="Key:").pack(side=tk.LEFT, padx=(10, 0))
-        self.decrypt_key_entry = ttk.Entry(cipher_frame)
-        self.decrypt_key_entry.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
-        
-        # Action buttons
-        button_frame = ttk.Frame(tab)
-        button_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Button(button_frame, text="Browse File", command=self.browse_file).pack(side=tk.LEFT, padx=2)
-        ttk.Button(button_frame, text="Decrypt", command=self.decrypt, style="Accent.TButton").pack(side=tk.RIGHT, padx=2)
-        ttk.Button(button_frame, text="Clear", command=self.clear_decrypt).pack(side=tk.RIGHT, padx=2)
-    
-    def setup_settings_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Settings", image=self.settings_icon, compound=tk.LEFT)
-        
-        # Theme settings
-        theme_frame = ttk.LabelFrame(tab, text="Appearance", padding=10)
-        theme_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(theme_frame, text="Theme:").grid(row=0, column=0, sticky=tk.W)
-        ttk.Radiobutton(theme_frame, text="Dark", variable=self.theme, value="dark",
-                       command=self.change_theme).grid(row=0, column=1, sticky=tk.W)
-        ttk.Radiobutton(theme_frame, text="Light", variable=self.theme, value="light",
-                       command=self.change_theme).grid(row=0, column=2, sticky=tk.W)
-        ttk.Radiobutton(theme_frame, text="Tech", variable=self.theme, value="tech",
-                       command=self.change_theme).grid(row=0, column=3, sticky=tk.W)
-        
-        # Font settings
-        font_frame = ttk.LabelFrame(tab, text="Font", padding=10)
-        font_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(font_frame, text="Font Size:").grid(row=0, column=0, sticky=tk.W)
-        ttk.Scale(font_frame, from_=8, to=18, variable=self.font_size,
-                 command=lambda e: self.change_font_size()).grid(row=0, column=1, sticky=tk.EW)
-        
-        # Reset button
-        ttk.Button(tab, text="Reset to Defaults", command=self.reset_settings).pack(pady=10)
-    
-    def setup_history_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="History", image=self.history_icon, compound=tk.LEFT)
-        
-        # History list
-        self.history_listbox = tk.Listbox(tab, font=self.mono_font)
-        self.history_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Action buttons
-        button_frame = ttk.Frame(tab)
-        button_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Button(button_frame, text="Clear History", command=self.clear_history).pack(side=tk.LEFT)
-        ttk.Button(button_frame, text="Copy Selected", command=self.copy_history_item).pack(side=tk.RIGHT)
-    
-    def update_text_widget_colors(self):
-        if hasattr(self, 'input_text') and self.input_text:
-            self.input_text.config(
-                bg=self.colors["text_bg"],
-                fg=self.colors["text_fg"],
-                insertbackground=self.colors["accent"],
-                selectbackground=self.colors["select_bg"],
-                selectforeground=self.colors["select_fg"]
-            )
-        
-        if hasattr(self, 'decrypt_text') and self.decrypt_text:
-            self.decrypt_text.config(
-                bg=self.colors["text_bg"],
-                fg=self.colors["text_fg"],
-                insertbackground=self.colors["accent"],
-                selectbackground=self.colors["select_bg"],
-                selectforeground=self.colors["select_fg"]
-            )
-        
-        if hasattr(self, 'history_listbox') and self.history_listbox:
-            self.history_listbox.config(
-                bg=self.colors["text_bg"],
-                fg=self.colors["text_fg"],
-                selectbackground=self.colors["select_bg"],
-                selectforeground=self.colors["select_fg"]
-            )
-    
-    def show_splash(self):
-        splash = tk.Toplevel(self.root)
-        splash.geometry("400x300")
-        splash.overrideredirect(True)
-        
-        # Center splash screen
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
-        x = (screen_width // 2) - (400 // 2)
-        y = (screen_height // 2) - (300 // 2)
-        splash.geometry(f"+{x}+{y}")
-        
-        # Splash content
-        splash.config(bg="#121212")
-        ttk.Label(splash, text="QryptoCore", font=("Segoe UI", 24, "bold"), 
-                 foreground="#00b4ff", background="#121212").pack(pady=50)
-        ttk.Label(splash, text="Loading...", font=("Segoe UI", 12), 
-                 foreground="#e0e0e0", background="#121212").pack()
-        
-        # Close splash after delay
-        self.root.after(1500, splash.destroy)
-        self.root.after(1500, self.root.deiconify)
-    
-    def change_theme(self):
-        self.configure_styles()
-        self.update_text_widget_colors()
-        self.save_settings()
-    
-    def change_font_size(self):
-        self.setup_fonts()
-        self.configure_styles()
-        self.save_settings()
-    
-    def increase_font(self):
-        if self.font_size.get() < 18:
-            self.font_size.set(self.font_size.get() + 1)
-            self.change_font_size()
-    
-    def decrease_font(self):
-        if self.font_size.get() > 8:
-            self.font_size.set(self.font_size.get() - 1)
-            self.change_font_size()
-    
-    def reset_settings(self):
-        self.theme.set("dark")
-        self.font_size.set(11)
-        self.change_theme()
-        self.change_font_size()
-        messagebox.showinfo("Settings Reset", "All settings have been reset to defaults.")
-    
-    def browse_file(self):
-        file_path = filedialog.askopenfilename()
-        if file_path:
-            try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                self.decrypt_text.delete("1.0", tk.END)
-                self.decrypt_text.insert(tk.END, content)
-                self.status_bar.config(text=f"Loaded: {os.path.basename(file_path)}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to read file: {e}")
-    
-    def save_file(self):
-        content = self.decrypt_text.get("1.0", tk.END)
-        if not content.strip():
-            messagebox.showwarning("Warning", "No content to save.")
-            return
-        
-        file_path = filedialog.asksaveasfilename(defaultextension=".txt")
-        if file_path:
-            try:
-                with open(file_path, 'w') as f:
-                    f.write(content)
-                self.status_bar.config(text=f"Saved: {os.path.basename(file_path)}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save file: {e}")
-    
-    def new_file(self):
-        self.input_text.delete("1.0", tk.END)
-        self.decrypt_text.delete("1.0", tk.END)
-        self.key_entry.delete(0, tk.END)
-        self.decrypt_key_entry.delete(0, tk.END)
-        self.status_bar.config(text="New file created")
-    
-    def clear_input(self):
-        self.input_text.delete("1.0", tk.END)
-        self.key_entry.delete(0, tk.END)
-    
-    def clear_decrypt(self):
-        self.decrypt_text.delete("1.0", tk.END)
-        self.decrypt_key_entry.delete(0, tk.END)
-    
-    def clear_history(self):
-        self.history_listbox.delete(0, tk.END)
-        self.cipher_history = []
-    
-    def copy_history_item(self):
-        selection = self.history_listbox.curselection()
-        if selection:
-            item = self.history_listbox.get(selection[0])
-            self.root.clipboard_clear()
-            self.root.clipboard_append(item)
-            self.status_bar.config(text="Copied to clipboard")
-    
-    def on_exit(self):
-        self.save_settings()
-        self.root.quit()
-    
-    def generate_key(self):
-        cipher = self.cipher_var.get()
-        if cipher == "AES":
-            key = base64.b64encode(os.urandom(32)).decode()
-        elif cipher == "DES3":
-            key = base64.b64encode(os.urandom(24)).decode()
-        elif cipher == "Caesar":
-            key = str(randint(1, 25))
-        elif cipher in ["Vigenère", "OTP"]:
-            key = ''.join(chr(randint(97, 122)) for _ in range(16))
-        else:  # Atbash, Rail Fence
-            key = ""
-        
-        self.key_entry.delete(0, tk.END)
-        self.key_entry.insert(0, key)
-    
-    def encrypt(self):
-        cipher = self.cipher_var.get()
-        plaintext = self.input_text.get("1.0", tk.END).strip()
-        key = self.key_entry.get().strip()
-        
-        if not plaintext:
-            messagebox.showwarning("Warning", "Please enter text to encrypt.")
-            return
-        
-        try:
-            ciphertext = self.ciphers.encrypt(cipher, plaintext, key)
-            
-            self.decrypt_text.delete("1.0", tk.END)
-            self.decrypt_text.insert(tk.END, ciphertext)
-            
-            # Add to history
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cipher_history.append(f"[{timestamp}] Encrypted with {cipher}")
-            self.history_listbox.insert(tk.END, self.cipher_history[-1])
-            
-            self.status_bar.config(text=f"Encrypted with {cipher}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Encryption failed: {e}")
-    
-    def decrypt(self):
-        cipher = self.decrypt_cipher_var.get()
-        ciphertext = self.decrypt_text.get("1.0", tk.END).strip()
-        key = self.decrypt_key_entry.get().strip()
-        
-        if not ciphertext:
-            messagebox.showwarning("Warning", "Please enter text to decrypt.")
-            return
-        
-        try:
-            plaintext = self.ciphers.decrypt(cipher, ciphertext, key)
-            
-            self.decrypt_text.delete("1.0", tk.END)
-            self.decrypt_text.insert(tk.END, plaintext)
-            
-            # Add to history
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cipher_history.append(f"[{timestamp}] Decrypted with {cipher}")
-            self.history_listbox.insert(tk.END, self.cipher_history[-1])
-            
-            self.status_bar.config(text=f"Decrypted with {cipher}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Decryption failed: {e}")
-    
-    def show_about(self):
-        about_text = """QryptoCore - Encryption/Decryption Tool
-Version 1.1.5
-
-A comprehensive tool for classical encryption algorithms.
-Supports AES, Caesar, Vigenère, OTP, Atbash, Rail Fence, and DES3.
-
-© 2025 QryptoCore Team"""
-        messagebox.showinfo("About QryptoCore", about_text)
-
-    def open_user_manual(self):
-        webbrowser.open("user_manual.html")
-
-    def open_docs(self):
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, simpledialog
+import json
+import os
+import time
+from datetime import datetime
+import utils
+from ciphers import CipherImplementations, cipher_names, get_cipher
+from history import HashingWriter, HistoryStore, output_digest
+from metrics import Instrumentation
+from preview import LivePreview
+from tasks import TaskRunner
+from textview import DocumentView
+from themes import ThemeCache
+
+# (attribute, size, shape, letter, color) for the generated icons
+ICON_SPECS = [
+    ("app_icon", 32, "ellipse", "Q", "#00b4ff"),
+    ("encrypt_icon", 16, "rectangle", "E", "#4CAF50"),
+    ("decrypt_icon", 16, "rectangle", "D", "#F44336"),
+    ("settings_icon", 16, "rectangle", "S", "#2196F3"),
+    ("history_icon", 16, "rectangle", "H", "#9C27B0"),
+]
+
+class QryptoCore:
+    HISTORY_PAGE_SIZE = 200
+    
+    def __init__(self, root, profiler=None):
+        self.root = root
+        self.profiler = profiler
+        self.root.title("QryptoCore")
+        self.root.geometry("1100x800")
+        self.root.minsize(1000, 700)
+        
+        # Initialize text widgets as None first
+        self.input_text = None
+        self.decrypt_text = None
+        self.preview_text = None
+        self.history_listbox = None
+        
+        # Create assets directory if it doesn't exist
+        self.assets_path = os.path.join(os.path.dirname(__file__), "assets")
+        os.makedirs(self.assets_path, exist_ok=True)
+        
+        # Show splash screen while the rest of the UI is built
+        self.show_splash()
+        
+        # App variables
+        self.theme = tk.StringVar(value="dark")
+        self.font_size = tk.IntVar(value=11)
+        self.compression = tk.StringVar(value="None")
+        self.live_preview = tk.BooleanVar(value=False)
+        self.themes = ThemeCache(ttk.Style(self.root), os.path.join(self.assets_path, "themes"))
+        self.history = HistoryStore(os.path.join(self.assets_path, "history.db"))
+        self.history_page = []
+        self.pipeline_definition = None
+        self.settings = utils.SettingsManager(os.path.join(self.assets_path, "settings.json"))
+        
+        # Cipher implementations
+        self.ciphers = CipherImplementations()
+        self.ciphers.instrumentation = Instrumentation()
+        
+        # Background worker so cipher calls never block the mainloop
+        self.tasks = TaskRunner(self.root, on_update=self.update_task_status)
+        
+        # Initialize UI
+        self.create_fallback_icons()
+        self.mark_startup("icons")
+        self.setup_fonts()
+        self.load_settings()
+        self.setup_menu()
+        self.setup_main_ui()
+        self.mark_startup("widgets")
+        
+        # Close the splash as soon as Tk has drawn the finished UI
+        self.root.after_idle(self.finish_startup)
+    
+    def mark_startup(self, label):
+        if self.profiler:
+            self.profiler.mark(label)
+    
+    def create_fallback_icons(self):
+        """Load the generated icons, drawing them with PIL only on the first run"""
+        icon_dir = os.path.join(self.assets_path, "icons")
+        for attr, size, shape, letter, color in ICON_SPECS:
+            path = os.path.join(icon_dir, f"{attr}.png")
+            if not os.path.exists(path):
+                self.render_icon(path, size, shape, letter, color)
+            if os.path.exists(path):
+                icon = tk.PhotoImage(file=path)
+            else:
+                # No PIL available: a plain colored square still works
+                icon = tk.PhotoImage(width=size, height=size)
+                icon.put(color, to=(0, 0, size, size))
+            setattr(self, attr, icon)
+    
+    def render_icon(self, path, size, shape, letter, color):
+        try:
+            from PIL import Image, ImageDraw
+        except ImportError:
+            return
+        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        if shape == "ellipse":
+            draw.ellipse((0, 0, size - 1, size - 1), fill=color, outline='white')
+        else:
+            draw.rectangle((0, 0, size - 1, size - 1), fill=color)
+        offset = (8, 6) if size == 32 else (4, 2)
+        draw.text(offset, letter, fill='white')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        img.save(path)
+    
+    def setup_fonts(self):
+        self.title_font = ("Segoe UI", 18, "bold")
+        self.subtitle_font = ("Segoe UI", 10)
+        self.mono_font = ("Consolas", self.font_size.get())
+        self.button_font = ("Segoe UI", 10, "bold")
+    
+    def load_settings(self):
+        self.theme.set(self.settings.get("theme", "dark"))
+        self.font_size.set(self.settings.get("font_size", 11))
+        self.compression.set(self.settings.get("compression", "None"))
+        self.apply_compression()
+    
+    def save_settings(self):
+        # Debounced: the file is written once the changes settle
+        self.settings.update(
+            theme=self.theme.get(),
+            font_size=self.font_size.get(),
+            compression=self.compression.get()
+        )
+    
+    def setup_menu(self):
+        menubar = tk.Menu(self.root)
+        
+        # File menu
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="New", accelerator="Ctrl+N", command=self.new_file)
+        file_menu.add_command(label="Open...", accelerator="Ctrl+O", command=self.browse_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="Save As...", accelerator="Ctrl+S", command=self.save_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="Encrypt File...", command=self.encrypt_file)
+        file_menu.add_command(label="Decrypt File...", command=self.decrypt_file)
+        file_menu.add_command(label="Encrypt Folder...", command=self.encrypt_folder)
+        file_menu.add_command(label="Decrypt Folder...", command=self.decrypt_folder)
+        file_menu.add_separator()
+        file_menu.add_command(label="Generate Keys...", command=self.export_keys)
+        file_menu.add_command(label="Cipher Pipeline...", command=self.show_pipeline_dialog)
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=self.on_exit)
+        menubar.add_cascade(label="File", menu=file_menu)
+        
+        # Edit menu
+        edit_menu = tk.Menu(menubar, tearoff=0)
+        edit_menu.add_command(label="Cut", accelerator="Ctrl+X")
+        edit_menu.add_command(label="Copy", accelerator="Ctrl+C")
+        edit_menu.add_command(label="Paste", accelerator="Ctrl+V")
+        menubar.add_cascade(label="Edit", menu=edit_menu)
+        
+        # View menu
+        view_menu = tk.Menu(menubar, tearoff=0)
+        view_menu.add_radiobutton(label="Dark Theme", variable=self.theme, value="dark", command=self.change_theme)
+        view_menu.add_radiobutton(label="Light Theme", variable=self.theme, value="light", command=self.change_theme)
+        view_menu.add_radiobutton(label="Tech Theme", variable=self.theme, value="tech", command=self.change_theme)
+        for name in self.themes.custom_names():
+            view_menu.add_radiobutton(label=f"{name} Theme", variable=self.theme, value=name, command=self.change_theme)
+        view_menu.add_separator()
+        view_menu.add_command(label="Increase Font Size", command=self.increase_font)
+        view_menu.add_command(label="Decrease Font Size", command=self.decrease_font)
+        menubar.add_cascade(label="View", menu=view_menu)
+        
+        # Help menu
+        help_menu = tk.Menu(menubar, tearoff=0)
+        help_menu.add_command(label="Documentation", command=self.open_docs)
+        help_menu.add_command(label="User Manual", command=self.open_user_manual)
+        help_menu.add_command(label="About", command=self.show_about)
+        menubar.add_cascade(label="Help", menu=help_menu)
+        
+        self.root.config(menu=menubar)
+    
+    def configure_styles(self):
+        # Each palette/font combination is built once; later switches only
+        # select the cached ttk theme
+        try:
+            self.colors = self.themes.use(self.theme.get(), self.mono_font, self.button_font)
+        except (OSError, ValueError) as e:
+            messagebox.showwarning("Theme", f"Could not load theme {self.theme.get()}: {e}")
+            self.theme.set("dark")
+            self.colors = self.themes.use("dark", self.mono_font, self.button_font)
+        
+        # Configure root window
+        self.root.config(bg=self.colors["bg"])
+    
+    def setup_main_ui(self):
+        self.configure_styles()
+        
+        # Main container
+        self.main_frame = ttk.Frame(self.root)
+        self.main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Header with logo and title
+        header_frame = ttk.Frame(self.main_frame)
+        header_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        # Logo and title
+        logo_frame = ttk.Frame(header_frame)
+        logo_frame.pack(side=tk.LEFT, padx=10)
+        
+        ttk.Label(logo_frame, image=self.app_icon).pack(side=tk.LEFT)
+        ttk.Label(logo_frame, text="QryptoCore", font=self.title_font, 
+                 foreground=self.colors["accent"]).pack(side=tk.LEFT, padx=5)
+        
+        # Tagline
+        ttk.Label(header_frame, text="Classical to Quantum—One Tool to Lock Them All", 
+                 font=self.subtitle_font).pack(side=tk.LEFT, padx=10, expand=True)
+        
+        # Theme switcher
+        theme_frame = ttk.Frame(header_frame)
+        theme_frame.pack(side=tk.RIGHT, padx=10)
+        
+        ttk.Label(theme_frame, text="Theme:").pack(side=tk.LEFT)
+        self.theme_selector = ttk.Combobox(
+            theme_frame, 
+            textvariable=self.theme, 
+            values=self.themes.names(),
+            state="readonly",
+            width=8
+        )
+        self.theme_selector.pack(side=tk.LEFT, padx=5)
+        self.theme_selector.bind("<<ComboboxSelected>>", lambda e: self.change_theme())
+        
+        # Notebook for tabs
+        self.notebook = ttk.Notebook(self.main_frame)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        
+        # Setup tabs
+        self.setup_encryption_tab()
+        self.setup_decryption_tab()
+        self.setup_settings_tab()
+        self.setup_history_tab()
+        
+        # Status bar with progress for background operations
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(fill=tk.X)
+        
+        self.status_bar = ttk.Label(
+            status_frame, 
+            text="Ready", 
+            relief=tk.SUNKEN, 
+            anchor=tk.W,
+            font=("Segoe UI", 9),
+            foreground=self.colors["fg"],
+            background=self.colors["secondary"]
+        )
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.cancel_button = ttk.Button(status_frame, text="Cancel", command=self.cancel_operations,
+                                        style="Error.TButton")
+        self.progress_bar = ttk.Progressbar(status_frame, style="Horizontal.TProgressbar",
+                                            length=200, mode="indeterminate")
+        self.progress_mode = None
+        
+        # Initialize text widget colors after all widgets are created
+        self.update_text_widget_colors()
+    
+    def setup_encryption_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="Encrypt", image=self.encrypt_icon, compound=tk.LEFT)
+        
+        # Input section
+        input_frame = ttk.LabelFrame(tab, text="Input Text", padding=10)
+        input_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.input_view = DocumentView(input_frame, wrap=tk.WORD, font=self.mono_font)
+        self.input_view.pack(fill=tk.BOTH, expand=True)
+        self.input_text = self.input_view.text
+        
+        # Cipher selection
+        cipher_frame = ttk.Frame(tab)
+        cipher_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(cipher_frame, text="Cipher:").pack(side=tk.LEFT)
+        
+        self.cipher_var = tk.StringVar()
+        cipher_combo = ttk.Combobox(cipher_frame, textvariable=self.cipher_var,
+                                   values=cipher_names())
+        cipher_combo.pack(side=tk.LEFT, padx=5)
+        cipher_combo.current(0)
+        
+        ttk.Label(cipher_frame, text="Key:").pack(side=tk.LEFT, padx=(10, 0))
+        self.key_var = tk.StringVar()
+        self.key_entry = ttk.Entry(cipher_frame, textvariable=self.key_var)
+        self.key_entry.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+        
+        # Action buttons
+        button_frame = ttk.Frame(tab)
+        button_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Button(button_frame, text="Generate Key", command=self.generate_key).pack(side=tk.LEFT, padx=2)
+        ttk.Checkbutton(button_frame, text="Live Preview", variable=self.live_preview,
+                        command=self.toggle_preview).pack(side=tk.LEFT, padx=10)
+        ttk.Button(button_frame, text="Encrypt", command=self.encrypt, style="Accent.TButton").pack(side=tk.RIGHT, padx=2)
+        ttk.Button(button_frame, text="Clear", command=self.clear_input).pack(side=tk.RIGHT, padx=2)
+        
+        # Live preview, shown between the input and the cipher selection
+        self.preview_frame = ttk.LabelFrame(tab, text="Preview", padding=10)
+        self.preview_label = ttk.Label(self.preview_frame)
+        self.preview_label.pack(fill=tk.X)
+        self.preview_text = tk.Text(self.preview_frame, wrap=tk.WORD, font=self.mono_font,
+                                    height=6, state=tk.DISABLED)
+        self.preview_text.pack(fill=tk.BOTH, expand=True)
+        self.preview_anchor = cipher_frame
+        self.preview = LivePreview(self.input_view, self.preview_text, self.ciphers, self.tasks,
+                                   lambda: (self.cipher_var.get(), self.key_var.get().strip()),
+                                   on_message=lambda text: self.preview_label.config(text=text))
+        self.cipher_var.trace_add("write", lambda *args: self.preview.invalidate())
+        self.key_var.trace_add("write", lambda *args: self.preview.invalidate())
+    
+    def setup_decryption_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="Decrypt", image=self.decrypt_icon, compound=tk.LEFT)
+        
+        # File selection
+        file_frame = ttk.LabelFrame(tab, text="Input", padding=10)
+        file_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.decrypt_view = DocumentView(file_frame, wrap=tk.WORD, font=self.mono_font)
+        self.decrypt_view.pack(fill=tk.BOTH, expand=True)
+        self.decrypt_text = self.decrypt_view.text
+        
+        # Cipher selection
+        cipher_frame = ttk.Frame(tab)
+        cipher_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(cipher_frame, text="Cipher:").pack(side=tk.LEFT)
+        
+        self.decrypt_cipher_var = tk.StringVar()
+        cipher_combo = ttk.Combobox(cipher_frame, textvariable=self.decrypt_cipher_var,
+                                   values=cipher_names())
+        cipher_combo.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(cipher_frame, text="Key:").pack(side=tk.LEFT, padx=(10, 0))
+        self.decrypt_key_entry = ttk.Entry(cipher_frame)
+        self.decrypt_key_entry.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+        
+        # Action buttons
+        button_frame = ttk.Frame(tab)
+        button_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Button(button_frame, text="Browse File", command=self.browse_file).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Copy All", command=self.copy_output).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Analyze", command=self.analyze).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Decrypt", command=self.decrypt, style="Accent.TButton").pack(side=tk.RIGHT, padx=2)
+        ttk.Button(button_frame, text="Clear", command=self.clear_decrypt).pack(side=tk.RIGHT, padx=2)
+    
+    def setup_settings_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="Settings", image=self.settings_icon, compound=tk.LEFT)
+        
+        # Theme settings
+        theme_frame = ttk.LabelFrame(tab, text="Appearance", padding=10)
+        theme_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(theme_frame, text="Theme:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Radiobutton(theme_frame, text="Dark", variable=self.theme, value="dark",
+                       command=self.change_theme).grid(row=0, column=1, sticky=tk.W)
+        ttk.Radiobutton(theme_frame, text="Light", variable=self.theme, value="light",
+                       command=self.change_theme).grid(row=0, column=2, sticky=tk.W)
+        ttk.Radiobutton(theme_frame, text="Tech", variable=self.theme, value="tech",
+                       command=self.change_theme).grid(row=0, column=3, sticky=tk.W)
+        
+        # Font settings
+        font_frame = ttk.LabelFrame(tab, text="Font", padding=10)
+        font_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(font_frame, text="Font Size:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Scale(font_frame, from_=8, to=18, variable=self.font_size,
+                 command=lambda e: self.change_font_size()).grid(row=0, column=1, sticky=tk.EW)
+        
+        # Encryption settings
+        crypto_frame = ttk.LabelFrame(tab, text="Encryption", padding=10)
+        crypto_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(crypto_frame, text="Compress before AES/DES3:").grid(row=0, column=0, sticky=tk.W)
+        compression_combo = ttk.Combobox(crypto_frame, textvariable=self.compression,
+                                         values=["None", "zlib", "lzma", "bz2"], state="readonly", width=10)
+        compression_combo.grid(row=0, column=1, sticky=tk.W, padx=5)
+        compression_combo.bind("<<ComboboxSelected>>", lambda e: self.change_compression())
+        
+        # Reset button
+        ttk.Button(tab, text="Reset to Defaults", command=self.reset_settings).pack(pady=10)
+    
+    def setup_history_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="History", image=self.history_icon, compound=tk.LEFT)
+        
+        self.history_tab = tab
+        
+        # Filters
+        filter_frame = ttk.Frame(tab)
+        filter_frame.pack(fill=tk.X, padx=5, pady=(5, 0))
+        
+        ttk.Label(filter_frame, text="Cipher:").pack(side=tk.LEFT)
+        self.history_cipher_var = tk.StringVar(value="All")
+        cipher_filter = ttk.Combobox(filter_frame, textvariable=self.history_cipher_var,
+                                     values=["All"] + cipher_names(), state="readonly", width=12)
+        cipher_filter.pack(side=tk.LEFT, padx=5)
+        cipher_filter.bind("<<ComboboxSelected>>", lambda e: self.refresh_history())
+        
+        ttk.Label(filter_frame, text="Direction:").pack(side=tk.LEFT, padx=(10, 0))
+        self.history_direction_var = tk.StringVar(value="All")
+        direction_filter = ttk.Combobox(filter_frame, textvariable=self.history_direction_var,
+                                        values=["All", "encrypt", "decrypt"], state="readonly", width=10)
+        direction_filter.pack(side=tk.LEFT, padx=5)
+        direction_filter.bind("<<ComboboxSelected>>", lambda e: self.refresh_history())
+        
+        self.history_count_label = ttk.Label(filter_frame, text="")
+        self.history_count_label.pack(side=tk.RIGHT)
+        
+        # History list (one page at a time)
+        self.history_listbox = tk.Listbox(tab, font=self.mono_font)
+        self.history_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Action buttons
+        button_frame = ttk.Frame(tab)
+        button_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Button(button_frame, text="Clear History", command=self.clear_history).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Copy Selected", command=self.copy_history_item).pack(side=tk.RIGHT)
+        ttk.Button(button_frame, text="Older ▶", command=self.older_history).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="◀ Newer", command=self.newer_history).pack(side=tk.RIGHT)
+        
+        # Only read from the store when the tab is actually shown
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self.refresh_history(only_visible=True))
+    
+    def update_text_widget_colors(self):
+        text_options = {
+            "bg": self.colors["text_bg"],
+            "fg": self.colors["text_fg"],
+            "selectbackground": self.colors["select_bg"],
+            "selectforeground": self.colors["select_fg"]
+        }
+        for widget in (self.input_text, self.decrypt_text, self.preview_text):
+            if widget:
+                widget.config(insertbackground=self.colors["accent"], **text_options)
+        if self.history_listbox:
+            self.history_listbox.config(**text_options)
+    
+    def show_splash(self):
+        splash = tk.Toplevel(self.root)
+        splash.geometry("400x300")
+        splash.overrideredirect(True)
+        
+        # Center splash screen
+        screen_width = self.root.winfo_screenwidth()
+        screen_height = self.root.winfo_screenheight()
+        x = (screen_width // 2) - (400 // 2)
+        y = (screen_height // 2) - (300 // 2)
+        splash.geometry(f"+{x}+{y}")
+        
+        # Splash content
+        splash.config(bg="#121212")
+        ttk.Label(splash, text="QryptoCore", font=("Segoe UI", 24, "bold"), 
+                 foreground="#00b4ff", background="#121212").pack(pady=50)
+        ttk.Label(splash, text="Loading...", font=("Segoe UI", 12), 
+                 foreground="#e0e0e0", background="#121212").pack()
+        
+        # Paint it now; finish_startup removes it once the UI is ready
+        splash.update()
+        self.splash = splash
+    
+    def finish_startup(self):
+        self.splash.destroy()
+        self.root.deiconify()
+        self.root.update_idletasks()
+        self.mark_startup("interactive")
+        if self.profiler:
+            print(self.profiler.report())
+            self.root.after_idle(self.root.destroy)
+    
+    def change_theme(self):
+        self.configure_styles()
+        self.update_text_widget_colors()
+        self.save_settings()
+    
+    def apply_compression(self):
+        value = self.compression.get()
+        self.ciphers.compression = None if value == "None" else value
+    
+    def change_compression(self):
+        self.apply_compression()
+        self.save_settings()
+    
+    def change_font_size(self):
+        # The slider reports every pixel of movement; only whole sizes matter
+        if self.mono_font[1] == self.font_size.get():
+            return
+        self.setup_fonts()
+        self.configure_styles()
+        self.save_settings()
+    
+    def increase_font(self):
+        if self.font_size.get() < 18:
+            self.font_size.set(self.font_size.get() + 1)
+            self.change_font_size()
+    
+    def decrease_font(self):
+        if self.font_size.get() > 8:
+            self.font_size.set(self.font_size.get() - 1)
+            self.change_font_size()
+    
+    def reset_settings(self):
+        self.theme.set("dark")
+        self.font_size.set(11)
+        self.compression.set("None")
+        self.apply_compression()
+        self.change_theme()
+        self.change_font_size()
+        messagebox.showinfo("Settings Reset", "All settings have been reset to defaults.")
+    
+    def browse_file(self):
+        file_path = filedialog.askopenfilename()
+        if file_path:
+            try:
+                self.decrypt_view.load_file(file_path)
+                self.status_bar.config(text=f"Loaded: {os.path.basename(file_path)}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read file: {e}")
+    
+    def save_file(self):
+        if not self.decrypt_view.large and not self.decrypt_view.get().strip():
+            messagebox.showwarning("Warning", "No content to save.")
+            return
+        
+        file_path = filedialog.asksaveasfilename(defaultextension=".txt")
+        if file_path:
+            try:
+                self.decrypt_view.save(file_path)
+                self.status_bar.config(text=f"Saved: {os.path.basename(file_path)}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save file: {e}")
+    
+    def encrypt_file(self):
+        self.process_file("encrypt", self.cipher_var.get(), self.key_entry.get().strip())
+    
+    def decrypt_file(self):
+        self.process_file("decrypt", self.decrypt_cipher_var.get(), self.decrypt_key_entry.get().strip())
+    
+    def encrypt_folder(self):
+        self.process_folder("encrypt", self.cipher_var.get(), self.key_entry.get().strip())
+    
+    def decrypt_folder(self):
+        self.process_folder("decrypt", self.decrypt_cipher_var.get(), self.decrypt_key_entry.get().strip())
+    
+    def check_stream_cipher(self, direction, cipher, key):
+        tab = "Encrypt" if direction == "encrypt" else "Decrypt"
+        streamable = [name for name in cipher_names() if get_cipher(name).streamable]
+        if cipher not in streamable:
+            messagebox.showwarning("Warning", f"File {direction}ion supports {' and '.join(streamable)}. "
+                                   f"Select one on the {tab} tab.")
+            return False
+        if not key:
+            messagebox.showwarning("Warning", f"Please enter a key on the {tab} tab.")
+            return False
+        return True
+    
+    def process_file(self, direction, cipher, key):
+        """Stream a file through AES/DES3 straight to disk without loading it"""
+        if not self.check_stream_cipher(direction, cipher, key):
+            return
+        
+        src = filedialog.askopenfilename(title=f"Select file to {direction}")
+        if not src:
+            return
+        name = os.path.basename(src)
+        if direction == "encrypt":
+            suggested = name + ".enc"
+        else:
+            suggested = name[:-4] if name.endswith(".enc") else name + ".dec"
+        dst = filedialog.asksaveasfilename(title="Save output as", initialfile=suggested)
+        if not dst:
+            return
+        
+        armor = True
+        if direction == "encrypt":
+            armor = messagebox.askyesno("Output Format", "Write Base64 text?\n\nChoose No for compact raw binary output.")
+        total = os.path.getsize(src)
+        
+        def run(task):
+            progress = lambda done: task.report(done, total)
+            start = time.perf_counter()
+            self.ciphers.last_compression = None
+            try:
+                with open(dst, 'wb') as f:
+                    out = HashingWriter(f, digest=direction == "encrypt")
+                    if direction == "encrypt":
+                        self.ciphers.encrypt_stream(cipher, src, out, key, encoding="base64" if armor else "raw",
+                                                    progress=progress)
+                    else:
+                        self.ciphers.decrypt_stream(cipher, src, out, key, progress=progress)
+            except BaseException:
+                if os.path.exists(dst):
+                    os.remove(dst)
+                raise
+            self.add_history(cipher, direction, total, out.size, time.perf_counter() - start, out.hexdigest(),
+                             note=name)
+            return self.ciphers.last_compression
+        
+        verb = "Encrypted" if direction == "encrypt" else "Decrypted"
+        
+        def done(compression):
+            self.refresh_history(only_visible=True)
+            self.status_bar.config(text=f"{verb} {name} -> {os.path.basename(dst)}"
+                                        f"{self.format_compression(compression)}")
+        
+        self.tasks.submit(run, done,
+                          lambda e: messagebox.showerror("Error", f"File {direction}ion failed: {e}"),
+                          f"{verb[:-1]}ing {name} with {cipher}")
+    
+    def copy_output(self):
+        self.decrypt_view.copy_to_clipboard()
+        self.status_bar.config(text="Copied to clipboard")
+    
+    def process_folder(self, direction, cipher, key):
+        """Mirror a folder tree through AES/DES3, skipping files already done"""
+        if not self.check_stream_cipher(direction, cipher, key):
+            return
+        
+        src = filedialog.askdirectory(title=f"Select folder to {direction}")
+        if not src:
+            return
+        dst = filedialog.askdirectory(title="Select output folder")
+        if not dst:
+            return
+        
+        armor = False
+        if direction == "encrypt":
+            armor = messagebox.askyesno("Output Format", "Write Base64 text?\n\nChoose No for compact raw binary output.")
+        name = os.path.basename(os.path.normpath(src))
+        
+        def run(task):
+            from folders import TreeProcessor
+            start = time.perf_counter()
+            processor = TreeProcessor(self.ciphers, direction, cipher, key,
+                                      encoding="base64" if armor else "raw")
+            summary = processor.run(src, dst, progress=task.report)
+            if summary["processed"]:
+                self.add_history(cipher, direction, summary["bytes_in"], summary["bytes_out"],
+                                 time.perf_counter() - start, None, note=name + os.sep)
+            return summary
+        
+        verb = "Encrypted" if direction == "encrypt" else "Decrypted"
+        
+        def done(summary):
+            self.refresh_history(only_visible=True)
+            text = f"{verb} {summary['processed']} file(s) in {name}, {summary['skipped']} unchanged"
+            if summary["failed"]:
+                text += f", {len(summary['failed'])} failed"
+                details = "\n".join(f"{path}: {error}" for path, error in summary["failed"][:10])
+                messagebox.showwarning("Warning", f"Some files could not be {verb.lower()}:\n\n{details}")
+            self.status_bar.config(text=text)
+        
+        self.tasks.submit(run, done,
+                          lambda e: messagebox.showerror("Error", f"Folder {direction}ion failed: {e}"),
+                          f"{verb[:-1]}ing folder {name} with {cipher}")
+    
+    def new_file(self):
+        self.input_view.clear()
+        self.decrypt_view.clear()
+        self.key_entry.delete(0, tk.END)
+        self.decrypt_key_entry.delete(0, tk.END)
+        self.status_bar.config(text="New file created")
+    
+    def clear_input(self):
+        self.input_view.clear()
+        self.key_entry.delete(0, tk.END)
+    
+    def toggle_preview(self):
+        if self.live_preview.get():
+            self.preview_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, before=self.preview_anchor)
+            self.preview.enable()
+        else:
+            self.preview.disable()
+            self.preview_frame.pack_forget()
+    
+    def clear_decrypt(self):
+        self.decrypt_view.clear()
+        self.decrypt_key_entry.delete(0, tk.END)
+    
+    def add_history(self, cipher, direction, input_size, output_size, duration, output_hash, note=None):
+        # Called from task workers so the INSERT never blocks the Tk thread;
+        # the task's done callback refreshes the History tab.
+        self.history.add(cipher, direction, input_size, output_size, duration, output_hash, note)
+    
+    def history_filters(self):
+        cipher = self.history_cipher_var.get()
+        direction = self.history_direction_var.get()
+        return (None if cipher == "All" else cipher), (None if direction == "All" else direction)
+    
+    def refresh_history(self, before=None, after=None, only_visible=False):
+        if only_visible and self.notebook.select() != str(self.history_tab):
+            return
+        cipher, direction = self.history_filters()
+        page = self.history.page(self.HISTORY_PAGE_SIZE, before=before, after=after,
+                                 cipher=cipher, direction=direction)
+        if not page and (before is not None or after is not None):
+            return
+        self.history_page = page
+        self.history_listbox.delete(0, tk.END)
+        for record in page:
+            self.history_listbox.insert(tk.END, self.format_history(record))
+        total = self.history.count(cipher, direction)
+        self.history_count_label.config(text=f"{len(page)} of {total} entries")
+    
+    def older_history(self):
+        if self.history_page:
+            self.refresh_history(before=self.history_page[-1])
+    
+    def newer_history(self):
+        if self.history_page:
+            self.refresh_history(after=self.history_page[0])
+    
+    def format_history(self, record):
+        timestamp = datetime.fromtimestamp(record.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        verb = "Encrypted" if record.direction == "encrypt" else "Decrypted"
+        text = f"[{timestamp}] {verb}"
+        if record.note:
+            text += f" file {record.note}"
+        text += f" with {record.cipher}"
+        if record.input_size is not None:
+            text += f" · {record.input_size} B"
+        if record.duration is not None:
+            text += f" · {record.duration * 1000:.1f} ms"
+        if record.output_hash:
+            text += f" · {record.output_hash[:12]}"
+        return text
+    
+    def clear_history(self):
+        self.history.clear()
+        self.history_page = []
+        self.history_listbox.delete(0, tk.END)
+        self.history_count_label.config(text="0 of 0 entries")
+    
+    def copy_history_item(self):
+        selection = self.history_listbox.curselection()
+        if selection:
+            item = self.history_listbox.get(selection[0])
+            self.root.clipboard_clear()
+            self.root.clipboard_append(item)
+            self.status_bar.config(text="Copied to clipboard")
+    
+    def update_task_status(self, runner):
+        if not hasattr(self, 'progress_bar'):
+            return
+        if not runner.busy:
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
+            self.cancel_button.pack_forget()
+            self.progress_mode = None
+            return
+        
+        task = runner.current
+        determinate = task is not None and bool(task.total)
+        mode = "determinate" if determinate else "indeterminate"
+        if self.progress_mode is None:
+            self.cancel_button.pack(side=tk.RIGHT, padx=2)
+            self.progress_bar.pack(side=tk.RIGHT, padx=5)
+        if mode != self.progress_mode:
+            self.progress_bar.stop()
+            self.progress_bar.config(mode=mode, value=0)
+            if not determinate:
+                self.progress_bar.start(10)
+            self.progress_mode = mode
+        if determinate:
+            self.progress_bar.config(maximum=task.total, value=task.done)
+        
+        text = f"{task.description}..." if task is not None else "Waiting..."
+        if runner.queued:
+            text += f" ({runner.queued} queued)"
+        self.status_bar.config(text=text)
+    
+    def cancel_operations(self):
+        if self.tasks.cancel_all():
+            self.status_bar.config(text="Cancelled")
+    
+    def on_exit(self):
+        self.tasks.cancel_all()
+        self.save_settings()
+        self.settings.flush()
+        self.ciphers.key_cache.clear()
+        self.history.close()
+        self.input_view.close()
+        self.decrypt_view.close()
+        self.root.quit()
+    
+    def generate_key(self):
+        cipher = self.cipher_var.get()
+        length = None
+        if cipher == "OTP":
+            # A one-time pad key has to cover the whole plaintext
+            if self.input_view.large:
+                messagebox.showwarning("Warning", "This text is too large for an OTP key; use OTP Pad with a pad file.")
+                return
+            length = max(16, len(self.input_view.get().strip()))
+        try:
+            key = get_cipher(cipher).generate_key(length)
+        except ValueError as e:
+            messagebox.showwarning("Warning", str(e))
+            return
+        
+        self.key_entry.delete(0, tk.END)
+        self.key_entry.insert(0, key)
+    
+    def export_keys(self):
+        """Write many keys for the selected cipher to a file, one per line"""
+        cipher = self.cipher_var.get()
+        count = simpledialog.askinteger("Generate Keys", f"How many {cipher} keys?",
+                                        initialvalue=1000, minvalue=1, parent=self.root)
+        if not count:
+            return
+        path = filedialog.asksaveasfilename(title="Save keys as", defaultextension=".txt",
+                                            initialfile=f"{cipher.lower().replace(' ', '-')}-keys.txt")
+        if not path:
+            return
+        
+        def run(task):
+            with open(path, 'w', encoding='utf-8') as f:
+                for start in range(0, count, 10000):
+                    batch = min(10000, count - start)
+                    f.write('\n'.join(self.ciphers.generate_keys(cipher, batch)) + '\n')
+                    task.report(start + batch, count)
+            return count
+        
+        self.tasks.submit(run,
+                          lambda n: self.status_bar.config(text=f"Saved {n} {cipher} key(s) to {os.path.basename(path)}"),
+                          lambda e: messagebox.showerror("Error", f"Key generation failed: {e}"),
+                          f"Generating {count} {cipher} keys")
+    
+    def encrypt(self):
+        cipher = self.cipher_var.get()
+        plaintext = self.input_view.get().strip()
+        key = self.key_entry.get().strip()
+        
+        if not plaintext:
+            messagebox.showwarning("Warning", "Please enter text to encrypt.")
+            return
+        
+        def done(result):
+            ciphertext, record, compression = result
+            self.decrypt_view.set(ciphertext)
+            self.refresh_history(only_visible=True)
+            self.status_bar.config(text=f"Encrypted with {cipher}{self.format_rate(record)}"
+                                        f"{self.format_compression(compression)}")
+        
+        def run(task):
+            self.ciphers.last_compression = None
+            ciphertext = self.ciphers.encrypt(cipher, plaintext, key)
+            record = self.ciphers.instrumentation.last
+            self.add_history(cipher, "encrypt", record.bytes_in if record else None,
+                             record.bytes_out if record else None,
+                             record.wall_time if record else None, output_digest(ciphertext))
+            return ciphertext, record, self.ciphers.last_compression
+        
+        self.tasks.submit(run, done,
+                          lambda e: messagebox.showerror("Error", f"Encryption failed: {e}"),
+                          f"Encrypting with {cipher}")
+    
+    def decrypt(self):
+        cipher = self.decrypt_cipher_var.get()
+        ciphertext = self.decrypt_view.get().strip()
+        key = self.decrypt_key_entry.get().strip()
+        
+        if not ciphertext:
+            messagebox.showwarning("Warning", "Please enter text to decrypt.")
+            return
+        
+        def done(result):
+            plaintext, record = result
+            self.decrypt_view.set(plaintext)
+            self.refresh_history(only_visible=True)
+            self.status_bar.config(text=f"Decrypted with {cipher}{self.format_rate(record)}")
+        
+        def run(task):
+            plaintext = self.ciphers.decrypt(cipher, ciphertext, key)
+            record = self.ciphers.instrumentation.last
+            self.add_history(cipher, "decrypt", record.bytes_in if record else None,
+                             record.bytes_out if record else None,
+                             record.wall_time if record else None, None)
+            return plaintext, record
+        
+        self.tasks.submit(run, done,
+                          lambda e: messagebox.showerror("Error", f"Decryption failed: {e}"),
+                          f"Decrypting with {cipher}")
+    
+    def analyze(self):
+        ciphertext = self.decrypt_view.get().strip()
+        if not ciphertext:
+            messagebox.showwarning("Warning", "Please enter text to analyze.")
+            return
+        
+        def run(task):
+            from analysis import Analyzer
+            return Analyzer(self.ciphers).analyze(ciphertext)
+        
+        def done(candidates):
+            if not candidates:
+                messagebox.showinfo("Analyze", "No candidate keys found.")
+                return
+            self.show_candidates(candidates)
+            self.status_bar.config(text=f"Best guess: {candidates[0].cipher} with key {candidates[0].key}")
+        
+        self.tasks.submit(run, done,
+                          lambda e: messagebox.showerror("Error", f"Analysis failed: {e}"),
+                          "Analyzing ciphertext")
+    
+    def show_candidates(self, candidates):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Analysis Results")
+        dialog.geometry("700x320")
+        dialog.transient(self.root)
+        dialog.config(bg=self.colors["bg"])
+        
+        ttk.Label(dialog, text="Candidates, most English-like first:").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        listbox = tk.Listbox(dialog, font=self.mono_font, bg=self.colors["text_bg"], fg=self.colors["text_fg"],
+                             selectbackground=self.colors["select_bg"], selectforeground=self.colors["select_fg"])
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        for candidate in candidates:
+            preview = ' '.join(candidate.preview[:60].split())
+            listbox.insert(tk.END, f"{candidate.cipher:<11} {candidate.key:<16} {candidate.score:6.2f}  {preview}")
+        listbox.selection_set(0)
+        
+        def apply():
+            selection = listbox.curselection()
+            if not selection:
+                return
+            candidate = candidates[selection[0]]
+            self.decrypt_cipher_var.set(candidate.cipher)
+            self.decrypt_key_entry.delete(0, tk.END)
+            self.decrypt_key_entry.insert(0, candidate.key)
+            dialog.destroy()
+            self.decrypt()
+        
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(button_frame, text="Decrypt with Selected", command=apply,
+                   style="Accent.TButton").pack(side=tk.RIGHT, padx=2)
+        ttk.Button(button_frame, text="Close", command=dialog.destroy).pack(side=tk.RIGHT, padx=2)
+        listbox.bind("<Double-Button-1>", lambda e: apply())
+    
+    def show_pipeline_dialog(self):
+        """Edit, load and save a chain of stages and run it on the Encrypt or Decrypt tab text"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Cipher Pipeline")
+        dialog.geometry("640x420")
+        dialog.transient(self.root)
+        dialog.config(bg=self.colors["bg"])
+        
+        ttk.Label(dialog, text="Stages, first to last (JSON). Decrypt runs them in reverse; "
+                               "cipher stages without a key ask for one.").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        editor = tk.Text(dialog, font=self.mono_font, wrap=tk.NONE, undo=True, bg=self.colors["text_bg"],
+                         fg=self.colors["text_fg"], insertbackground=self.colors["accent"])
+        editor.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        if self.pipeline_definition is None:
+            cipher = self.cipher_var.get()
+            stages = [{"type": "cipher", "cipher": cipher}]
+            if get_cipher(cipher).byte_oriented:
+                stages.append({"type": "encode", "encoding": "base64"})
+            self.pipeline_definition = json.dumps({"name": "My pipeline", "stages": stages},
+                                                  indent=2, ensure_ascii=False)
+        editor.insert("1.0", self.pipeline_definition)
+        
+        def definition():
+            self.pipeline_definition = editor.get("1.0", "end-1c")
+            return self.pipeline_definition
+        
+        def load():
+            path = filedialog.askopenfilename(parent=dialog, filetypes=[("Pipelines", "*.json"), ("All files", "*.*")])
+            if path:
+                with open(path, 'r', encoding='utf-8') as f:
+                    editor.delete("1.0", tk.END)
+                    editor.insert("1.0", f.read())
+        
+        def save():
+            pipeline = self.parse_pipeline(definition())
+            if pipeline is None:
+                return
+            path = filedialog.asksaveasfilename(parent=dialog, defaultextension=".json",
+                                                filetypes=[("Pipelines", "*.json")])
+            if path:
+                pipeline.save(path)
+                self.status_bar.config(text=f"Saved pipeline to {os.path.basename(path)}")
+        
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(button_frame, text="Open...", command=load).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Save As...", command=save).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Close", command=dialog.destroy).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(button_frame, text="Decrypt", command=lambda: self.run_pipeline(definition(), True),
+                   style="Accent.TButton").pack(side=tk.RIGHT, padx=2)
+        ttk.Button(button_frame, text="Encrypt", command=lambda: self.run_pipeline(definition(), False),
+                   style="Accent.TButton").pack(side=tk.RIGHT, padx=2)
+    
+    def parse_pipeline(self, definition):
+        from pipeline import Pipeline
+        try:
+            return Pipeline.from_dict(json.loads(definition), self.ciphers)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid pipeline: {e}")
+            return None
+    
+    def run_pipeline(self, definition, decrypt):
+        pipeline = self.parse_pipeline(definition)
+        if pipeline is None:
+            return
+        if pipeline.output_kind != "text":
+            messagebox.showerror("Error", "End the pipeline with an encode stage to show its output as text.")
+            return
+        direction = "decrypt" if decrypt else "encrypt"
+        text = (self.decrypt_view if decrypt else self.input_view).get().strip()
+        if not text:
+            messagebox.showwarning("Warning", f"Please enter text to {direction}.")
+            return
+        keys = []
+        for stage in pipeline.missing_keys():
+            key = simpledialog.askstring("Pipeline Key", f"Key for the {stage.cipher} stage:", show="*",
+                                         parent=self.root)
+            if not key:
+                return
+            keys.append(key)
+        pipeline.fill_keys(keys)
+        label = f"Pipeline ({pipeline.name})" if pipeline.name else "Pipeline"
+        
+        def run(task):
+            from pipeline import CHUNK_SIZE
+            
+            def source():
+                for start in range(0, len(text), CHUNK_SIZE):
+                    task.report(start, len(text))
+                    yield text[start:start + CHUNK_SIZE]
+            
+            start = time.perf_counter()
+            result = ''.join(pipeline.decrypt(source()) if decrypt else pipeline.encrypt(source()))
+            self.add_history(label, direction, len(text.encode('utf-8', 'surrogatepass')),
+                             len(result.encode('utf-8', 'surrogatepass')), time.perf_counter() - start,
+                             None if decrypt else output_digest(result))
+            return result
+        
+        def done(result):
+            self.decrypt_view.set(result)
+            self.refresh_history(only_visible=True)
+            self.status_bar.config(text=f"{direction.capitalize()}ed with {label}: "
+                                        + " -> ".join(pipeline.steps(decrypt)))
+        
+        self.tasks.submit(run, done,
+                          lambda e: messagebox.showerror("Error", f"Pipeline {direction}ion failed: {e}"),
+                          f"Running {label}")
+    
+    def format_rate(self, record):
+        if record is None or record.wall_time <= 0:
+            return ""
+        return f" ({record.bytes_in / 1024:.1f} KB in {record.wall_time * 1000:.1f} ms, {record.mb_per_s:.2f} MB/s)"
+    
+    def format_compression(self, stats):
+        if stats is None:
+            return ""
+        saved = stats.time_saved
+        effect = "saved" if saved >= 0 else "cost"
+        return (f", {stats.algorithm} {stats.original_size / 1024:.1f} KB -> {stats.compressed_size / 1024:.1f} KB "
+                f"({stats.ratio:.0%}, ~{abs(saved) * 1000:.0f} ms cipher time {effect})")
+    
+    def show_about(self):
+        about_text = """QryptoCore - Encryption/Decryption Tool
+Version 1.1.5
+
+A comprehensive tool for classical encryption algorithms.
+Supports AES, AES-GCM, Caesar, Vigenère, OTP, Atbash, Rail Fence, and DES3.
+
+© 2025 QryptoCore Team"""
+        messagebox.showinfo("About QryptoCore", about_text)
+
+    def open_user_manual(self):
+        import webbrowser
+        webbrowser.open("user_manual.html")
+
+    def open_docs(self):
+        import webbrowser
         webbrowser.open("documentation.html")
\ No newline at end of file
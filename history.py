@@ -0,0 +1,152 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+HistoryRecord = namedtuple(
+    "HistoryRecord",
+    "id timestamp cipher direction input_size output_size duration output_hash note")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    cipher TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    input_size INTEGER,
+    output_size INTEGER,
+    duration REAL,
+    output_hash TEXT,
+    note TEXT
+);
+CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp);
+CREATE INDEX IF NOT EXISTS history_cipher ON history (cipher, timestamp);
+CREATE INDEX IF NOT EXISTS history_direction ON history (direction, timestamp);
+"""
+
+
+def output_digest(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8', 'surrogatepass')
+    return hashlib.sha256(data).hexdigest()
+
+
+class HashingWriter:
+    """File-like wrapper that counts, and unless digest is False hashes, what is written."""
+
+    def __init__(self, f, digest=True):
+        self.f = f
+        self.size = 0
+        self._hash = hashlib.sha256() if digest else None
+
+    def write(self, data):
+        if self._hash is not None:
+            self._hash.update(data)
+        self.size += len(data)
+        return self.f.write(data)
+
+    def hexdigest(self):
+        return self._hash.hexdigest() if self._hash is not None else None
+
+
+class HistoryStore:
+    """Operation history persisted in SQLite.
+
+    Records are paged newest first with keyset pagination on
+    (timestamp, id), so reading any page costs the same however many
+    entries the store holds. Counts are computed once per filter and then
+    kept up to date by add() and clear(), so the store assumes it is the
+    only writer to its database.
+
+    Output hashes are kept for encryptions only: the output of a decryption
+    is plaintext, and its unsalted hash would confirm guesses of it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._counts = {}
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            # Databases written before plaintext hashes were dropped.
+            self._conn.execute("UPDATE history SET output_hash = NULL"
+                               " WHERE direction = 'decrypt' AND output_hash IS NOT NULL")
+
+    def add(self, cipher, direction, input_size=None, output_size=None, duration=None,
+            output_hash=None, note=None, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        if direction == "decrypt":
+            output_hash = None
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO history (timestamp, cipher, direction, input_size, output_size,"
+                " duration, output_hash, note) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (timestamp, cipher, direction, input_size, output_size, duration, output_hash, note))
+            for key in self._counts:
+                if key[0] in (None, cipher) and key[1] in (None, direction):
+                    self._counts[key] += 1
+        return HistoryRecord(cursor.lastrowid, timestamp, cipher, direction, input_size,
+                             output_size, duration, output_hash, note)
+
+    def page(self, limit=100, before=None, after=None, cipher=None, direction=None):
+        """Return up to limit records, newest first.
+
+        before/after are records (or (timestamp, id) pairs) bounding the page,
+        as returned at the edges of a previous page.
+        """
+        clauses, params = self._filters(cipher, direction)
+        if before is not None:
+            clauses.append("(timestamp, id) < (?, ?)")
+            params.extend(self._position(before))
+        if after is not None:
+            clauses.append("(timestamp, id) > (?, ?)")
+            params.extend(self._position(after))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        # Paging towards newer records walks the index upwards, then flips.
+        order = "ASC" if after is not None and before is None else "DESC"
+        sql = (f"SELECT id, timestamp, cipher, direction, input_size, output_size, duration,"
+               f" output_hash, note FROM history {where}"
+               f" ORDER BY timestamp {order}, id {order} LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit]).fetchall()
+        if order == "ASC":
+            rows.reverse()
+        return [HistoryRecord(*row) for row in rows]
+
+    def count(self, cipher=None, direction=None):
+        key = (cipher or None, direction or None)
+        with self._lock:
+            if key not in self._counts:
+                clauses, params = self._filters(cipher, direction)
+                where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+                self._counts[key] = self._conn.execute(f"SELECT COUNT(*) FROM history {where}",
+                                                       params).fetchone()[0]
+            return self._counts[key]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM history")
+            self._counts = dict.fromkeys(self._counts, 0)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _filters(cipher, direction):
+        clauses, params = [], []
+        if cipher:
+            clauses.append("cipher = ?")
+            params.append(cipher)
+        if direction:
+            clauses.append("direction = ?")
+            params.append(direction)
+        return clauses, params
+
+    @staticmethod
+    def _position(record):
+        if isinstance(record, HistoryRecord):
+            return [record.timestamp, record.id]
+        return list(record)
@@ -0,0 +1,107 @@
+import hashlib
+import hmac
+import os
+import threading
+from collections import OrderedDict
+
+
+def sha256_kdf(cipher, passphrase, size):
+    # The derivation QryptoCore has always used for AES and DES3 keys.
+    return hashlib.sha256(passphrase).digest()[:size]
+
+
+class KeyCache:
+    """Bounded LRU cache of derived key material keyed by cipher and passphrase.
+
+    kdf is called as kdf(cipher, passphrase_bytes, size) on a miss, so a
+    slower derivation such as PBKDF2 or scrypt can be plugged in unchanged.
+    Cached material lives in bytearrays that are overwritten with zeros when
+    an entry is evicted or the cache is cleared. Copies handed to callers
+    are ordinary bytes and are not tracked. Passphrases are not kept: entries
+    are found by an HMAC of the passphrase under a random per-cache secret.
+
+    That HMAC costs more than sha256_kdf itself, so with the default kdf
+    nothing is cached and derive() just calls it.
+    """
+
+    def __init__(self, maxsize=64, kdf=sha256_kdf):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.kdf = kdf
+        self.caching = kdf is not sha256_kdf
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._secret = os.urandom(32)
+
+    def derive(self, cipher, passphrase, size):
+        if isinstance(passphrase, str):
+            passphrase = passphrase.encode()
+        else:
+            passphrase = bytes(passphrase)
+        if not self.caching:
+            return self.kdf(cipher, passphrase, size)
+        cache_key = (cipher, self._fingerprint(passphrase))
+        with self._lock:
+            material = self._entries.get(cache_key)
+            if material is not None and len(material) == size:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return bytes(material)
+            self.misses += 1
+
+        # Derive outside the lock so a slow KDF doesn't serialize other keys.
+        material = bytearray(self.kdf(cipher, passphrase, size))
+        with self._lock:
+            previous = self._entries.pop(cache_key, None)
+            if previous is not None:
+                self._zero(previous)
+            self._entries[cache_key] = material
+            while len(self._entries) > self.maxsize:
+                _, evicted = self._entries.popitem(last=False)
+                self._zero(evicted)
+                self.evictions += 1
+            return bytes(material)
+
+    def evict(self, cipher=None, passphrase=None):
+        """Drop and zero matching entries; None matches anything. Returns the count."""
+        if isinstance(passphrase, str):
+            passphrase = passphrase.encode()
+        fingerprint = self._fingerprint(bytes(passphrase)) if passphrase is not None else None
+        with self._lock:
+            doomed = [k for k in self._entries
+                      if (cipher is None or k[0] == cipher)
+                      and (fingerprint is None or k[1] == fingerprint)]
+            for cache_key in doomed:
+                self._zero(self._entries.pop(cache_key))
+            self.evictions += len(doomed)
+            return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            for material in self._entries.values():
+                self._zero(material)
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _fingerprint(self, passphrase):
+        return hmac.new(self._secret, passphrase, hashlib.sha256).digest()
+
+    @staticmethod
+    def _zero(material):
+        material[:] = bytes(len(material))
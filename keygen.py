@@ -0,0 +1,168 @@
+import argparse
+import base64
+import os
+import string
+import sys
+import threading
+
+POOL_SIZE = 64 * 1024
+
+ALPHABETS = {
+    "lower": string.ascii_lowercase,
+    "letters": string.ascii_letters,
+    "alnum": string.ascii_letters + string.digits,
+    "hex": "0123456789abcdef",
+    "printable": ''.join(chr(c) for c in range(33, 127)),
+}
+
+
+class EntropyPool:
+    """os.urandom bytes handed out from a buffer refilled size bytes at a time.
+
+    One system call serves many small requests; requests larger than the
+    pool go straight to os.urandom. Bytes are never handed out twice, and
+    a forked child discards the buffer it inherited from its parent.
+    """
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self._buffer = b''
+        self._pos = 0
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def take(self, count):
+        if count >= self.size:
+            return os.urandom(count)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._buffer, self._pos, self._pid = b'', 0, os.getpid()
+            if self._pos + count > len(self._buffer):
+                self._buffer = self._buffer[self._pos:] + os.urandom(self.size)
+                self._pos = 0
+            data = self._buffer[self._pos:self._pos + count]
+            self._pos += count
+        return data
+
+
+class _Sampler:
+    # Maps random bytes onto symbols without modulo bias: bytes below the
+    # largest multiple of len(symbols) map through a translate table, the
+    # rest are deleted and redrawn.
+
+    def __init__(self, symbols):
+        if not 1 <= len(symbols) <= 256:
+            raise ValueError("An alphabet needs between 1 and 256 symbols")
+        self.symbols = symbols
+        limit = 256 - 256 % len(symbols)
+        self.acceptance = limit / 256
+        indices = bytes(i % len(symbols) for i in range(256))
+        self.index_table = indices
+        self.rejected = bytes(range(limit, 256))
+        if isinstance(symbols, str) and all(ord(c) < 256 for c in symbols):
+            self.byte_table = bytes(ord(symbols[i]) for i in indices)
+        else:
+            self.byte_table = None
+
+    def indices(self, pool, count):
+        """count uniformly random indices into symbols, as bytes."""
+        out = []
+        needed = count
+        while needed > 0:
+            # Draw a little more than the expected need so one pass usually suffices.
+            raw = pool.take(int(needed / self.acceptance * 1.02) + 16)
+            accepted = raw.translate(self.index_table, self.rejected)
+            out.append(accepted[:needed])
+            needed -= len(out[-1])
+        return b''.join(out)
+
+    def text(self, pool, count):
+        data = self.indices(pool, count)
+        if self.byte_table is not None:
+            return data.translate(self.byte_table).decode('latin-1')
+        return ''.join(self.symbols[i] for i in data)
+
+
+class KeyGenerator:
+    """Cryptographically secure keys, in bulk, from an EntropyPool."""
+
+    def __init__(self, pool=None):
+        self.pool = pool if pool is not None else EntropyPool()
+        self._samplers = {}
+
+    def string(self, length, alphabet="lower"):
+        return self._sampler(alphabet).text(self.pool, length)
+
+    def strings(self, count, length, alphabet="lower"):
+        """count independent strings of length symbols, drawn in one pass."""
+        text = self._sampler(alphabet).text(self.pool, count * length)
+        return [text[i:i + length] for i in range(0, count * length, length)]
+
+    def integers(self, count, low, high):
+        """count integers uniformly in [low, high]."""
+        span = high - low + 1
+        if not 1 <= span <= 256:
+            raise ValueError("integers() supports ranges of 1 to 256 values")
+        return [low + i for i in self._sampler(range(span)).indices(self.pool, count)]
+
+    def tokens(self, count, size):
+        """count base64 strings of size random bytes each."""
+        data = self.pool.take(count * size)
+        return [base64.b64encode(data[i:i + size]).decode() for i in range(0, count * size, size)]
+
+    def _sampler(self, alphabet):
+        symbols = ALPHABETS.get(alphabet, alphabet) if isinstance(alphabet, str) else alphabet
+        key = symbols if isinstance(symbols, str) else tuple(symbols)
+        sampler = self._samplers.get(key)
+        if sampler is None:
+            sampler = self._samplers[key] = _Sampler(symbols)
+        return sampler
+
+
+_default = None
+
+
+def default_generator():
+    global _default
+    if _default is None:
+        _default = KeyGenerator()
+    return _default
+
+
+def build_parser():
+    from ciphers import cipher_names
+    parser = argparse.ArgumentParser(prog="main.py keygen", description="Generate keys for a cipher in bulk.")
+    parser.add_argument("-c", "--cipher", required=True, choices=cipher_names())
+    parser.add_argument("-n", "--count", type=int, default=1, help="number of keys (default: 1)")
+    parser.add_argument("-l", "--length", type=int,
+                        help="key length: letters for Vigenère/OTP, bytes for AES/DES3/AES-GCM "
+                             "(Caesar and Rail Fence keys have none)")
+    parser.add_argument("-o", "--output", help="write keys here, one per line (default: stdout)")
+    return parser
+
+
+def main(argv=None):
+    from ciphers import get_cipher
+    args = build_parser().parse_args(argv)
+    if args.count < 0 or (args.length is not None and args.length < 1):
+        raise SystemExit("--count must be non-negative and --length positive")
+    cipher = get_cipher(args.cipher)
+    try:
+        # The first batch comes before the output is opened, so a cipher
+        # that cannot generate keys leaves no empty file behind. Batches
+        # keep memory flat for very large counts.
+        remaining = args.count
+        keys = cipher.generate_keys(min(remaining, 10000), args.length)
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        try:
+            while keys:
+                out.write('\n'.join(keys) + '\n')
+                remaining -= len(keys)
+                keys = cipher.generate_keys(min(remaining, 10000), args.length) if remaining else []
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -1,11 +1,45 @@
-import tkinter as tk
-from gui import QryptoCore
-
-def main():
-    root = tk.Tk()
-    root.withdraw()  
-    app = QryptoCore(root)
-    root.mainloop()
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import sys
+import time
+
+_START = time.perf_counter()
+
+
+def main():
+    args = sys.argv[1:]
+    # "python main.py batch/serve/pad/keygen/pipeline ..." run headless and never import tkinter/PIL.
+    if args[:1] == ["batch"]:
+        from cli import main as batch_main
+        sys.exit(batch_main(args[1:]))
+    if args[:1] == ["serve"]:
+        from service import main as serve_main
+        sys.exit(serve_main(args[1:]))
+    if args[:1] == ["pad"]:
+        from otppad import main as pad_main
+        sys.exit(pad_main(args[1:]))
+    if args[:1] == ["keygen"]:
+        from keygen import main as keygen_main
+        sys.exit(keygen_main(args[1:]))
+    if args[:1] == ["pipeline"]:
+        from pipeline import main as pipeline_main
+        sys.exit(pipeline_main(args[1:]))
+    
+    # --profile-startup prints time-to-interactive per phase, then exits.
+    profiler = None
+    if "--profile-startup" in args:
+        from utils import StartupProfiler
+        profiler = StartupProfiler(_START)
+    
+    import tkinter as tk
+    from gui import QryptoCore
+    if profiler:
+        profiler.mark("imports")
+    
+    root = tk.Tk()
+    root.withdraw()  
+    if profiler:
+        profiler.mark("tk root")
+    app = QryptoCore(root, profiler=profiler)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
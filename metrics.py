@@ -0,0 +1,213 @@
+import json
+import threading
+import time
+from collections import deque
+
+from utils import atomic_write
+
+# Upper bounds in seconds for the wall time histogram (Prometheus style, cumulative).
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+def payload_size(data):
+    # str.isascii() is O(1) in CPython, so ASCII text never gets encoded here.
+    if isinstance(data, str):
+        return len(data) if data.isascii() else len(data.encode('utf-8', 'surrogatepass'))
+    return memoryview(data).nbytes
+
+
+class OperationRecord:
+    __slots__ = ("timestamp", "direction", "cipher", "bytes_in", "bytes_out",
+                 "wall_time", "kdf_time", "error")
+
+    def __init__(self, direction, cipher, bytes_in, bytes_out, wall_time, kdf_time, error=None):
+        self.timestamp = time.time()
+        self.direction = direction
+        self.cipher = cipher
+        self.bytes_in = bytes_in
+        self.bytes_out = bytes_out
+        self.wall_time = wall_time
+        self.kdf_time = kdf_time
+        self.error = error
+
+    @property
+    def cipher_time(self):
+        return max(0.0, self.wall_time - self.kdf_time)
+
+    @property
+    def mb_per_s(self):
+        if self.wall_time <= 0:
+            return 0.0
+        return self.bytes_in / (1024 * 1024) / self.wall_time
+
+    def as_dict(self):
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["cipher_time"] = self.cipher_time
+        return data
+
+
+class MemorySink:
+    """Keeps the most recent records in memory."""
+
+    def __init__(self, maxlen=1000):
+        self.records = deque(maxlen=maxlen)
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class JsonLogSink:
+    """Appends one JSON object per operation to a file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        line = json.dumps(record.as_dict(), ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+class PrometheusTextSink:
+    """Rewrites a Prometheus text-format dump of the aggregates every N operations."""
+
+    def __init__(self, path, instrumentation=None, every=1):
+        self.path = path
+        self.instrumentation = instrumentation
+        self.every = max(1, every)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        with self._lock:
+            self._count += 1
+            due = self._count % self.every == 0
+        if self.instrumentation is not None and due:
+            self.write()
+
+    def write(self):
+        # atomic_write's temporary file is per process, so threads take turns
+        with self._lock:
+            atomic_write(self.path, self.instrumentation.prometheus_text())
+
+
+class _Series:
+    __slots__ = ("calls", "errors", "bytes_in", "bytes_out", "wall_time",
+                 "kdf_time", "buckets")
+
+    def __init__(self, bucket_count):
+        self.calls = self.errors = self.bytes_in = self.bytes_out = 0
+        self.wall_time = self.kdf_time = 0.0
+        self.buckets = [0] * bucket_count
+
+
+class Instrumentation:
+    """Aggregates per-cipher call metrics and forwards every record to sinks.
+
+    Attach one to CipherImplementations.instrumentation; while that
+    attribute is None the cipher dispatch does no timing at all.
+    """
+
+    def __init__(self, sinks=(), buckets=DEFAULT_BUCKETS):
+        self.sinks = list(sinks)
+        for sink in self.sinks:
+            if isinstance(sink, PrometheusTextSink) and sink.instrumentation is None:
+                sink.instrumentation = self
+        self.buckets = tuple(buckets)
+        self.last = None
+        self._series = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def measure(self, direction, cipher, func, data, key):
+        """Call func(cipher, data, key), recording its timing and sizes."""
+        local = self._local
+        local.kdf_time = 0.0
+        start = time.perf_counter()
+        try:
+            result = func(cipher, data, key)
+        except Exception as e:
+            self.record(OperationRecord(direction, cipher, payload_size(data), 0,
+                                        time.perf_counter() - start, local.kdf_time, str(e)))
+            raise
+        self.record(OperationRecord(direction, cipher, payload_size(data), payload_size(result),
+                                    time.perf_counter() - start, local.kdf_time))
+        return result
+
+    def add_kdf_time(self, seconds):
+        # Key derivation happens inside measure() on the same thread.
+        self._local.kdf_time = getattr(self._local, "kdf_time", 0.0) + seconds
+
+    def record(self, record):
+        with self._lock:
+            series = self._series.get((record.cipher, record.direction))
+            if series is None:
+                series = self._series[(record.cipher, record.direction)] = _Series(len(self.buckets))
+            series.calls += 1
+            series.errors += record.error is not None
+            series.bytes_in += record.bytes_in
+            series.bytes_out += record.bytes_out
+            series.wall_time += record.wall_time
+            series.kdf_time += record.kdf_time
+            for i, bound in enumerate(self.buckets):
+                if record.wall_time <= bound:
+                    series.buckets[i] += 1
+            self.last = record
+        for sink in self.sinks:
+            sink.emit(record)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                f"{cipher}/{direction}": {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "bytes_in": s.bytes_in,
+                    "bytes_out": s.bytes_out,
+                    "wall_time": s.wall_time,
+                    "kdf_time": s.kdf_time,
+                    "cipher_time": max(0.0, s.wall_time - s.kdf_time),
+                    "histogram": dict(zip(self.buckets, s.buckets)),
+                }
+                for (cipher, direction), s in self._series.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self.last = None
+
+    def prometheus_text(self):
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f"# HELP qrypto_{name} {help_text}")
+            lines.append(f"# TYPE qrypto_{name} {kind}")
+
+        with self._lock:
+            series = sorted(self._series.items())
+            counters = [
+                ("operations_total", "calls", "Cipher operations performed."),
+                ("errors_total", "errors", "Cipher operations that raised."),
+                ("bytes_in_total", "bytes_in", "Input bytes processed."),
+                ("bytes_out_total", "bytes_out", "Output bytes produced."),
+                ("kdf_seconds_total", "kdf_time", "Time spent deriving keys."),
+            ]
+            for name, attr, help_text in counters:
+                metric(name, "counter", help_text)
+                for (cipher, direction), s in series:
+                    lines.append(f'qrypto_{name}{{cipher="{cipher}",direction="{direction}"}} {getattr(s, attr)}')
+            metric("cipher_seconds_total", "counter", "Time spent in the cipher itself, excluding key derivation.")
+            for (cipher, direction), s in series:
+                lines.append(f'qrypto_cipher_seconds_total{{cipher="{cipher}",direction="{direction}"}} '
+                             f'{max(0.0, s.wall_time - s.kdf_time)}')
+            metric("operation_seconds", "histogram", "Wall time per cipher operation.")
+            for (cipher, direction), s in series:
+                labels = f'cipher="{cipher}",direction="{direction}"'
+                for bound, count in zip(self.buckets, s.buckets):
+                    lines.append(f'qrypto_operation_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'qrypto_operation_seconds_bucket{{{labels},le="+Inf"}} {s.calls}')
+                lines.append(f'qrypto_operation_seconds_sum{{{labels}}} {s.wall_time}')
+                lines.append(f'qrypto_operation_seconds_count{{{labels}}} {s.calls}')
+        return "\n".join(lines) + "\n"
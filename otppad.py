@@ -0,0 +1,208 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from contextlib import contextmanager
+
+from utils import atomic_write, parse_size
+
+try:
+    import fcntl
+except ImportError:  # Windows: reservations are only serialized in-process
+    fcntl = None
+
+# Pad ciphertext: magic, version, pad id, pad offset, length. The offset
+# says where in the pad the key bytes start, so the pad can be shared by
+# many messages without ever using the same bytes twice.
+PAD_MAGIC = b"QOTP"
+PAD_VERSION = 1
+PAD_HEADER = struct.Struct(">4sB8sQQ")
+# A pad file starts with its own magic and version, so an arbitrary file
+# is never taken for a pad, then PAD_ID_SIZE bytes that identify it and
+# are never used as key material. Key bytes start at PAD_START.
+PAD_FILE_MAGIC = b"QPAD"
+PAD_FILE_VERSION = 1
+PAD_FILE_HEADER = struct.Struct(">4sB")
+PAD_ID_SIZE = 32
+PAD_START = PAD_FILE_HEADER.size + PAD_ID_SIZE
+CHUNK_SIZE = 1024 * 1024
+
+_reserve_lock = threading.Lock()
+
+
+def generate_pad(path, size):
+    """Write a new pad of size usable random bytes; existing files are never overwritten."""
+    if size < 1:
+        raise ValueError("Pad size must be positive")
+    with open(path, 'xb') as f:
+        f.write(PAD_FILE_HEADER.pack(PAD_FILE_MAGIC, PAD_FILE_VERSION))
+        remaining = size + PAD_ID_SIZE
+        while remaining:
+            data = os.urandom(min(CHUNK_SIZE, remaining))
+            f.write(data)
+            remaining -= len(data)
+        f.flush()
+        os.fsync(f.fileno())
+    if os.path.exists(cursor_path(path)):
+        os.remove(cursor_path(path))
+    return path
+
+
+def cursor_path(path):
+    return path + ".cursor"
+
+
+class PadFile:
+    """A one-time pad file, memory-mapped read-only.
+
+    The cursor, the offset of the first unused byte, is kept next to the
+    pad in <pad>.cursor. reserve() advances it durably before any byte is
+    handed out, so a crash can waste pad but never reuse it. Decryption
+    reads the pad at the offset named in the ciphertext and consume()s it,
+    so this copy of the pad never encrypts with those bytes again.
+    """
+
+    magic = PAD_MAGIC
+    header_size = PAD_HEADER.size
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size <= PAD_START:
+                raise ValueError(f"{path} is too small to be a one-time pad")
+            magic, version = PAD_FILE_HEADER.unpack(self._file.read(PAD_FILE_HEADER.size))
+            if magic != PAD_FILE_MAGIC:
+                raise ValueError(f"{path} is not a one-time pad file")
+            if version != PAD_FILE_VERSION:
+                raise ValueError(f"{path} has unsupported pad version {version}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        self.size = size
+        seed = self._map[PAD_FILE_HEADER.size:PAD_START]
+        self.pad_id = hashlib.sha256(b"qrypto-otp-pad\0" + seed).digest()[:8]
+        # Known only to holders of the pad, unlike the id.
+        self.secret = hashlib.sha256(b"qrypto-otp-secret\0" + seed).digest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def cursor(self):
+        try:
+            with open(cursor_path(self.path), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return PAD_START
+        except ValueError:
+            raise ValueError(f"Pad cursor {cursor_path(self.path)} is corrupt; refusing to guess") from None
+        if not isinstance(state, dict) or not isinstance(state.get("offset"), int):
+            raise ValueError(f"Pad cursor {cursor_path(self.path)} is corrupt; refusing to guess")
+        # A cursor left from an earlier pad of the same name does not apply.
+        if state.get("pad_id") != self.pad_id.hex():
+            return PAD_START
+        return max(PAD_START, state["offset"])
+
+    @property
+    def remaining(self):
+        return self.size - self.cursor()
+
+    def reserve(self, size):
+        """Claim the next size bytes of the pad and return their offset."""
+        with self._locked():
+            offset = self.cursor()
+            if offset + size > self.size:
+                raise ValueError(f"One-time pad exhausted: {size} bytes needed, "
+                                 f"{self.size - offset} left in {self.path}")
+            self._save_cursor(offset + size)
+            return offset
+
+    def consume(self, offset, size):
+        """Mark the pad up to offset + size as used, e.g. by a message received.
+
+        Without this, a reply sent with this copy of the pad would start at
+        the same offset as the message and reuse its key bytes.
+        """
+        self._check_range(offset, size)
+        with self._locked():
+            if offset + size > self.cursor():
+                self._save_cursor(offset + size)
+
+    def view(self, offset, size):
+        """Zero-copy memoryview of pad bytes; release it before close()."""
+        self._check_range(offset, size)
+        return memoryview(self._map)[offset:offset + size]
+
+    def header(self, offset, length):
+        return PAD_HEADER.pack(PAD_MAGIC, PAD_VERSION, self.pad_id, offset, length)
+
+    def parse_header(self, data):
+        """Return (offset, length) from a ciphertext header made with this pad."""
+        if len(data) < PAD_HEADER.size:
+            raise ValueError("Not a one-time pad ciphertext: data too short")
+        magic, version, pad_id, offset, length = PAD_HEADER.unpack(bytes(data[:PAD_HEADER.size]))
+        if magic != PAD_MAGIC or version != PAD_VERSION:
+            raise ValueError("Not a one-time pad ciphertext or unsupported version")
+        if pad_id != self.pad_id:
+            raise ValueError("Ciphertext was encrypted with a different pad")
+        return offset, length
+
+    def _check_range(self, offset, size):
+        if offset < PAD_START or offset + size > self.size:
+            raise ValueError("Ciphertext refers to bytes outside the one-time pad")
+
+    @contextmanager
+    def _locked(self):
+        # Serializes cursor updates between threads and, where flock is
+        # available, between processes sharing the pad.
+        with _reserve_lock:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _save_cursor(self, offset):
+        state = json.dumps({"pad_id": self.pad_id.hex(), "offset": offset})
+        atomic_write(cursor_path(self.path), state, fsync=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py pad", description="Create and inspect one-time pad files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="write a new pad of random bytes")
+    create.add_argument("path")
+    create.add_argument("size", help="usable bytes, e.g. 64M or 2G")
+    status = commands.add_parser("status", help="show how much of a pad is left")
+    status.add_argument("path")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "create":
+            generate_pad(args.path, parse_size(args.size))
+        with PadFile(args.path) as pad:
+            used = pad.cursor() - PAD_START
+            print(f"{args.path}: id {pad.pad_id.hex()}, {pad.size - PAD_START} bytes, "
+                  f"{used} used, {pad.remaining} left")
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,487 @@
+import argparse
+import base64
+import codecs
+import json
+import os
+import sys
+
+from ciphers import CipherImplementations, get_cipher, pad, unpad
+from utils import atomic_write
+
+# Characters or bytes per chunk passed between stages. Stages re-cut what
+# they receive, so no stage holds more than a chunk or two at a time
+# (except the whole-message ciphers, see CipherStage).
+CHUNK_SIZE = 64 * 1024
+
+_STAGES = {}
+
+
+def register_stage(cls):
+    _STAGES[cls.type] = cls
+    return cls
+
+
+def _blocks(chunks, size, empty):
+    """Re-cut chunks into (piece, last) pairs; every piece but the last is exactly size long."""
+    buffer, held, previous = [], 0, None
+    for chunk in chunks:
+        buffer.append(chunk)
+        held += len(chunk)
+        if held < size:
+            continue
+        data = empty.join(buffer)
+        cut = len(data) - len(data) % size
+        for start in range(0, cut, size):
+            if previous is not None:
+                yield previous, False
+            previous = data[start:start + size]
+        buffer = [data[cut:]]
+        held = len(buffer[0])
+    rest = empty.join(buffer)
+    if rest:
+        if previous is not None:
+            yield previous, False
+        yield rest, True
+    else:
+        yield (previous if previous is not None else empty), True
+
+
+def _as_bytes(chunks):
+    for chunk in chunks:
+        yield chunk.encode('utf-8', 'surrogatepass') if isinstance(chunk, str) else chunk
+
+
+def _as_text(chunks):
+    decoder = codecs.getincrementaldecoder('utf-8')('surrogatepass')
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def _slices(data, size=CHUNK_SIZE):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _check_kind(stage, kind, accepts):
+    if kind not in accepts:
+        raise ValueError(f"{stage.describe()} needs {' or '.join(accepts)} input but receives {kind}; "
+                         f"add an encode stage before it")
+
+
+class Stage:
+    """One step of a pipeline.
+
+    forward(chunks, kind) is a generator turning input chunks of kind
+    ("text" or "bytes") into output chunks; backward(chunks, kind) undoes
+    it, yielding chunks of the kind forward was given.
+    """
+
+    type = None
+
+    def output_kind(self, kind):
+        return kind
+
+    def forward(self, chunks, kind):
+        raise NotImplementedError
+
+    def backward(self, chunks, kind):
+        raise NotImplementedError
+
+    def describe(self, decrypt=False):
+        return self.type
+
+    def to_dict(self):
+        return {"type": self.type}
+
+
+@register_stage
+class TransformStage(Stage):
+    """Plaintext normalization before encryption; it cannot be undone, so decryption skips it."""
+
+    type = "transform"
+    OPERATIONS = {
+        "upper": str.upper,
+        "lower": str.lower,
+        "letters": lambda text: ''.join(c for c in text if c.isalpha()),
+    }
+
+    def __init__(self, op):
+        if op not in self.OPERATIONS:
+            raise ValueError(f"Unknown transform '{op}'; choose from {', '.join(self.OPERATIONS)}")
+        self.op = op
+
+    @classmethod
+    def from_dict(cls, data, ciphers):
+        return cls(data.get("op"))
+
+    def output_kind(self, kind):
+        _check_kind(self, kind, ("text",))
+        return kind
+
+    def forward(self, chunks, kind):
+        func = self.OPERATIONS[self.op]
+        for chunk in chunks:
+            yield func(chunk)
+
+    def backward(self, chunks, kind):
+        return chunks
+
+    def describe(self, decrypt=False):
+        return f"{self.op} (not undone)" if decrypt else self.op
+
+    def to_dict(self):
+        return {"type": self.type, "op": self.op}
+
+
+@register_stage
+class CipherStage(Stage):
+    """A registered cipher.
+
+    Per-position ciphers stream through encrypt_at/decrypt_at, AES and DES3
+    stream through their CBC engine, and byte ciphers take text as UTF-8.
+    Rail Fence, AES-GCM and OTP Pad see the whole message at once; for Rail
+    Fence, block splits the text into independently transposed blocks of
+    that many characters so memory stays bounded.
+    """
+
+    type = "cipher"
+
+    def __init__(self, cipher, key=None, block=None, ciphers=None):
+        self.cipher_class = get_cipher(cipher)
+        self.cipher = cipher
+        self.key = key
+        self.block = int(block) if block is not None else None
+        self.ciphers = ciphers
+        self._context = None
+        if self.block is not None and (self.cipher_class.byte_oriented or self.block < 1):
+            raise ValueError("block applies to text ciphers only and must be positive")
+
+    @classmethod
+    def from_dict(cls, data, ciphers):
+        return cls(data.get("cipher"), data.get("key"), data.get("block"), ciphers)
+
+    @property
+    def needs_key(self):
+        return self.cipher_class.requires_key and self.key in (None, "")
+
+    @property
+    def context(self):
+        if self._context is None:
+            if self.needs_key:
+                raise ValueError(f"No key given for the {self.cipher} stage")
+            ciphers = self.ciphers if self.ciphers is not None else CipherImplementations()
+            self._context = ciphers.prepare(self.cipher, self.key)
+        return self._context
+
+    def output_kind(self, kind):
+        if self.cipher_class.byte_oriented:
+            return "bytes"
+        _check_kind(self, kind, ("text",))
+        return kind
+
+    def forward(self, chunks, kind):
+        context = self.context
+        if hasattr(context, "new_engine"):
+            return self._cbc_encrypt(context, _as_bytes(chunks))
+        if self.cipher_class.byte_oriented:
+            return self._whole(context.encrypt_bytes, _as_bytes(chunks), b'')
+        if context.char_period is not None:
+            return self._positional(context.encrypt_at, chunks)
+        return self._whole(context.encrypt, chunks, '')
+
+    def backward(self, chunks, kind):
+        context = self.context
+        if hasattr(context, "new_engine"):
+            out = self._cbc_decrypt(context, chunks)
+        elif self.cipher_class.byte_oriented:
+            out = self._whole(context.decrypt_bytes, chunks, b'')
+        elif context.char_period is not None:
+            return self._positional(context.decrypt_at, chunks)
+        else:
+            return self._whole(context.decrypt, chunks, '')
+        return _as_text(out) if kind == "text" else out
+
+    def _positional(self, func, chunks):
+        offset = 0
+        for chunk in chunks:
+            yield func(chunk, offset)
+            offset += len(chunk)
+
+    def _whole(self, func, chunks, empty):
+        if self.block:
+            for piece, last in _blocks(chunks, self.block, empty):
+                if piece:
+                    yield func(piece)
+            return
+        yield from _slices(func(empty.join(chunks)))
+
+    def _cbc_encrypt(self, context, chunks):
+        engine = context.new_engine()
+        yield engine.iv
+        size = CHUNK_SIZE - CHUNK_SIZE % engine.block_size
+        for piece, last in _blocks(chunks, size, b''):
+            yield engine.encrypt(pad(piece, engine.block_size) if last else piece)
+
+    def _cbc_decrypt(self, context, chunks):
+        block = context.block_size
+        engine = None
+        # The first block is the IV; only the final piece is unpadded.
+        for piece, last in _blocks(chunks, CHUNK_SIZE - CHUNK_SIZE % block, b''):
+            if engine is None:
+                if len(piece) < block:
+                    raise ValueError("Ciphertext is truncated or not a multiple of the block size")
+                engine = context.new_engine(iv=piece[:block])
+                piece = piece[block:]
+            if len(piece) % block or (last and not piece):
+                raise ValueError("Ciphertext is truncated or not a multiple of the block size")
+            yield unpad(engine.decrypt(piece), block) if last else engine.decrypt(piece)
+
+    def describe(self, decrypt=False):
+        detail = f", blocks of {self.block}" if self.block else ""
+        return f"{'decrypt' if decrypt else 'encrypt'} {self.cipher}{detail}"
+
+    def to_dict(self):
+        data = {"type": self.type, "cipher": self.cipher}
+        if self.key not in (None, ""):
+            data["key"] = self.key
+        if self.block:
+            data["block"] = self.block
+        return data
+
+
+@register_stage
+class EncodeStage(Stage):
+    """Bytes to base64 or hex text; text input is encoded as UTF-8 first."""
+
+    type = "encode"
+    # Input bytes per output group, and the matching group of characters.
+    GROUPS = {"base64": (3, 4), "hex": (1, 2)}
+
+    def __init__(self, encoding="base64"):
+        if encoding not in self.GROUPS:
+            raise ValueError(f"Unknown encoding '{encoding}'; choose base64 or hex")
+        self.encoding = encoding
+
+    @classmethod
+    def from_dict(cls, data, ciphers):
+        return cls(data.get("encoding", "base64"))
+
+    def output_kind(self, kind):
+        return "text"
+
+    def forward(self, chunks, kind):
+        size = CHUNK_SIZE - CHUNK_SIZE % self.GROUPS[self.encoding][0]
+        for piece, last in _blocks(_as_bytes(chunks), size, b''):
+            if piece:
+                yield base64.b64encode(piece).decode() if self.encoding == "base64" else piece.hex()
+
+    def backward(self, chunks, kind):
+        out = self._decode(chunks)
+        return _as_text(out) if kind == "text" else out
+
+    def _decode(self, chunks):
+        size = CHUNK_SIZE - CHUNK_SIZE % self.GROUPS[self.encoding][1]
+        # Line breaks and spaces, e.g. from pasting, are ignored.
+        chunks = (''.join(chunk.split()) for chunk in chunks)
+        for piece, last in _blocks(chunks, size, ''):
+            if self.encoding == "base64":
+                yield base64.b64decode(piece, validate=True)
+            else:
+                yield bytes.fromhex(piece)
+
+    def describe(self, decrypt=False):
+        return f"decode {self.encoding}" if decrypt else f"encode {self.encoding}"
+
+    def to_dict(self):
+        return {"type": self.type, "encoding": self.encoding}
+
+
+@register_stage
+class CompressStage(Stage):
+    """zlib, lzma or bz2 compression (see compression.py); text input is encoded as UTF-8 first."""
+
+    type = "compress"
+
+    def __init__(self, algorithm="zlib"):
+        from compression import get_codec
+        get_codec(algorithm)
+        self.algorithm = algorithm
+
+    @classmethod
+    def from_dict(cls, data, ciphers):
+        return cls(data.get("algorithm", "zlib"))
+
+    def output_kind(self, kind):
+        return "bytes"
+
+    def forward(self, chunks, kind):
+        from compression import Compressor
+        compressor = Compressor(self.algorithm)
+        for chunk in _as_bytes(chunks):
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def backward(self, chunks, kind):
+        out = self._decompress(chunks)
+        return _as_text(out) if kind == "text" else out
+
+    def _decompress(self, chunks):
+        from compression import Decompressor, get_codec
+        # The algorithm comes from the definition, so the stream has no header.
+        decompressor = Decompressor(get_codec(self.algorithm))
+        for chunk in chunks:
+            yield decompressor.feed(chunk)
+        yield decompressor.finish()
+
+    def describe(self, decrypt=False):
+        return f"decompress {self.algorithm}" if decrypt else f"compress {self.algorithm}"
+
+    def to_dict(self):
+        return {"type": self.type, "algorithm": self.algorithm}
+
+
+class Pipeline:
+    """Stages run in order to encrypt; decryption runs their inverses in reverse.
+
+    Plaintext is text. Chunks flow through the stages as generators, so a
+    file of any size is processed with a few chunks in memory. Definitions
+    are JSON: {"name": ..., "stages": [{"type": "cipher", "cipher":
+    "Vigenère", "key": ...}, ...]}; keys may be left out and supplied at
+    run time with fill_keys().
+    """
+
+    def __init__(self, stages, name=None):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = list(stages)
+        self.name = name
+        # kinds[i] is what stage i receives; kinds[-1] is the ciphertext.
+        self.kinds = ["text"]
+        for stage in self.stages:
+            self.kinds.append(stage.output_kind(self.kinds[-1]))
+
+    @classmethod
+    def from_dict(cls, data, ciphers=None):
+        stages = []
+        for spec in data.get("stages", []):
+            stage_class = _STAGES.get(spec.get("type"))
+            if stage_class is None:
+                raise ValueError(f"Unknown pipeline stage type '{spec.get('type')}'")
+            stages.append(stage_class.from_dict(spec, ciphers))
+        return cls(stages, data.get("name"))
+
+    @classmethod
+    def load(cls, path, ciphers=None):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), ciphers)
+
+    def to_dict(self):
+        data = {"stages": [stage.to_dict() for stage in self.stages]}
+        if self.name:
+            data = {"name": self.name, **data}
+        return data
+
+    def save(self, path):
+        atomic_write(path, json.dumps(self.to_dict(), indent=2, ensure_ascii=False))
+
+    @property
+    def output_kind(self):
+        return self.kinds[-1]
+
+    def missing_keys(self):
+        """Cipher stages that still need a key, in order."""
+        return [stage for stage in self.stages if isinstance(stage, CipherStage) and stage.needs_key]
+
+    def fill_keys(self, keys):
+        for stage, key in zip(self.missing_keys(), keys):
+            stage.key = key
+
+    def encrypt(self, chunks):
+        """Generator of ciphertext chunks (of kind output_kind) for plaintext chunks."""
+        for stage, kind in zip(self.stages, self.kinds):
+            chunks = stage.forward(chunks, kind)
+        return chunks
+
+    def decrypt(self, chunks):
+        """Generator of plaintext chunks; the inverse of encrypt."""
+        for stage, kind in reversed(list(zip(self.stages, self.kinds))):
+            chunks = stage.backward(chunks, kind)
+        return chunks
+
+    def steps(self, decrypt=False):
+        stages = reversed(self.stages) if decrypt else self.stages
+        return [stage.describe(decrypt) for stage in stages]
+
+    def run_file(self, src, dst, decrypt=False, progress=None):
+        """Stream src into dst ("-" for stdin/stdout); returns the number of characters or bytes read."""
+        source_kind, target_kind = (self.output_kind, "text") if decrypt else ("text", self.output_kind)
+        consumed = 0
+
+        def read(f):
+            nonlocal consumed
+            while True:
+                data = f.read(CHUNK_SIZE)
+                if not data:
+                    return
+                consumed += len(data)
+                if progress:
+                    progress(consumed)
+                yield data
+
+        binary = {"bytes": True, "text": False}
+        with _open(src, 'r', binary[source_kind]) as fin, _open(dst, 'w', binary[target_kind]) as fout:
+            for chunk in (self.decrypt if decrypt else self.encrypt)(read(fin)):
+                fout.write(chunk)
+        return consumed
+
+
+def _open(path, mode, binary):
+    if path == "-":
+        stream = sys.stdin if mode == 'r' else sys.stdout
+        if binary:
+            return os.fdopen(os.dup(stream.fileno()), mode + 'b')
+        return os.fdopen(os.dup(stream.fileno()), mode, encoding='utf-8', errors='surrogatepass', newline='')
+    if binary:
+        return open(path, mode + 'b')
+    return open(path, mode, encoding='utf-8', errors='surrogatepass', newline='')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py pipeline",
+                                     description="Run a saved chain of ciphers over a file, chunk by chunk.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="encrypt (or with -d, decrypt) a file")
+    run.add_argument("definition", help="pipeline definition (JSON)")
+    run.add_argument("-i", "--input", default="-", help="input file (default: stdin)")
+    run.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    run.add_argument("-d", "--decrypt", action="store_true", help="run the derived reverse pipeline")
+    run.add_argument("-k", "--key", action="append", default=[],
+                     help="key for the next cipher stage without one (repeatable)")
+    show = commands.add_parser("show", help="print the stages and the derived reverse pipeline")
+    show.add_argument("definition")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        pipeline = Pipeline.load(args.definition, CipherImplementations())
+        if args.command == "show":
+            print(f"{pipeline.name or args.definition}: text -> {pipeline.output_kind}")
+            print("  encrypt: " + " -> ".join(pipeline.steps()))
+            print("  decrypt: " + " -> ".join(pipeline.steps(decrypt=True)))
+            missing = [stage.cipher for stage in pipeline.missing_keys()]
+            if missing:
+                print(f"  keys needed at run time (-k): {', '.join(missing)}")
+            return 0
+        pipeline.fill_keys(args.key)
+        if pipeline.missing_keys():
+            raise ValueError(f"No key given for {', '.join(s.cipher for s in pipeline.missing_keys())}; use -k")
+        pipeline.run_file(args.input, args.output, args.decrypt)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,192 @@
+import tkinter as tk
+
+from ciphers import get_cipher
+
+# Delay after the last keystroke before the preview catches up, for
+# ciphers patched in place and for ciphers recomputed in full.
+PATCH_DELAY_MS = 100
+FULL_DELAY_MS = 400
+_SCAN_CHUNK = 4096
+
+
+def common_prefix(a, b, limit=None):
+    """Length of the common prefix of a and b, comparing chunk by chunk."""
+    limit = min(len(a), len(b)) if limit is None else limit
+    pos = 0
+    while pos < limit:
+        end = min(pos + _SCAN_CHUNK, limit)
+        if a[pos:end] != b[pos:end]:
+            while a[pos] == b[pos]:
+                pos += 1
+            return pos
+        pos = end
+    return limit
+
+
+def common_suffix(a, b, limit):
+    """Length of the common suffix of a and b, at most limit."""
+    count = 0
+    while count < limit:
+        step = min(_SCAN_CHUNK, limit - count)
+        if a[len(a) - count - step:len(a) - count] != b[len(b) - count - step:len(b) - count]:
+            while a[len(a) - count - 1] == b[len(b) - count - 1]:
+                count += 1
+            return count
+        count += step
+    return limit
+
+
+def edit_range(old, new):
+    """Return (start, old_end, new_end) such that old[start:old_end] became new[start:new_end]."""
+    start = common_prefix(old, new)
+    tail = common_suffix(old, new, min(len(old), len(new)) - start)
+    return start, len(old) - tail, len(new) - tail
+
+
+def plan_patch(context, old, new):
+    """Return (start, end, replacement) updating the preview of old to that of new.
+
+    Only the edited range is encrypted again. When the edit changes the
+    length by something other than a multiple of the cipher's period, the
+    text after it moves to positions with different shifts, so the patch
+    runs to the end. Returns None for ciphers that cannot be patched.
+    """
+    period = context.char_period
+    if period is None:
+        return None
+    start, old_end, new_end = edit_range(old, new)
+    delta = len(new) - len(old)
+    if delta and (period == 0 or delta % period):
+        old_end, new_end = len(old), len(new)
+    return start, old_end, context.encrypt_at(new[start:new_end], start)
+
+
+class LivePreview:
+    """Keeps a read-only Text widget showing the encryption of a DocumentView.
+
+    Per-position ciphers (see Cipher.char_period) are patched in place on
+    the Tk thread: only the edited range is re-encrypted and replaced.
+    Other ciphers, and any change of cipher or key, are recomputed in full
+    on the TaskRunner after a longer pause; results that arrive after a
+    newer edit are dropped. Ciphers that are not Cipher.previewable are
+    never run.
+    """
+
+    def __init__(self, view, target, ciphers, tasks, settings, on_message=None):
+        self.view = view
+        self.target = target
+        self.ciphers = ciphers
+        self.tasks = tasks
+        self.settings = settings
+        self.on_message = on_message or (lambda text: None)
+        self.enabled = False
+        self._text = None
+        self._state = None
+        self._context = None
+        self._after = None
+        self._task = None
+        self._generation = 0
+        view.text.bind("<<Modified>>", self._on_modified, add=True)
+
+    def enable(self):
+        self.enabled = True
+        self.invalidate()
+
+    def disable(self):
+        self.enabled = False
+        self._cancel()
+        self._generation += 1
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def invalidate(self):
+        """Recompute everything, e.g. after the cipher or key changed."""
+        self._state = None
+        self._schedule(0)
+
+    def _on_modified(self, event):
+        text = self.view.text
+        if not text.edit_modified():
+            return
+        text.edit_modified(False)
+        if self.enabled:
+            patchable = self._context is not None and self._context.char_period is not None
+            self._schedule(PATCH_DELAY_MS if patchable else FULL_DELAY_MS)
+
+    def _schedule(self, delay):
+        if not self.enabled:
+            return
+        self._cancel()
+        self._after = self.view.after(delay, self._update)
+
+    def _cancel(self):
+        if self._after is not None:
+            self.view.after_cancel(self._after)
+            self._after = None
+
+    def _update(self):
+        self._after = None
+        self._generation += 1
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.view.large:
+            self._show("")
+            self.on_message("Live preview is off for large documents")
+            return
+        state = self.settings()
+        if not get_cipher(state[0]).previewable:
+            self._state = self._context = self._text = None
+            self._show("")
+            self.on_message(f"Live preview is off for {state[0]}: each encryption uses up key material")
+            return
+        text = self.view.text.get("1.0", "end-1c")
+        if state == self._state and self._text is not None and self._context.char_period is not None:
+            try:
+                patch = plan_patch(self._context, self._text, text)
+            except ValueError as e:
+                self._fail(e)
+                return
+            self._text = text
+            self._patch(*patch)
+            self.on_message("")
+            return
+
+        # First run, new cipher or key, or a cipher that must be recomputed
+        # in full: prepare and encrypt off the Tk thread.
+        generation = self._generation
+        context = self._context if state == self._state else None
+
+        def run(task):
+            prepared = context if context is not None else self.ciphers.prepare(*state)
+            if prepared.char_period is not None:
+                return prepared, prepared.encrypt_at(text, 0)
+            return prepared, prepared.encrypt(text)
+
+        def done(result):
+            if generation == self._generation:
+                self._state, self._context, self._text = state, result[0], text
+                self._show(result[1])
+                self.on_message("")
+
+        def failed(error):
+            if generation == self._generation:
+                self._fail(error)
+
+        self._task = self.tasks.submit(run, done, failed, "Updating preview")
+
+    def _fail(self, error):
+        self._state = self._context = self._text = None
+        self._show("")
+        self.on_message(f"Preview unavailable: {error}")
+
+    def _patch(self, start, end, replacement):
+        target = self.target
+        target.config(state=tk.NORMAL)
+        target.delete(f"1.0 + {start} chars", f"1.0 + {end} chars" if end is not None else tk.END)
+        target.insert(f"1.0 + {start} chars", replacement)
+        target.config(state=tk.DISABLED)
+
+    def _show(self, ciphertext):
+        self._patch(0, None, ciphertext)
@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ciphers import cipher_names, get_cipher, worker_ciphers
+
+MAX_BODY_SIZE = 64 * 1024 * 1024
+# Requests with more text than this skip batching and get a job of their own.
+BATCH_TEXT_LIMIT = 64 * 1024
+# Header lines accepted per request before answering 431.
+MAX_HEADERS = 100
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 408: "Request Timeout",
+           411: "Length Required", 413: "Payload Too Large", 431: "Request Header Fields Too Large",
+           500: "Internal Server Error"}
+
+
+def served_cipher_names():
+    """Ciphers offered over HTTP: those whose key is not a local file path."""
+    return [name for name in cipher_names() if not get_cipher(name).key_is_path]
+
+
+def run_batch(direction, cipher, key, texts):
+    """Encrypt or decrypt texts sharing one cipher and key.
+
+    The key is prepared once for the whole batch. Returns one
+    (True, result) or (False, error message) pair per text.
+    """
+    try:
+        context = worker_ciphers().prepare(cipher, key)
+    except Exception as e:
+        return [(False, str(e))] * len(texts)
+    func = context.encrypt if direction == "encrypt" else context.decrypt
+    results = []
+    for text in texts:
+        try:
+            results.append((True, func(text)))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Batcher:
+    """Coalesces concurrent small requests that share a cipher and key.
+
+    Requests are queued per (direction, cipher, key) and handed to the
+    executor together on the next loop iteration (or after delay seconds),
+    or as soon as max_batch of them are waiting. One pool job then serves
+    the whole batch.
+    """
+
+    def __init__(self, executor, delay=0.0, max_batch=64, text_limit=BATCH_TEXT_LIMIT):
+        self.executor = executor
+        self.delay = delay
+        self.max_batch = max_batch
+        self.text_limit = text_limit
+        self.requests = 0
+        self.batches = 0
+        self._pending = {}
+
+    async def submit(self, direction, cipher, key, text):
+        loop = asyncio.get_running_loop()
+        self.requests += 1
+        if len(text) > self.text_limit:
+            self.batches += 1
+            (ok, result), = await loop.run_in_executor(self.executor, run_batch,
+                                                       direction, cipher, key, [text])
+            return self._unwrap(ok, result)
+
+        batch_key = (direction, cipher, key)
+        batch = self._pending.get(batch_key)
+        if batch is None:
+            batch = self._pending[batch_key] = []
+            if self.delay:
+                loop.call_later(self.delay, self._flush, batch_key, batch)
+            else:
+                loop.call_soon(self._flush, batch_key, batch)
+        future = loop.create_future()
+        batch.append((text, future))
+        if len(batch) >= self.max_batch:
+            self._flush(batch_key, batch)
+        ok, result = await future
+        return self._unwrap(ok, result)
+
+    def stats(self):
+        return {"requests": self.requests, "batches": self.batches,
+                "mean_batch_size": self.requests / self.batches if self.batches else 0.0}
+
+    def _flush(self, batch_key, batch):
+        if self._pending.get(batch_key) is not batch:
+            return
+        del self._pending[batch_key]
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(self.executor, run_batch, *batch_key, [text for text, _ in batch])
+        job.add_done_callback(lambda job: self._resolve(batch, job))
+
+    @staticmethod
+    def _resolve(batch, job):
+        error = None if job.cancelled() else job.exception()
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if job.cancelled():
+                future.cancel()
+            elif error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(job.result()[index])
+
+    @staticmethod
+    def _unwrap(ok, result):
+        if not ok:
+            raise RequestError(400, result)
+        return result
+
+
+class CipherService:
+    """HTTP/1.1 front end for CipherImplementations.encrypt/decrypt.
+
+    POST /encrypt and /decrypt take {"cipher", "key", "text"} and answer
+    {"result"}; GET /ciphers lists the ciphers and GET /stats reports
+    request and batch counts. Connections are kept alive until the client
+    closes them or sends "Connection: close". Cipher work runs on the
+    executor, never on the event loop. A request's headers and body must
+    arrive within read_timeout seconds of its request line.
+    """
+
+    def __init__(self, executor, batch_delay=0.0, max_batch=64, idle_timeout=60.0, read_timeout=30.0):
+        self.batcher = Batcher(executor, delay=batch_delay, max_batch=max_batch)
+        self.idle_timeout = idle_timeout
+        self.read_timeout = read_timeout
+        self.connections = 0
+
+    async def start(self, host="127.0.0.1", port=8750, unix=None):
+        if unix:
+            return await asyncio.start_unix_server(self.handle, path=unix)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except ValueError:
+                    # readline() raises this for lines longer than the stream limit.
+                    self._respond(writer, 400, {"error": "Request line too long"}, False)
+                    await writer.drain()
+                    break
+                if not request_line.strip():
+                    break
+                keep_alive = await self._serve(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _serve(self, request_line, reader, writer):
+        try:
+            method, path, version = request_line.decode('latin-1').split()
+        except ValueError:
+            self._respond(writer, 400, {"error": "Malformed request line"}, False)
+            return False
+        try:
+            headers, body = await asyncio.wait_for(self._read_request(reader), self.read_timeout)
+        except asyncio.TimeoutError:
+            self._respond(writer, 408, {"error": "Timed out reading the request"}, False)
+            return False
+        except RequestError as e:
+            # The request was not consumed, so the connection cannot be reused.
+            self._respond(writer, e.status, {"error": str(e)}, False)
+            return False
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        try:
+            status, payload = 200, await self._dispatch(method, path.split("?")[0], body)
+        except RequestError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+        if len(payload.get("result", "")) > BATCH_TEXT_LIMIT:
+            # Large results are encoded off the event loop, like large bodies are decoded.
+            writer.write(await asyncio.to_thread(self._encode, status, payload, keep_alive))
+        else:
+            self._respond(writer, status, payload, keep_alive)
+        return keep_alive
+
+    async def _read_request(self, reader):
+        headers = {}
+        count = 0
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # readline() raises this for lines longer than the stream limit.
+                raise RequestError(431, "Header line too long") from None
+            if line in (b"\r\n", b"\n", b""):
+                break
+            count += 1
+            if count > MAX_HEADERS:
+                raise RequestError(431, f"More than {MAX_HEADERS} header lines")
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return headers, await self._read_body(reader, headers)
+
+    async def _read_body(self, reader, headers):
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise RequestError(411, "Chunked bodies are not supported; send Content-Length")
+        # Digits only: int() would also take "-5", "+5" or " 5_0".
+        value = headers.get("content-length", "0")
+        if not (value.isascii() and value.isdigit()):
+            raise RequestError(400, "Invalid Content-Length")
+        length = int(value)
+        if length > MAX_BODY_SIZE:
+            raise RequestError(413, f"Body larger than {MAX_BODY_SIZE} bytes")
+        return await reader.readexactly(length) if length else b""
+
+    async def _dispatch(self, method, path, body):
+        if path in ("/encrypt", "/decrypt"):
+            if method != "POST":
+                raise RequestError(405, f"{path} only accepts POST")
+            try:
+                # Large bodies are decoded off the event loop, like the cipher work.
+                if len(body) > BATCH_TEXT_LIMIT:
+                    request = await asyncio.to_thread(json.loads, body)
+                else:
+                    request = json.loads(body)
+            except ValueError:
+                raise RequestError(400, "Body is not valid JSON") from None
+            if not isinstance(request, dict) or not isinstance(request.get("text"), str):
+                raise RequestError(400, "Body must be a JSON object with a string 'text'")
+            cipher = request.get("cipher")
+            if cipher not in served_cipher_names():
+                raise RequestError(400, f"Unknown cipher: {cipher}")
+            key = request.get("key", "")
+            if not isinstance(key, str):
+                raise RequestError(400, "'key' must be a string")
+            result = await self.batcher.submit(path[1:], cipher, key, request["text"])
+            return {"result": result}
+        if method != "GET":
+            raise RequestError(405, f"{path} only accepts GET")
+        if path == "/ciphers":
+            return {"ciphers": served_cipher_names()}
+        if path == "/stats":
+            return dict(self.batcher.stats(), connections=self.connections)
+        raise RequestError(404, f"No such endpoint: {path}")
+
+    @classmethod
+    def _respond(cls, writer, status, payload, keep_alive):
+        writer.write(cls._encode(status, payload, keep_alive))
+
+    @staticmethod
+    def _encode(status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode('latin-1') + body
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Serve encrypt/decrypt over local HTTP for other processes.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8750, help="TCP port (default: 8750)")
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="pool size for cipher work")
+    parser.add_argument("--processes", action="store_true",
+                        help="use worker processes instead of threads (for the pure-Python ciphers)")
+    parser.add_argument("--batch-delay", type=float, default=0.0,
+                        help="seconds to wait for more requests with the same key (default: next loop turn)")
+    parser.add_argument("--max-batch", type=int, default=64, help="largest batch handed to a worker")
+    return parser
+
+
+async def serve(args):
+    pool_class = ProcessPoolExecutor if args.processes else ThreadPoolExecutor
+    with pool_class(max_workers=args.workers) as executor:
+        service = CipherService(executor, batch_delay=args.batch_delay, max_batch=args.max_batch)
+        server = await service.start(args.host, args.port, args.unix)
+        address = args.unix or "http://{}:{}".format(*server.sockets[0].getsockname()[:2])
+        print(f"Serving on {address} ({args.workers} {'process' if args.processes else 'thread'} "
+              f"worker(s))", file=sys.stderr, flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.max_batch < 1:
+        raise SystemExit("--max-batch must be at least 1")
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
+    return 0
@@ -0,0 +1,137 @@
+import queue
+import threading
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    def __init__(self, func, on_done, on_error, description):
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+        self.description = description
+        self.done = 0
+        self.total = None
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def report(self, done, total=None):
+        """Record progress from the worker; raises TaskCancelled once cancelled.
+
+        Long operations call this between chunks, which is what makes them
+        stop early. Operations that never report run to completion and their
+        result is simply discarded.
+        """
+        self.done = done
+        if total is not None:
+            self.total = total
+        if self.cancelled:
+            raise TaskCancelled()
+
+
+class TaskRunner:
+    """Runs tasks one at a time on a background thread for a Tk app.
+
+    Results are handed back on the Tk thread by polling with root.after, so
+    callbacks may touch widgets freely and the mainloop never blocks on a
+    cipher. Tasks submitted while one is running wait in FIFO order.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, root, on_update=None):
+        self.root = root
+        self.on_update = on_update
+        self.current = None
+        self._queue = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._polling = False
+        self._thread = threading.Thread(target=self._work, name="qrypto-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, func, on_done=None, on_error=None, description=""):
+        """Queue func(task); on_done(result) or on_error(exc) run on the Tk thread."""
+        task = Task(func, on_done, on_error, description)
+        with self._lock:
+            self._pending.append(task)
+        self._queue.put(task)
+        self._schedule_poll()
+        self._notify()
+        return task
+
+    def cancel_all(self):
+        with self._lock:
+            tasks = list(self._pending)
+            if self.current is not None:
+                tasks.append(self.current)
+        for task in tasks:
+            task.cancel()
+        self._notify()
+        return len(tasks)
+
+    @property
+    def busy(self):
+        return self.current is not None or bool(self._pending)
+
+    @property
+    def queued(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _work(self):
+        while True:
+            task = self._queue.get()
+            with self._lock:
+                self._pending.remove(task)
+                self.current = task
+            if task.cancelled:
+                result, error = None, TaskCancelled()
+            else:
+                try:
+                    result, error = task.func(task), None
+                except Exception as e:
+                    result, error = None, e
+            # Hand the result over before clearing current: _poll stops once
+            # nothing is busy and the queue is empty, so the other order
+            # could leave this result unread.
+            self._results.put((task, result, error))
+            with self._lock:
+                self.current = None
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                task, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if task.cancelled or isinstance(error, TaskCancelled):
+                continue
+            if error is not None:
+                if task.on_error:
+                    task.on_error(error)
+            elif task.on_done:
+                task.on_done(result)
+        self._notify()
+        if self.busy or not self._results.empty():
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _notify(self):
+        if self.on_update:
+            self.on_update(self)
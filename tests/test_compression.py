@@ -0,0 +1,97 @@
+import io
+
+import pytest
+
+from ciphers import CipherImplementations
+from compression import HEADER_SIZE, MAGIC, Decompressor, compress, decompress, get_codec, header, read_header
+
+ALGORITHMS = ["zlib", "lzma", "bz2"]
+PLAINTEXT = b"The quick brown fox jumps over the lazy dog. " * 200
+
+
+@pytest.fixture
+def ciphers():
+    return CipherImplementations(workers=1)
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_header_round_trip(algorithm):
+    codec = get_codec(algorithm)
+    data = header(codec)
+    assert len(data) == HEADER_SIZE
+    assert data.startswith(MAGIC)
+    assert read_header(data + b"rest") is codec
+
+
+def test_read_header_rejects_corrupt_magic_and_truncation():
+    data = header(get_codec("zlib"))
+    assert read_header(b"X" + data[1:]) is None
+    assert read_header(data[:-1]) is None
+    assert read_header(b"") is None
+
+
+def test_read_header_rejects_unknown_codec():
+    assert read_header(MAGIC + b"\xff") is None
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_compress_round_trip(algorithm):
+    compressed, compressor = compress(PLAINTEXT, algorithm)
+    assert len(compressed) < len(PLAINTEXT)
+    assert decompress(compressed, compressor.codec) == PLAINTEXT
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_decompressor_rejects_truncated_and_trailing_data(algorithm):
+    compressed, compressor = compress(PLAINTEXT, algorithm)
+    with pytest.raises(ValueError):
+        decompress(compressed[:-4], compressor.codec)
+    decompressor = Decompressor(compressor.codec)
+    decompressor.feed(compressed)
+    with pytest.raises(ValueError):
+        decompressor.feed(b"trailing")
+
+
+@pytest.mark.parametrize("cipher", ["AES", "DES3"])
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_header_is_outside_the_ciphertext(ciphers, cipher, algorithm):
+    ciphers.compression = algorithm
+    data = ciphers.encrypt_bytes(cipher, PLAINTEXT, "passphrase")
+    assert read_header(data) is get_codec(algorithm)
+    assert len(data) % ciphers.prepare(cipher, "passphrase").block_size == HEADER_SIZE
+    ciphers.compression = None
+    assert ciphers.decrypt_bytes(cipher, data, "passphrase") == PLAINTEXT
+
+
+@pytest.mark.parametrize("cipher", ["AES", "DES3"])
+def test_plaintext_that_looks_like_a_header_is_left_alone(ciphers, cipher):
+    for algorithm in ALGORITHMS:
+        plaintext = header(get_codec(algorithm)) + PLAINTEXT
+        data = ciphers.encrypt_bytes(cipher, plaintext, "passphrase")
+        assert read_header(data) is None
+        assert ciphers.decrypt_bytes(cipher, data, "passphrase") == plaintext
+
+
+@pytest.mark.parametrize("encoding", ["raw", "base64"])
+@pytest.mark.parametrize("compression", [None, "zlib", "lzma", "bz2"])
+def test_stream_round_trip(ciphers, encoding, compression):
+    out = io.BytesIO()
+    ciphers.encrypt_stream("AES", io.BytesIO(PLAINTEXT), out, "passphrase", chunk_size=1000,
+                           encoding=encoding, compression=compression)
+    plain = io.BytesIO()
+    ciphers.decrypt_stream("AES", io.BytesIO(out.getvalue()), plain, "passphrase", chunk_size=1000)
+    assert plain.getvalue() == PLAINTEXT
+
+
+def test_stream_compression_can_be_turned_off(ciphers):
+    ciphers.compression = "zlib"
+    out = io.BytesIO()
+    ciphers.encrypt_stream("AES", io.BytesIO(PLAINTEXT), out, "passphrase", encoding="raw", compression=False)
+    assert read_header(out.getvalue()) is None
+
+
+def test_stream_rejects_truncated_header(ciphers):
+    out = io.BytesIO()
+    ciphers.encrypt_stream("AES", io.BytesIO(PLAINTEXT), out, "passphrase", encoding="raw", compression="zlib")
+    with pytest.raises(ValueError):
+        ciphers.decrypt_stream("AES", io.BytesIO(out.getvalue()[:HEADER_SIZE - 1]), io.BytesIO(), "passphrase")
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from ciphers import CipherImplementations
+from folders import MANIFEST_NAME, MANIFEST_VERSION, Manifest, TreeProcessor, walk_files
+
+SETTINGS = {"cipher": "AES", "direction": "encrypt", "encoding": "raw", "compression": None, "key": "0123"}
+ENTRY = {"size": 3, "mtime_ns": 1, "hmac": "ab" * 32, "output": "a.txt.enc", "output_size": 32}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.txt").write_bytes(b"alpha" * 1000)
+    (src / "sub" / "b.bin").write_bytes(os.urandom(5000))
+    (src / "empty").write_bytes(b"")
+    return src
+
+
+def test_manifest_round_trip(tmp_path):
+    path = str(tmp_path / MANIFEST_NAME)
+    manifest = Manifest(path, SETTINGS)
+    manifest.update("a.txt", ENTRY)
+    manifest.save()
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data == {"version": MANIFEST_VERSION, "settings": SETTINGS, "files": {"a.txt": ENTRY}}
+    assert Manifest(path, SETTINGS).get("a.txt") == ENTRY
+    assert os.listdir(tmp_path) == [MANIFEST_NAME]
+
+
+@pytest.mark.parametrize("content", ["{not json", "[]", "", json.dumps({"version": MANIFEST_VERSION + 1,
+                                                                          "settings": SETTINGS,
+                                                                          "files": {"a.txt": ENTRY}})])
+def test_manifest_ignores_corrupt_or_unknown_files(tmp_path, content):
+    path = tmp_path / MANIFEST_NAME
+    path.write_text(content, encoding='utf-8')
+    assert Manifest(str(path), SETTINGS).entries == {}
+
+
+def test_manifest_ignores_other_settings(tmp_path):
+    path = str(tmp_path / MANIFEST_NAME)
+    manifest = Manifest(path, SETTINGS)
+    manifest.update("a.txt", ENTRY)
+    manifest.save()
+    assert Manifest(path, dict(SETTINGS, key="4567")).entries == {}
+
+
+def test_walk_files_skips_manifest_and_its_temporary_copies(tmp_path):
+    (tmp_path / MANIFEST_NAME).write_text("{}")
+    (tmp_path / f"{MANIFEST_NAME}.123.tmp").write_text("{}")
+    (tmp_path / "data.tmp").write_text("kept")
+    assert list(walk_files(str(tmp_path))) == ["data.tmp"]
+
+
+def test_tree_round_trip_and_rerun(tree, tmp_path):
+    ciphers = CipherImplementations(workers=2)
+    enc, dec = str(tmp_path / "enc"), str(tmp_path / "dec")
+    summary = TreeProcessor(ciphers, "encrypt", "AES", "passphrase").run(str(tree), enc)
+    assert (summary["processed"], summary["skipped"], summary["failed"]) == (3, 0, [])
+    assert TreeProcessor(ciphers, "encrypt", "AES", "passphrase").run(str(tree), enc)["skipped"] == 3
+
+    (tree / "a.txt").write_bytes(b"changed")
+    os.remove(tree / "empty")
+    summary = TreeProcessor(ciphers, "encrypt", "AES", "passphrase").run(str(tree), enc)
+    assert (summary["processed"], summary["skipped"], summary["removed"]) == (1, 1, 1)
+
+    TreeProcessor(ciphers, "decrypt", "AES", "passphrase").run(enc, dec)
+    assert (tmp_path / "dec" / "a.txt").read_bytes() == b"changed"
+    assert (tmp_path / "dec" / "sub" / "b.bin").read_bytes() == (tree / "sub" / "b.bin").read_bytes()
+
+
+def test_tree_redoes_everything_for_another_key(tree, tmp_path):
+    ciphers = CipherImplementations(workers=1)
+    enc = str(tmp_path / "enc")
+    TreeProcessor(ciphers, "encrypt", "AES", "passphrase").run(str(tree), enc)
+    assert TreeProcessor(ciphers, "encrypt", "AES", "other").run(str(tree), enc)["processed"] == 3
+
+
+def test_manifest_digests_are_keyed(tree, tmp_path):
+    ciphers = CipherImplementations(workers=1)
+    digests = []
+    for key in ("passphrase", "other"):
+        out = tmp_path / key
+        TreeProcessor(ciphers, "encrypt", "AES", key).run(str(tree), str(out))
+        with open(out / MANIFEST_NAME, encoding='utf-8') as f:
+            data = json.load(f)
+        digests.append(data["files"]["a.txt"]["hmac"])
+        text = json.dumps(data)
+        for path in ("a.txt", "sub/b.bin", "empty"):
+            assert hashlib.sha256((tree / path).read_bytes()).hexdigest() not in text
+    assert digests[0] != digests[1]
+
+
+def test_tree_rejects_ciphers_that_cannot_stream(tmp_path):
+    with pytest.raises(ValueError, match="cannot stream files; use one of: AES"):
+        TreeProcessor(CipherImplementations(workers=1), "encrypt", "Caesar", "3")
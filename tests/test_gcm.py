@@ -0,0 +1,87 @@
+import pytest
+
+from ciphers import GCM_HEADER, GCM_MAGIC, GCM_TAG_SIZE, GCM_VERSION, AESGCMCipher, CipherImplementations
+
+KEY = "passphrase"
+
+
+@pytest.fixture
+def context():
+    return AESGCMCipher.prepare(KEY, CipherImplementations(workers=2), segment_size=64)
+
+
+@pytest.mark.parametrize("size", [0, 1, 63, 64, 65, 1000])
+def test_round_trip(context, size):
+    data = (bytes(range(256)) * 4)[:size]
+    sealed = context.encrypt_bytes(data)
+    count = max(1, -(-size // 64))
+    assert len(sealed) == GCM_HEADER.size + size + count * GCM_TAG_SIZE
+    assert context.decrypt_bytes(sealed) == data
+
+
+def test_header_layout(context):
+    sealed = context.encrypt_bytes(b"x" * 100)
+    magic, version, segment_size, nonce, length = GCM_HEADER.unpack(sealed[:GCM_HEADER.size])
+    assert (magic, version, segment_size, length) == (GCM_MAGIC, GCM_VERSION, 64, 100)
+    assert len(nonce) == 8
+
+
+def test_text_round_trip():
+    ciphers = CipherImplementations(workers=1)
+    assert ciphers.decrypt("AES-GCM", ciphers.encrypt("AES-GCM", "héllo", KEY), KEY) == "héllo"
+
+
+def test_rejects_corrupt_magic(context):
+    sealed = context.encrypt_bytes(b"secret")
+    with pytest.raises(ValueError, match="Not an AES-GCM container"):
+        context.decrypt_bytes(b"XGCM" + sealed[4:])
+
+
+def test_rejects_unsupported_version(context):
+    sealed = bytearray(context.encrypt_bytes(b"secret"))
+    sealed[4] = GCM_VERSION + 1
+    with pytest.raises(ValueError, match="unsupported version"):
+        context.decrypt_bytes(bytes(sealed))
+
+
+def test_rejects_truncated_header(context):
+    sealed = context.encrypt_bytes(b"secret")
+    with pytest.raises(ValueError, match="too short"):
+        context.decrypt_bytes(sealed[:GCM_HEADER.size - 1])
+
+
+@pytest.mark.parametrize("cut", [1, GCM_TAG_SIZE, 64 + GCM_TAG_SIZE])
+def test_rejects_truncated_body(context, cut):
+    sealed = context.encrypt_bytes(b"x" * 200)
+    with pytest.raises(ValueError, match="truncated"):
+        context.decrypt_bytes(sealed[:-cut])
+
+
+def test_rejects_dropped_last_segment_with_patched_length(context):
+    sealed = context.encrypt_bytes(b"x" * 128)
+    magic, version, segment_size, nonce, _ = GCM_HEADER.unpack(sealed[:GCM_HEADER.size])
+    header = GCM_HEADER.pack(magic, version, segment_size, nonce, 64)
+    with pytest.raises(ValueError, match="authentication failed"):
+        context.decrypt_bytes(header + sealed[GCM_HEADER.size:GCM_HEADER.size + 64 + GCM_TAG_SIZE])
+
+
+def test_rejects_swapped_segments(context):
+    sealed = context.encrypt_bytes(bytes(range(128)))
+    stride = 64 + GCM_TAG_SIZE
+    body = sealed[GCM_HEADER.size:]
+    swapped = sealed[:GCM_HEADER.size] + body[stride:] + body[:stride]
+    with pytest.raises(ValueError, match="authentication failed"):
+        context.decrypt_bytes(swapped)
+
+
+def test_rejects_tampered_ciphertext(context):
+    sealed = bytearray(context.encrypt_bytes(b"x" * 100))
+    sealed[GCM_HEADER.size] ^= 1
+    with pytest.raises(ValueError, match="authentication failed for segment 0"):
+        context.decrypt_bytes(bytes(sealed))
+
+
+def test_rejects_wrong_key(context):
+    other = AESGCMCipher.prepare("other", CipherImplementations(workers=1), segment_size=64)
+    with pytest.raises(ValueError, match="authentication failed"):
+        other.decrypt_bytes(context.encrypt_bytes(b"secret"))
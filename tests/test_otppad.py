@@ -0,0 +1,157 @@
+import os
+
+import pytest
+
+from ciphers import CipherImplementations
+from otppad import (PAD_FILE_HEADER, PAD_FILE_MAGIC, PAD_HEADER, PAD_MAGIC, PAD_START, PAD_VERSION, PadFile,
+                    cursor_path, generate_pad)
+
+
+@pytest.fixture
+def pad_path(tmp_path):
+    return generate_pad(str(tmp_path / "secret.pad"), 4096)
+
+
+@pytest.fixture
+def ciphers():
+    return CipherImplementations(workers=1)
+
+
+def test_generate_pad_writes_file_header(pad_path):
+    with open(pad_path, 'rb') as f:
+        assert PAD_FILE_HEADER.unpack(f.read(PAD_FILE_HEADER.size))[0] == PAD_FILE_MAGIC
+    with PadFile(pad_path) as pad:
+        assert pad.size == PAD_START + 4096
+        assert pad.remaining == 4096
+
+
+def test_generate_pad_never_overwrites(pad_path):
+    with pytest.raises(FileExistsError):
+        generate_pad(pad_path, 10)
+
+
+def test_rejects_files_without_pad_header(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(os.urandom(4096))
+    with pytest.raises(ValueError, match="not a one-time pad file"):
+        PadFile(str(path))
+
+
+def test_rejects_unsupported_pad_version(pad_path):
+    with open(pad_path, 'r+b') as f:
+        f.write(PAD_FILE_HEADER.pack(PAD_FILE_MAGIC, 99))
+    with pytest.raises(ValueError, match="unsupported pad version"):
+        PadFile(pad_path)
+
+
+def test_rejects_truncated_pad(tmp_path):
+    path = tmp_path / "short.pad"
+    path.write_bytes(PAD_FILE_HEADER.pack(PAD_FILE_MAGIC, 1) + b"\0" * 10)
+    with pytest.raises(ValueError, match="too small"):
+        PadFile(str(path))
+
+
+def test_round_trip_and_header(ciphers, pad_path):
+    data = b"attack at dawn"
+    sealed = ciphers.encrypt_bytes("OTP Pad", data, pad_path)
+    magic, version, pad_id, offset, length = PAD_HEADER.unpack(sealed[:PAD_HEADER.size])
+    with PadFile(pad_path) as pad:
+        assert (magic, version, pad_id) == (PAD_MAGIC, PAD_VERSION, pad.pad_id)
+    assert (offset, length) == (PAD_START, len(data))
+    assert ciphers.decrypt_bytes("OTP Pad", sealed, pad_path) == data
+
+
+def test_pad_bytes_are_never_reused(ciphers, pad_path):
+    first = ciphers.encrypt_bytes("OTP Pad", b"a" * 100, pad_path)
+    second = ciphers.encrypt_bytes("OTP Pad", b"a" * 100, pad_path)
+    assert PAD_HEADER.unpack(second[:PAD_HEADER.size])[3] == PAD_START + 100
+    assert first[PAD_HEADER.size:] != second[PAD_HEADER.size:]
+    with PadFile(pad_path) as pad:
+        assert pad.remaining == 4096 - 200
+
+
+def test_stream_round_trip(ciphers, pad_path, tmp_path):
+    data = os.urandom(3000)
+    src, sealed, plain = tmp_path / "src", tmp_path / "sealed", tmp_path / "plain"
+    src.write_bytes(data)
+    ciphers.encrypt_stream("OTP Pad", str(src), str(sealed), pad_path, chunk_size=512)
+    ciphers.decrypt_stream("OTP Pad", str(sealed), str(plain), pad_path, chunk_size=512)
+    assert plain.read_bytes() == data
+
+
+def test_rejects_corrupt_magic(ciphers, pad_path):
+    sealed = ciphers.encrypt_bytes("OTP Pad", b"secret", pad_path)
+    with pytest.raises(ValueError, match="Not a one-time pad ciphertext"):
+        ciphers.decrypt_bytes("OTP Pad", b"XOTP" + sealed[4:], pad_path)
+
+
+def test_rejects_truncated_header(ciphers, pad_path):
+    sealed = ciphers.encrypt_bytes("OTP Pad", b"secret", pad_path)
+    with pytest.raises(ValueError, match="too short"):
+        ciphers.decrypt_bytes("OTP Pad", sealed[:PAD_HEADER.size - 1], pad_path)
+
+
+def test_rejects_truncated_body(ciphers, pad_path):
+    sealed = ciphers.encrypt_bytes("OTP Pad", b"secret", pad_path)
+    with pytest.raises(ValueError, match="truncated"):
+        ciphers.decrypt_bytes("OTP Pad", sealed[:-1], pad_path)
+
+
+def test_rejects_wrong_pad_id(ciphers, pad_path, tmp_path):
+    other = generate_pad(str(tmp_path / "other.pad"), 4096)
+    sealed = ciphers.encrypt_bytes("OTP Pad", b"secret", pad_path)
+    with pytest.raises(ValueError, match="different pad"):
+        ciphers.decrypt_bytes("OTP Pad", sealed, other)
+
+
+def test_rejects_offset_outside_pad(ciphers, pad_path):
+    sealed = ciphers.encrypt_bytes("OTP Pad", b"secret", pad_path)
+    with PadFile(pad_path) as pad:
+        forged = pad.header(0, 6) + sealed[PAD_HEADER.size:]
+    with pytest.raises(ValueError, match="outside the one-time pad"):
+        ciphers.decrypt_bytes("OTP Pad", forged, pad_path)
+
+
+def test_exhausted_pad(ciphers, pad_path):
+    with pytest.raises(ValueError, match="exhausted"):
+        ciphers.encrypt_bytes("OTP Pad", b"x" * 4097, pad_path)
+
+
+def test_corrupt_cursor_is_refused(ciphers, pad_path):
+    with open(cursor_path(pad_path), 'w') as f:
+        f.write("{not json")
+    with pytest.raises(ValueError, match="corrupt"):
+        ciphers.encrypt_bytes("OTP Pad", b"x", pad_path)
+
+
+def test_decrypt_moves_receiver_cursor_past_message(ciphers, pad_path, tmp_path):
+    receiver_pad = str(tmp_path / "receiver.pad")
+    with open(pad_path, 'rb') as src, open(receiver_pad, 'xb') as dst:
+        dst.write(src.read())
+    message = ciphers.encrypt_bytes("OTP Pad", b"m" * 100, pad_path)
+    assert ciphers.decrypt_bytes("OTP Pad", message, receiver_pad) == b"m" * 100
+    reply = ciphers.encrypt_bytes("OTP Pad", b"r" * 10, receiver_pad)
+    assert PAD_HEADER.unpack(reply[:PAD_HEADER.size])[3] == PAD_START + 100
+    # Decrypting an older message again never moves the cursor back.
+    ciphers.decrypt_bytes("OTP Pad", message, receiver_pad)
+    with PadFile(receiver_pad) as pad:
+        assert pad.cursor() == PAD_START + 110
+
+
+def test_stream_decrypt_moves_cursor(ciphers, pad_path, tmp_path):
+    src, sealed, plain = tmp_path / "src", tmp_path / "sealed", tmp_path / "plain"
+    src.write_bytes(b"x" * 300)
+    ciphers.encrypt_stream("OTP Pad", str(src), str(sealed), pad_path)
+    os.remove(cursor_path(pad_path))
+    ciphers.decrypt_stream("OTP Pad", str(sealed), str(plain), pad_path)
+    with PadFile(pad_path) as pad:
+        assert pad.cursor() == PAD_START + 300
+
+
+@pytest.mark.parametrize("state", ["[]", '{"pad_id": "00", "offset": "x"}', "{}"])
+def test_cursor_that_is_not_an_object_is_refused(ciphers, pad_path, state):
+    with open(cursor_path(pad_path), 'w') as f:
+        f.write(state)
+    with pytest.raises(ValueError, match="corrupt"):
+        ciphers.encrypt_bytes("OTP Pad", b"x", pad_path)
+
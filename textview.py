@@ -0,0 +1,252 @@
+import codecs
+import mmap
+import os
+import tempfile
+import tkinter as tk
+from tkinter import ttk
+
+# Documents longer than this (in characters) are not inserted into Tk.
+LARGE_DOCUMENT_CHARS = 1 << 20
+CHUNK_SIZE = 1 << 20
+
+
+def _format_size(size):
+    for unit, scale in (("GB", 1 << 30), ("MB", 1 << 20), ("KB", 1 << 10)):
+        if size >= scale:
+            return f"{size / scale:.1f} {unit}"
+    return f"{size} B"
+
+
+class SpooledText:
+    """A document kept in a UTF-8 file instead of a Text widget."""
+
+    def __init__(self, path, temporary=True):
+        self.path = path
+        self.temporary = temporary
+
+    @classmethod
+    def from_text(cls, text):
+        fd, path = tempfile.mkstemp(prefix="qrypto-", suffix=".txt")
+        with os.fdopen(fd, 'w', encoding='utf-8', errors='surrogatepass', newline='') as f:
+            for start in range(0, len(text), CHUNK_SIZE):
+                f.write(text[start:start + CHUNK_SIZE])
+        return cls(path)
+
+    def discard(self):
+        if self.temporary and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class DocumentView(ttk.Frame):
+    """Text widget that falls back to a windowed, read-only view for large documents.
+
+    Small documents live in the Text widget as usual. Larger ones are
+    spooled to a file that is memory-mapped, and only the rows around the
+    scroll position are ever inserted into Tk, so showing, scrolling,
+    copying and saving cost the same whatever the document size.
+    """
+
+    def __init__(self, master, threshold=LARGE_DOCUMENT_CHARS, **text_options):
+        super().__init__(master)
+        self.threshold = threshold
+        self.document = None
+        self._file = None
+        self._map = None
+        self._pos = 0
+
+        self.banner = ttk.Label(self, anchor=tk.W)
+        self.text = tk.Text(self, **text_options)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.banner.grid(row=0, column=0, columnspan=2, sticky=tk.EW, pady=(0, 5))
+        self.text.grid(row=1, column=0, sticky=tk.NSEW)
+        self.scrollbar.grid(row=1, column=1, sticky=tk.NS)
+        self.banner.grid_remove()
+        self.scrollbar.grid_remove()
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+        self._wrap = self.text.cget("wrap")
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.text.bind(sequence, self._on_wheel)
+        self.text.bind("<Prior>", lambda e: self._on_key(-1, "pages"))
+        self.text.bind("<Next>", lambda e: self._on_key(1, "pages"))
+        self.text.bind("<Up>", lambda e: self._on_key(-1, "units"))
+        self.text.bind("<Down>", lambda e: self._on_key(1, "units"))
+        self.text.bind("<Control-Home>", lambda e: self._on_key(0, "moveto"))
+        self.text.bind("<Control-End>", lambda e: self._on_key(1, "moveto"))
+        self.text.bind("<Configure>", lambda e: self._render() if self.large else None)
+        self.bind("<Destroy>", lambda e: self.close() if e.widget is self else None)
+
+    @property
+    def large(self):
+        return self.document is not None
+
+    @property
+    def size(self):
+        """Size of a large document in bytes, or None for an inline one."""
+        return len(self._map) if self.large else None
+
+    def set(self, content):
+        """Show a string, or a SpooledText; long strings are spooled first."""
+        self.clear()
+        if isinstance(content, str):
+            if len(content) <= self.threshold:
+                self.text.insert(tk.END, content)
+                return
+            content = SpooledText.from_text(content)
+        self._open(content)
+
+    def load_file(self, path):
+        """Show a text file, mapping it in place when it is too large to insert."""
+        if os.path.getsize(path) <= self.threshold:
+            with open(path, 'r') as f:
+                self.set(f.read())
+        else:
+            self.set(SpooledText(path, temporary=False))
+
+    def get(self):
+        """Return the whole document, matching Text.get("1.0", END) for inline text."""
+        if not self.large:
+            return self.text.get("1.0", tk.END)
+        return self._map[:].decode('utf-8', 'surrogatepass')
+
+    def chunks(self, size=CHUNK_SIZE):
+        """Yield the document as successive strings of roughly size bytes."""
+        if not self.large:
+            yield self.text.get("1.0", "end-1c")
+            return
+        decoder = codecs.getincrementaldecoder('utf-8')('surrogatepass')
+        for start in range(0, len(self._map), size):
+            yield decoder.decode(self._map[start:start + size])
+        yield decoder.decode(b"", final=True)
+
+    def save(self, path):
+        if not self.large:
+            with open(path, 'w') as f:
+                f.write(self.get())
+            return
+        if os.path.exists(path) and os.path.samefile(path, self.document.path):
+            return
+        with open(path, 'wb') as f:
+            for start in range(0, len(self._map), CHUNK_SIZE):
+                f.write(self._map[start:start + CHUNK_SIZE])
+
+    def copy_to_clipboard(self):
+        self.clipboard_clear()
+        for chunk in self.chunks():
+            self.clipboard_append(chunk)
+
+    def clear(self):
+        self.close()
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+
+    def close(self):
+        """Release the backing file of a large document."""
+        if not self.large:
+            return
+        self._map.close()
+        self._file.close()
+        self.document.discard()
+        self.document = self._map = self._file = None
+        self.text.config(state=tk.NORMAL, wrap=self._wrap)
+        self.banner.grid_remove()
+        self.scrollbar.grid_remove()
+
+    def _open(self, document):
+        self.document = document
+        self._file = open(document.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._pos = 0
+        self.banner.config(text=f"Large document ({_format_size(len(self._map))}): read-only preview. "
+                                "Save or copy to get the full contents, or clear to edit.")
+        self.banner.grid()
+        self.scrollbar.grid()
+        self.text.config(wrap=tk.CHAR)
+        self._render()
+
+    def _grid_size(self):
+        font = self.text.cget("font")
+        char_width = max(1, int(self.tk.call("font", "measure", font, "0")))
+        line_height = max(1, int(self.tk.call("font", "metrics", font, "-linespace")))
+        cols = max(20, self.text.winfo_width() // char_width - 1)
+        rows = max(5, self.text.winfo_height() // line_height)
+        return rows, cols
+
+    def _boundary(self, pos):
+        # Step back to the start of a UTF-8 sequence.
+        while 0 < pos < len(self._map) and self._map[pos] & 0xC0 == 0x80:
+            pos -= 1
+        return pos
+
+    def _next_row(self, pos, cols):
+        newline = self._map.find(b"\n", pos, pos + cols)
+        if newline != -1:
+            return newline + 1
+        return max(pos + 1, self._boundary(min(len(self._map), pos + cols)))
+
+    def _prev_row(self, pos, cols):
+        if pos <= 0:
+            return 0
+        low = max(0, pos - cols)
+        newline = self._map.rfind(b"\n", low, pos - 1)
+        if newline != -1:
+            return newline + 1
+        return self._boundary(low)
+
+    def _scroll(self, count, what):
+        rows, cols = self._grid_size()
+        if what == "moveto":
+            pos = min(int(float(count) * len(self._map)), len(self._map) - 1)
+            newline = self._map.rfind(b"\n", max(0, pos - cols), pos)
+            self._pos = newline + 1 if newline != -1 else self._boundary(pos)
+            # Keep a full page on screen when jumping near the end.
+            end, shown = self._pos, 0
+            while shown < rows and end < len(self._map):
+                end, shown = self._next_row(end, cols), shown + 1
+            for _ in range(rows - 1 - shown):
+                self._pos = self._prev_row(self._pos, cols)
+        else:
+            steps = int(count) * (rows - 1 if what == "pages" else 1)
+            for _ in range(abs(steps)):
+                if steps < 0:
+                    self._pos = self._prev_row(self._pos, cols)
+                else:
+                    following = self._next_row(self._pos, cols)
+                    if following >= len(self._map):
+                        break
+                    self._pos = following
+        self._render()
+
+    def _render(self):
+        rows, cols = self._grid_size()
+        end = self._pos
+        for _ in range(rows):
+            if end >= len(self._map):
+                break
+            end = self._next_row(end, cols)
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", self._map[self._pos:end].decode('utf-8', 'replace'))
+        self.text.config(state=tk.DISABLED)
+        self.scrollbar.set(self._pos / len(self._map), end / len(self._map))
+
+    def _on_scrollbar(self, action, *args):
+        # Tk sends ("moveto", fraction) or ("scroll", count, "units"|"pages").
+        if self.large:
+            self._scroll(args[0], action if action == "moveto" else args[1])
+
+    def _on_wheel(self, event):
+        if not self.large:
+            return None
+        if event.num == 4 or event.delta > 0:
+            self._scroll(-3, "units")
+        else:
+            self._scroll(3, "units")
+        return "break"
+
+    def _on_key(self, count, what):
+        if not self.large:
+            return None
+        self._scroll(count, what)
+        return "break"
@@ -0,0 +1,244 @@
+import json
+import os
+
+PALETTES = {
+    # Tech Dark Theme (Electric Blue + Deep Gray)
+    "dark": {
+        "bg": "#121212",
+        "fg": "#e0e0e0",
+        "accent": "#00b4ff",
+        "secondary": "#1e1e1e",
+        "text_bg": "#1e1e1e",
+        "text_fg": "#ffffff",
+        "entry_bg": "#2d2d2d",
+        "entry_fg": "#ffffff",
+        "button_bg": "#00b4ff",
+        "button_fg": "#ffffff",
+        "tab_bg": "#1e1e1e",
+        "tab_fg": "#e0e0e0",
+        "select_bg": "#00b4ff",
+        "select_fg": "#ffffff",
+        "success": "#4CAF50",
+        "error": "#F44336",
+        "warning": "#FFC107"
+    },
+    # Light Tech Theme (Electric Blue + Light Gray)
+    "light": {
+        "bg": "#f5f5f5",
+        "fg": "#333333",
+        "accent": "#0078d7",
+        "secondary": "#ffffff",
+        "text_bg": "#ffffff",
+        "text_fg": "#333333",
+        "entry_bg": "#ffffff",
+        "entry_fg": "#333333",
+        "button_bg": "#0078d7",
+        "button_fg": "#ffffff",
+        "tab_bg": "#ffffff",
+        "tab_fg": "#333333",
+        "select_bg": "#0078d7",
+        "select_fg": "#ffffff",
+        "success": "#4CAF50",
+        "error": "#F44336",
+        "warning": "#FFC107"
+    },
+    # High-Tech Theme (Neon Green + Dark Gray)
+    "tech": {
+        "bg": "#0a0a0a",
+        "fg": "#00ff9d",
+        "accent": "#00ff9d",
+        "secondary": "#1a1a1a",
+        "text_bg": "#1a1a1a",
+        "text_fg": "#00ff9d",
+        "entry_bg": "#252525",
+        "entry_fg": "#00ff9d",
+        "button_bg": "#006644",
+        "button_fg": "#00ff9d",
+        "tab_bg": "#1a1a1a",
+        "tab_fg": "#00ff9d",
+        "select_bg": "#006644",
+        "select_fg": "#00ff9d",
+        "success": "#00ff9d",
+        "error": "#ff0033",
+        "warning": "#ffcc00"
+    },
+}
+
+
+def style_settings(colors, mono_font, button_font):
+    """ttk theme settings for a palette and fonts."""
+    return {
+        ".": {
+            "configure": {
+                "background": colors["bg"],
+                "foreground": colors["fg"],
+                "font": mono_font
+            }
+        },
+        "TFrame": {
+            "configure": {"background": colors["bg"]}
+        },
+        "TLabel": {
+            "configure": {
+                "background": colors["bg"],
+                "foreground": colors["fg"]
+            }
+        },
+        "TNotebook": {
+            "configure": {
+                "background": colors["tab_bg"],
+                "tabmargins": [2, 5, 2, 0]
+            }
+        },
+        "TNotebook.Tab": {
+            "configure": {
+                "background": colors["tab_bg"],
+                "foreground": colors["tab_fg"],
+                "padding": [10, 5],
+                "font": button_font
+            },
+            "map": {
+                "background": [("selected", colors["secondary"])],
+                "expand": [("selected", [1, 1, 1, 0])]
+            }
+        },
+        "TEntry": {
+            "configure": {
+                "fieldbackground": colors["entry_bg"],
+                "foreground": colors["entry_fg"],
+                "insertcolor": colors["accent"],
+                "padding": 5,
+                "relief": "flat"
+            }
+        },
+        "TCombobox": {
+            "configure": {
+                "fieldbackground": colors["entry_bg"],
+                "foreground": colors["entry_fg"],
+                "selectbackground": colors["select_bg"],
+                "selectforeground": colors["select_fg"]
+            }
+        },
+        "TButton": {
+            "configure": {
+                "background": colors["button_bg"],
+                "foreground": colors["button_fg"],
+                "font": button_font,
+                "padding": 8,
+                "relief": "flat"
+            },
+            "map": {
+                "background": [("active", colors["accent"])],
+                "foreground": [("active", colors["button_fg"])]
+            }
+        },
+        "Accent.TButton": {
+            "configure": {
+                "background": colors["accent"],
+                "foreground": colors["button_fg"],
+                "font": button_font,
+                "padding": 10
+            }
+        },
+        "Success.TButton": {
+            "configure": {
+                "background": colors["success"],
+                "foreground": "#ffffff",
+                "font": button_font
+            }
+        },
+        "Warning.TButton": {
+            "configure": {
+                "background": colors["warning"],
+                "foreground": "#000000",
+                "font": button_font
+            }
+        },
+        "Error.TButton": {
+            "configure": {
+                "background": colors["error"],
+                "foreground": "#ffffff",
+                "font": button_font
+            }
+        },
+        "TLabelframe": {
+            "configure": {
+                "background": colors["bg"],
+                "foreground": colors["accent"],
+                "relief": "groove",
+                "borderwidth": 1
+            }
+        },
+        "TLabelframe.Label": {
+            "configure": {
+                "background": colors["bg"],
+                "foreground": colors["accent"],
+                "font": button_font
+            }
+        },
+        "Horizontal.TProgressbar": {
+            "configure": {
+                "background": colors["accent"],
+                "troughcolor": colors["secondary"],
+                "thickness": 20
+            }
+        }
+    }
+
+
+class ThemeCache:
+    """Creates each ttk theme (palette x fonts) once and switches between them.
+
+    Besides the built-in PALETTES, every <name>.json file in directory is
+    a custom theme: either a flat color dict or {"base": ..., "colors": ...},
+    with missing colors taken from the base palette (dark by default).
+    Only file names are read up front; a file is parsed when its theme is
+    first used.
+    """
+
+    def __init__(self, style, directory=None):
+        self.style = style
+        self.directory = directory
+        self._palettes = dict(PALETTES)
+        self._created = {}
+
+    def names(self):
+        return list(PALETTES) + self.custom_names()
+
+    def custom_names(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        names = (os.path.splitext(f)[0] for f in os.listdir(self.directory) if f.endswith(".json"))
+        return sorted(name for name in names if name not in PALETTES)
+
+    def palette(self, name):
+        if name not in self._palettes:
+            self._palettes[name] = self._load(name)
+        return self._palettes[name]
+
+    def use(self, name, mono_font, button_font):
+        """Switch to the theme for a palette and fonts; returns its colors."""
+        colors = self.palette(name)
+        key = (name, tuple(mono_font), tuple(button_font))
+        theme = self._created.get(key)
+        if theme is None:
+            # Tk theme names must be unique and cannot be redefined
+            theme = f"qrypto-{len(self._created)}"
+            while theme in self.style.theme_names():
+                theme += "-"
+            self.style.theme_create(theme, settings=style_settings(colors, mono_font, button_font))
+            self._created[key] = theme
+        self.style.theme_use(theme)
+        return colors
+
+    def _load(self, name):
+        path = os.path.join(self.directory or "", f"{name}.json")
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"Theme {name} must be a JSON object")
+        colors = data.get("colors", data)
+        base = data.get("base", "dark") if "colors" in data else "dark"
+        palette = dict(PALETTES.get(base, PALETTES["dark"]))
+        palette.update((key, value) for key, value in colors.items() if key in palette)
+        return palette
@@ -1,19 +1,128 @@
-import os
-import json
-from datetime import datetime
-
-def load_settings(settings_file):
-    if os.path.exists(settings_file):
-        try:
-            with open(settings_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
-
-def save_settings(settings_file, settings):
-    with open(settings_file, 'w') as f:
-        json.dump(settings, f)
-
-def get_timestamp():
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
+import os
+import json
+import threading
+import time
+from datetime import datetime
+
+def load_settings(settings_file):
+    if os.path.exists(settings_file):
+        try:
+            with open(settings_file, 'r') as f:
+                return json.load(f)
+        except:
+            return {}
+    return {}
+
+def save_settings(settings_file, settings):
+    """Write settings atomically; returns False when the file already holds them."""
+    data = json.dumps(settings)
+    try:
+        with open(settings_file, 'r') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    atomic_write(settings_file, data)
+    return True
+
+def atomic_write(path, data, fsync=False):
+    """Replace path with data (str as UTF-8, or bytes) in one step.
+
+    data goes to a temporary file next to path that is then renamed over
+    it, so readers see the old or the new contents, never a partial file.
+    fsync=True also flushes it to disk first, for state that must survive
+    a crash.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class SettingsManager:
+    """Settings that are saved a moment after the last change.
+
+    update() only records the new values and (re)starts a timer; the file
+    is written on a background thread once changes stop arriving for
+    delay seconds, so dragging a slider costs one write instead of dozens.
+    Values equal to what was last saved are not written again.
+    """
+
+    def __init__(self, settings_file, delay=0.5):
+        self.settings_file = settings_file
+        self.delay = delay
+        self.settings = load_settings(settings_file)
+        self._saved = dict(self.settings)
+        self._lock = threading.Lock()
+        # Serializes writes so an older snapshot never lands after a newer one.
+        self._write_lock = threading.Lock()
+        self._timer = None
+
+    def get(self, key, default=None):
+        return self.settings.get(key, default)
+
+    def update(self, **values):
+        with self._lock:
+            self.settings.update(values)
+            self._cancel()
+            if self.settings == self._saved:
+                return
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending changes now, e.g. on exit."""
+        with self._write_lock:
+            with self._lock:
+                self._cancel()
+                if self.settings == self._saved:
+                    return
+                settings = dict(self.settings)
+            # Written without holding _lock, so update() on the Tk thread
+            # never waits for the disk.
+            save_settings(self.settings_file, settings)
+            with self._lock:
+                self._saved = settings
+
+    def _cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+def parse_size(text):
+    """Parse a byte count such as "512", "64K", "1.5M" or "2G"."""
+    text = text.strip().upper()
+    if text[-1:] in SIZE_UNITS:
+        return int(float(text[:-1]) * SIZE_UNITS[text[-1]])
+    return int(text)
+
+def get_timestamp():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+class StartupProfiler:
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.marks = []
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter()))
+
+    def report(self):
+        lines = ["Startup profile:"]
+        previous = self.start
+        for label, when in self.marks:
+            lines.append(f"  {label:<14} +{(when - previous) * 1000:8.1f} ms  {(when - self.start) * 1000:8.1f} ms")
+            previous = when
+        return "\n".join(lines)